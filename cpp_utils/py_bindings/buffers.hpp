@@ -0,0 +1,97 @@
+#pragma once
+#include <memory>
+#include <string>
+#include <unordered_set>
+#include <vector>
+
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+#include "sdrlib/parallel.hpp"
+
+namespace py = pybind11;
+
+// Helpers shared by the binding files.
+//
+// Buffers are taken as plain py::array and validated here instead of as py::array_t<T>, which
+// would silently convert (copy) arrays of another dtype or layout. For an output buffer that
+// means the results are written to a temporary copy and lost. Buffers must be 1-D, C-contiguous
+// and of exactly the element type of the C++ function (complex64, float32 or intc).
+
+namespace bindings {
+
+/**
+ * @brief Pointer to the data of a 1-D C-contiguous array of T, without copying.
+ * @param arr The numpy array.
+ * @param name Argument name used in error messages.
+ * @param writable Whether the buffer is written to (an output buffer).
+ * @throws TypeError if the dtype is not T, ValueError if the array is not 1-D, not C-contiguous
+ * or (for outputs) read-only.
+ */
+template <typename T> T *buffer_ptr(const py::array &arr, const char *name, bool writable = false) {
+    if (!py::isinstance<py::array_t<T>>(arr))
+        throw py::type_error(std::string(name) + " must have dtype " +
+                             py::str(py::dtype::of<T>()).cast<std::string>() + ", got " +
+                             py::str(arr.dtype()).cast<std::string>() +
+                             " (convert with np.asarray(..., dtype=...) before the call)");
+    if (arr.ndim() != 1)
+        throw py::value_error(std::string(name) + " must be 1-dimensional");
+    if (!(arr.flags() & py::array::c_style))
+        throw py::value_error(std::string(name) +
+                              " must be C-contiguous (use np.ascontiguousarray)");
+    if (writable && !arr.writeable())
+        throw py::value_error(std::string(name) + " must be writable");
+    return static_cast<T *>(const_cast<void *>(arr.data()));
+}
+
+/**
+ * @brief Raise ValueError unless an output buffer holds at least n elements.
+ */
+inline void check_size(const py::array &arr, const char *name, size_t n) {
+    if (static_cast<size_t>(arr.size()) < n)
+        throw py::value_error(std::string(name) + " holds " + std::to_string(arr.size()) +
+                              " elements but " + std::to_string(n) + " are required");
+}
+
+/**
+ * @brief Read-only numpy view of n elements of T owned by the C++ object wrapped by owner.
+ *
+ * The view keeps owner alive. It reflects later updates of the data, so it must only point at
+ * storage that is never reallocated (e.g. fixed-size history buffers).
+ */
+template <typename T> py::array_t<T> readonly_view(const T *data, size_t n, py::handle owner) {
+    py::array_t<T> view(n, data, owner);
+    view.attr("flags").attr("writeable") = false;
+    return view;
+}
+
+/**
+ * @brief Process-wide thread pool used by the batch entry points.
+ */
+inline std::unique_ptr<sdrlib::parallel::ThreadPool> &thread_pool_instance() {
+    static std::unique_ptr<sdrlib::parallel::ThreadPool> pool;
+    return pool;
+}
+
+inline sdrlib::parallel::ThreadPool &thread_pool() {
+    // Only called with the GIL held, so creation needs no further locking
+    std::unique_ptr<sdrlib::parallel::ThreadPool> &pool = thread_pool_instance();
+    if (!pool)
+        pool = std::make_unique<sdrlib::parallel::ThreadPool>();
+    return *pool;
+}
+
+/**
+ * @brief Validate that a batch of stateful objects has no duplicates (which would race) and
+ * matches the number of buffers.
+ */
+template <typename T> void check_batch(const std::vector<T *> &objects, size_t n_buffers) {
+    if (objects.size() != n_buffers)
+        throw py::value_error("Got " + std::to_string(objects.size()) + " objects for " +
+                              std::to_string(n_buffers) + " buffers");
+    std::unordered_set<const T *> seen(objects.begin(), objects.end());
+    if (seen.size() != objects.size())
+        throw py::value_error("Each buffer needs its own object: objects must not repeat");
+}
+
+} // namespace bindings
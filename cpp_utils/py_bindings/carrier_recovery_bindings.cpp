@@ -2,6 +2,7 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include "buffers.hpp"
 #include "sdrlib/carrier_recovery.hpp"
 #include "sdrlib/types.hpp"
 
@@ -31,12 +32,14 @@ void bind_carrier_recovery(pybind11::module_ &m) {
             })
 
         // Read-only properties for error history and current correction
-        // Use lambda to convert std::vector to numpy array
+        // The error history is a read-only view of the loop's ring buffer (no copy)
         .def_property_readonly("error_history",
-                               [](sdrlib::carrier_recovery::CostasLoopQPSK &self) {
-                                   sdrlib::fvec error_history = self.get_error_history();
-                                   return py::array_t<float>(error_history.size(),
-                                                             error_history.data());
+                               [](py::object self) {
+                                   const sdrlib::fvec &error_history =
+                                       self.cast<sdrlib::carrier_recovery::CostasLoopQPSK &>()
+                                           .get_error_history();
+                                   return bindings::readonly_view(error_history.data(),
+                                                                  error_history.size(), self);
                                })
         .def_property_readonly("correction",
                                &sdrlib::carrier_recovery::CostasLoopQPSK::get_correction)
@@ -45,16 +48,46 @@ void bind_carrier_recovery(pybind11::module_ &m) {
         // Use lambda to handle output parameter
         .def(
             "process",
-            [](sdrlib::carrier_recovery::CostasLoopQPSK &self, py::array_t<sdrlib::cpx> pyarr_in,
-               py::array_t<sdrlib::cpx> pyarr_out) {
-                py::buffer_info info_in = pyarr_in.request();
-                py::buffer_info info_out = pyarr_out.request();
-
-                sdrlib::cpx *buf_in = static_cast<sdrlib::cpx *>(info_in.ptr);
-                sdrlib::cpx *buf_out = static_cast<sdrlib::cpx *>(info_out.ptr);
-                size_t size = static_cast<size_t>(info_in.size);
+            [](sdrlib::carrier_recovery::CostasLoopQPSK &self, py::array pyarr_in,
+               py::array pyarr_out) {
+                sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "buffer_in");
+                sdrlib::cpx *buf_out =
+                    bindings::buffer_ptr<sdrlib::cpx>(pyarr_out, "buffer_out", true);
+                size_t size = static_cast<size_t>(pyarr_in.size());
+                bindings::check_size(pyarr_out, "buffer_out", size);
 
+                // Buffers are resolved above; the loop itself needs no Python objects
+                py::gil_scoped_release release;
                 self.process(buf_in, buf_out, size);
             },
             py::arg("buffer_in"), py::arg("buffer_out")); // n is inferred from array size
-}
\ No newline at end of file
+
+    // Process independent streams, one loop per stream, across the thread pool
+    carrier_recovery.def(
+        "process_batch",
+        [](std::vector<sdrlib::carrier_recovery::CostasLoopQPSK *> loops,
+           std::vector<py::array> buffers_in, std::vector<py::array> buffers_out) {
+            bindings::check_batch(loops, buffers_in.size());
+            if (buffers_out.size() != buffers_in.size())
+                throw py::value_error("buffers_in and buffers_out must have the same length");
+
+            std::vector<sdrlib::cpx *> bufs_in, bufs_out;
+            std::vector<size_t> sizes;
+            for (size_t k = 0; k < buffers_in.size(); ++k) {
+                bufs_in.push_back(bindings::buffer_ptr<sdrlib::cpx>(buffers_in[k], "buffers_in"));
+                bufs_out.push_back(
+                    bindings::buffer_ptr<sdrlib::cpx>(buffers_out[k], "buffers_out", true));
+                sizes.push_back(static_cast<size_t>(buffers_in[k].size()));
+                bindings::check_size(buffers_out[k], "buffers_out", sizes.back());
+            }
+
+            sdrlib::parallel::ThreadPool &pool = bindings::thread_pool();
+            py::gil_scoped_release release;
+            pool.parallel_for(loops.size(), [&](size_t k) {
+                loops[k]->process(bufs_in[k], bufs_out[k], sizes[k]);
+            });
+        },
+        py::arg("loops"), py::arg("buffers_in"), py::arg("buffers_out"),
+        "Process buffers_in[k] into buffers_out[k] with loops[k], for all k in parallel.\n"
+        "Every stream needs its own loop.");
+}
@@ -2,6 +2,7 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include "buffers.hpp"
 #include "sdrlib/channel.hpp"
 #include "sdrlib/types.hpp"
 
@@ -15,12 +16,41 @@ void bind_channel(pybind11::module_ &m) {
     // Use a lambda to handle numpy array inputs
     channel.def(
         "apply_cfo",
-        [](py::array_t<sdrlib::cpx> pyarr_in, py::array_t<sdrlib::cpx> pyarr_out, float w_offset) {
+        [](py::array pyarr_in, py::array pyarr_out, float w_offset) {
             size_t n = pyarr_in.size();
-            std::complex<float> *buf_in = static_cast<sdrlib::cpx *>(pyarr_in.request().ptr);
-            std::complex<float> *buf_out = static_cast<sdrlib::cpx *>(pyarr_out.request().ptr);
+            sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "buf_in");
+            sdrlib::cpx *buf_out = bindings::buffer_ptr<sdrlib::cpx>(pyarr_out, "buf_out", true);
+            bindings::check_size(pyarr_out, "buf_out", n);
 
+            py::gil_scoped_release release;
             sdrlib::channel::apply_cfo(buf_in, buf_out, n, w_offset);
         },
         py::arg("buf_in"), py::arg("buf_out"), py::arg("w_offset"));
+
+    // Batch version across the thread pool, with one frequency offset per buffer
+    channel.def(
+        "apply_cfo_batch",
+        [](std::vector<py::array> buffers_in, std::vector<py::array> buffers_out,
+           std::vector<float> w_offsets) {
+            if (buffers_out.size() != buffers_in.size() || w_offsets.size() != buffers_in.size())
+                throw py::value_error("buffers_in, buffers_out and w_offsets must have the same "
+                                      "length");
+
+            std::vector<sdrlib::cpx *> bufs_in, bufs_out;
+            std::vector<size_t> sizes;
+            for (size_t k = 0; k < buffers_in.size(); ++k) {
+                bufs_in.push_back(bindings::buffer_ptr<sdrlib::cpx>(buffers_in[k], "buffers_in"));
+                bufs_out.push_back(
+                    bindings::buffer_ptr<sdrlib::cpx>(buffers_out[k], "buffers_out", true));
+                sizes.push_back(static_cast<size_t>(buffers_in[k].size()));
+                bindings::check_size(buffers_out[k], "buffers_out", sizes.back());
+            }
+
+            sdrlib::parallel::ThreadPool &pool = bindings::thread_pool();
+            py::gil_scoped_release release;
+            pool.parallel_for(bufs_in.size(), [&](size_t k) {
+                sdrlib::channel::apply_cfo(bufs_in[k], bufs_out[k], sizes[k], w_offsets[k]);
+            });
+        },
+        py::arg("buffers_in"), py::arg("buffers_out"), py::arg("w_offsets"));
 }
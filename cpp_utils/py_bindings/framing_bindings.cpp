@@ -0,0 +1,148 @@
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include "buffers.hpp"
+#include "sdrlib/framing.hpp"
+#include "sdrlib/types.hpp"
+
+namespace py = pybind11;
+
+namespace {
+
+// Configuration arrays (preambles) are copied into the detector anyway, so any array
+// convertible to a contiguous complex64 array is accepted for them
+using config_array = py::array_t<sdrlib::cpx, py::array::c_style | py::array::forcecast>;
+
+// Copy a numpy array into a KFR vector
+sdrlib::cvec to_cvec(config_array pyarr) {
+    py::buffer_info info = pyarr.request();
+    sdrlib::cpx *buf = static_cast<sdrlib::cpx *>(info.ptr);
+    return sdrlib::cvec(buf, buf + info.size);
+}
+
+py::array_t<sdrlib::cpx> to_array(const sdrlib::cvec &vec) {
+    return py::array_t<sdrlib::cpx>(vec.size(), vec.data());
+}
+
+sdrlib::framing::CorrelationFrameDetector::Mode to_mode(const std::string &mode) {
+    if (mode == "first")
+        return sdrlib::framing::CorrelationFrameDetector::Mode::First;
+    if (mode == "max")
+        return sdrlib::framing::CorrelationFrameDetector::Mode::Max;
+    throw py::value_error("Frame detection mode must either be 'first' or 'max'");
+}
+
+} // namespace
+
+void bind_framing(pybind11::module_ &m) {
+
+    py::module_ framing = m.def_submodule("framing", "Frame detection algorithms");
+
+    // Bindings for DetectionResult struct
+    py::class_<sdrlib::framing::DetectionResult>(framing, "DetectionResult")
+        .def_property_readonly(
+            "frame", [](sdrlib::framing::DetectionResult &self) { return to_array(self.frame); })
+        .def_readonly("metric", &sdrlib::framing::DetectionResult::metric)
+        .def_readonly("idx", &sdrlib::framing::DetectionResult::idx);
+
+    framing.def(
+        "correlation_metric",
+        [](py::array pyarr_in, config_array preamble) {
+            sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "buffer_in");
+            sdrlib::cvec signal(buf_in, buf_in + pyarr_in.size());
+            sdrlib::fvec metric = sdrlib::framing::correlation_metric(signal, to_cvec(preamble));
+            return py::array_t<float>(metric.size(), metric.data());
+        },
+        py::arg("buffer_in"), py::arg("preamble"));
+
+    // Bindings for the FrameDetector base class (buffering and state machine)
+    py::class_<sdrlib::framing::FrameDetector>(framing, "FrameDetector")
+        .def("reset", &sdrlib::framing::FrameDetector::reset)
+
+        // Properties
+        .def_property(
+            "preamble",
+            [](sdrlib::framing::FrameDetector &self) { return to_array(self.get_preamble()); },
+            [](sdrlib::framing::FrameDetector &self, config_array value) {
+                self.set_preamble(to_cvec(value));
+            })
+        .def_property("expected_frame_length",
+                      &sdrlib::framing::FrameDetector::get_expected_frame_length,
+                      &sdrlib::framing::FrameDetector::set_expected_frame_length)
+        .def_property("detection_threshold",
+                      &sdrlib::framing::FrameDetector::get_detection_threshold,
+                      &sdrlib::framing::FrameDetector::set_detection_threshold)
+        .def_property_readonly(
+            "buffer",
+            [](sdrlib::framing::FrameDetector &self) { return to_array(self.get_buffer()); })
+
+        // Process a block of samples, returning the completed frames
+        .def(
+            "process",
+            [](sdrlib::framing::FrameDetector &self, py::array pyarr_in) {
+                sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "new_samples");
+                size_t size = static_cast<size_t>(pyarr_in.size());
+
+                py::gil_scoped_release release;
+                return self.process(buf_in, size);
+            },
+            py::arg("new_samples"));
+
+    // Process independent streams, one detector per stream, across the thread pool
+    framing.def(
+        "process_batch",
+        [](std::vector<sdrlib::framing::FrameDetector *> detectors,
+           std::vector<py::array> buffers_in) {
+            bindings::check_batch(detectors, buffers_in.size());
+
+            std::vector<sdrlib::cpx *> bufs_in;
+            for (py::array &buffer : buffers_in)
+                bufs_in.push_back(bindings::buffer_ptr<sdrlib::cpx>(buffer, "buffers_in"));
+
+            std::vector<std::vector<sdrlib::framing::DetectionResult>> results(detectors.size());
+            sdrlib::parallel::ThreadPool &pool = bindings::thread_pool();
+            {
+                py::gil_scoped_release release;
+                pool.parallel_for(detectors.size(), [&](size_t k) {
+                    results[k] = detectors[k]->process(bufs_in[k], buffers_in[k].size());
+                });
+            }
+            return results;
+        },
+        py::arg("detectors"), py::arg("buffers_in"),
+        "Run detectors[k].process(buffers_in[k]) for all k in parallel and return the lists of\n"
+        "detections.");
+
+    // Bindings for CorrelationFrameDetector class
+    py::class_<sdrlib::framing::CorrelationFrameDetector, sdrlib::framing::FrameDetector>(
+        framing, "CorrelationFrameDetector")
+        .def(py::init([](config_array preamble, size_t expected_frame_length,
+                         float detection_threshold, const std::string &mode) {
+                 return sdrlib::framing::CorrelationFrameDetector(
+                     to_cvec(preamble), expected_frame_length, detection_threshold, to_mode(mode));
+             }),
+             py::arg("preamble"), py::arg("expected_frame_length"),
+             py::arg("detection_threshold") = 0.8f, py::arg("mode") = "first")
+        .def_property(
+            "mode",
+            [](sdrlib::framing::CorrelationFrameDetector &self) {
+                return self.get_mode() == sdrlib::framing::CorrelationFrameDetector::Mode::First
+                           ? "first"
+                           : "max";
+            },
+            [](sdrlib::framing::CorrelationFrameDetector &self, const std::string &value) {
+                self.set_mode(to_mode(value));
+            });
+
+    // Bindings for DifferentialCorrelationFrameDetector class
+    py::class_<sdrlib::framing::DifferentialCorrelationFrameDetector,
+               sdrlib::framing::FrameDetector>(framing, "DifferentialCorrelationFrameDetector")
+        .def(py::init([](config_array preamble, size_t expected_frame_length,
+                         float detection_threshold) {
+                 return sdrlib::framing::DifferentialCorrelationFrameDetector(
+                     to_cvec(preamble), expected_frame_length, detection_threshold);
+             }),
+             py::arg("preamble"), py::arg("expected_frame_length"),
+             py::arg("detection_threshold") = 0.8f);
+}
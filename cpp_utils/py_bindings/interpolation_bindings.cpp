@@ -3,6 +3,7 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include "buffers.hpp"
 #include "sdrlib/interpolation.hpp"
 #include "sdrlib/types.hpp"
 
@@ -36,10 +37,9 @@ void bind_interpolation(pybind11::module_ &m) {
              py::arg("sample"))
         .def("load",
              [](sdrlib::interpolation::CubicFarrowInterpolator &self,
-                py::array_t<sdrlib::cpx> pyarr_in) {
+                py::array pyarr_in) {
                  size_t size = pyarr_in.size();
-                 py::buffer_info info = pyarr_in.request();
-                 sdrlib::cpx *buf_in = static_cast<sdrlib::cpx *>(info.ptr);
+                 sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "samples");
 
                  self.load(buf_in, size);
              })
@@ -53,15 +53,14 @@ void bind_interpolation(pybind11::module_ &m) {
         .def(
             "process",
             [](sdrlib::interpolation::CubicFarrowInterpolator &self,
-               py::array_t<sdrlib::cpx> pyarr_in, py::array_t<sdrlib::cpx> pyarr_out,
-               float frac_off, int int_off) {
-                py::buffer_info info_in = pyarr_in.request();
-                py::buffer_info info_out = pyarr_out.request();
-
-                sdrlib::cpx *buf_in = static_cast<sdrlib::cpx *>(info_in.ptr);
-                sdrlib::cpx *buf_out = static_cast<sdrlib::cpx *>(info_out.ptr);
-                size_t size = static_cast<size_t>(info_in.size);
+               py::array pyarr_in, py::array pyarr_out, float frac_off, int int_off) {
+                sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "buffer_in");
+                sdrlib::cpx *buf_out =
+                    bindings::buffer_ptr<sdrlib::cpx>(pyarr_out, "buffer_out", true);
+                size_t size = static_cast<size_t>(pyarr_in.size());
+                bindings::check_size(pyarr_out, "buffer_out", size);
 
+                py::gil_scoped_release release;
                 self.process(buf_in, buf_out, size, frac_off, int_off);
             },
             py::arg("buffer_in"), py::arg("buffer_out"), py::arg("fractional_offset"),
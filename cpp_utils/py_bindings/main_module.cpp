@@ -7,8 +7,10 @@ namespace py = pybind11;
 void bind_carrier_recovery(pybind11::module_ &);
 void bind_channel(pybind11::module_ &);
 void bind_control(pybind11::module_ &);
+void bind_framing(pybind11::module_ &);
 void bind_interpolation(pybind11::module_ &);
 void bind_modulation(pybind11::module_ &);
+void bind_timing_recovery(pybind11::module_ &);
 
 PYBIND11_MODULE(py_sdrlib, m) {
     m.doc() = "C++ SDR module exposed with pybind11";
@@ -16,6 +18,8 @@ PYBIND11_MODULE(py_sdrlib, m) {
     bind_channel(m);
     bind_carrier_recovery(m);
     bind_control(m);
+    bind_framing(m);
     bind_interpolation(m);
     bind_modulation(m);
+    bind_timing_recovery(m);
 }
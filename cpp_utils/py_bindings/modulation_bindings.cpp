@@ -2,6 +2,7 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include "buffers.hpp"
 #include "sdrlib/modulation.hpp"
 #include "sdrlib/types.hpp"
 
@@ -15,11 +16,13 @@ void bind_modulation(pybind11::module_ &m) {
     // Use a lambda to handle numpy array inputs
     modulation.def(
         "modulate_qpsk",
-        [](py::array_t<int> pyarr_in, py::array_t<sdrlib::cpx> pyarr_out) {
+        [](py::array pyarr_in, py::array pyarr_out) {
             size_t n = pyarr_in.size();
-            int *buf_in = static_cast<int *>(pyarr_in.request().ptr);
-            sdrlib::cpx *buf_out = static_cast<sdrlib::cpx *>(pyarr_out.request().ptr);
+            int *buf_in = bindings::buffer_ptr<int>(pyarr_in, "buf_in");
+            sdrlib::cpx *buf_out = bindings::buffer_ptr<sdrlib::cpx>(pyarr_out, "buf_out", true);
+            bindings::check_size(pyarr_out, "buf_out", n);
 
+            py::gil_scoped_release release;
             sdrlib::modulation::modulate_qpsk(buf_in, buf_out, n);
         },
         py::arg("buf_in"), py::arg("buf_out"),
@@ -30,11 +33,13 @@ void bind_modulation(pybind11::module_ &m) {
     // Use a lambda to handle numpy array inputs
     modulation.def(
         "demodulate_qpsk",
-        [](py::array_t<sdrlib::cpx> pyarr_in, py::array_t<int> pyarr_out) {
+        [](py::array pyarr_in, py::array pyarr_out) {
             size_t n = pyarr_in.size();
-            sdrlib::cpx *buf_in = static_cast<sdrlib::cpx *>(pyarr_in.request().ptr);
-            int *buf_out = static_cast<int *>(pyarr_out.request().ptr);
+            sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "buf_in");
+            int *buf_out = bindings::buffer_ptr<int>(pyarr_out, "buf_out", true);
+            bindings::check_size(pyarr_out, "buf_out", n);
 
+            py::gil_scoped_release release;
             sdrlib::modulation::demodulate_qpsk(buf_in, buf_out, n);
         },
         py::arg("buf_in"), py::arg("buf_out"),
@@ -45,11 +50,13 @@ void bind_modulation(pybind11::module_ &m) {
     // Use a lambda to handle numpy array inputs
     modulation.def(
         "optimum_decider_qpsk",
-        [](py::array_t<sdrlib::cpx> pyarr_in, py::array_t<int> pyarr_out) {
+        [](py::array pyarr_in, py::array pyarr_out) {
             size_t n = pyarr_in.size();
-            sdrlib::cpx *buf_in = static_cast<sdrlib::cpx *>(pyarr_in.request().ptr);
-            int *buf_out = static_cast<int *>(pyarr_out.request().ptr);
+            sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "buf_in");
+            int *buf_out = bindings::buffer_ptr<int>(pyarr_out, "buf_out", true);
+            bindings::check_size(pyarr_out, "buf_out", n);
 
+            py::gil_scoped_release release;
             sdrlib::modulation::optimum_decider_qpsk(buf_in, buf_out, n);
         },
         py::arg("buf_in"), py::arg("buf_out"),
@@ -0,0 +1,120 @@
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include "buffers.hpp"
+#include "sdrlib/timing_recovery.hpp"
+#include "sdrlib/types.hpp"
+
+namespace py = pybind11;
+
+void bind_timing_recovery(pybind11::module_ &m) {
+
+    py::module_ timing_recovery =
+        m.def_submodule("timing_recovery", "Symbol timing recovery algorithms");
+
+    // Bindings for GardnerSymbolTimingCorrector class
+    py::class_<sdrlib::timing_recovery::GardnerSymbolTimingCorrector>(
+        timing_recovery, "GardnerSymbolTimingCorrector")
+
+        // Constructor
+        .def(py::init<float, float, float, int>(), py::arg("K_p") = 0.1f, py::arg("K_i") = 0.0f,
+             py::arg("K_d") = 0.0f, py::arg("history_size") = 1024)
+
+        // Reset method
+        .def("reset", &sdrlib::timing_recovery::GardnerSymbolTimingCorrector::reset)
+
+        // Read-only properties for the current fractional delay and the histories
+        // The histories are read-only views of the corrector's ring buffers (no copy)
+        .def_property_readonly("mu", &sdrlib::timing_recovery::GardnerSymbolTimingCorrector::get_mu)
+        .def_property_readonly(
+            "error_history",
+            [](py::object self) {
+                const sdrlib::fvec &error_history =
+                    self.cast<sdrlib::timing_recovery::GardnerSymbolTimingCorrector &>()
+                        .get_error_history();
+                return bindings::readonly_view(error_history.data(), error_history.size(), self);
+            })
+        .def_property_readonly(
+            "mu_history",
+            [](py::object self) {
+                const sdrlib::fvec &mu_history =
+                    self.cast<sdrlib::timing_recovery::GardnerSymbolTimingCorrector &>()
+                        .get_mu_history();
+                return bindings::readonly_view(mu_history.data(), mu_history.size(), self);
+            })
+
+        .def("max_output", &sdrlib::timing_recovery::GardnerSymbolTimingCorrector::max_output,
+             py::arg("n"))
+
+        // Process a block of samples into a preallocated buffer, returning the number of symbols
+        .def(
+            "process",
+            [](sdrlib::timing_recovery::GardnerSymbolTimingCorrector &self,
+               py::array pyarr_in, py::array pyarr_out) {
+                sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "buffer_in");
+                sdrlib::cpx *buf_out =
+                    bindings::buffer_ptr<sdrlib::cpx>(pyarr_out, "buffer_out", true);
+                size_t size = static_cast<size_t>(pyarr_in.size());
+                bindings::check_size(pyarr_out, "buffer_out", self.max_output(size));
+
+                py::gil_scoped_release release;
+                return self.process(buf_in, buf_out, size);
+            },
+            py::arg("buffer_in"), py::arg("buffer_out"))
+
+        // Process a block of samples and return the symbols, like the Python corrector
+        .def(
+            "process",
+            [](sdrlib::timing_recovery::GardnerSymbolTimingCorrector &self,
+               py::array pyarr_in) {
+                sdrlib::cpx *buf_in = bindings::buffer_ptr<sdrlib::cpx>(pyarr_in, "buffer_in");
+                size_t size = static_cast<size_t>(pyarr_in.size());
+
+                py::array_t<sdrlib::cpx> pyarr_out(self.max_output(size));
+                sdrlib::cpx *buf_out = pyarr_out.mutable_data();
+
+                size_t n_out;
+                {
+                    py::gil_scoped_release release;
+                    n_out = self.process(buf_in, buf_out, size);
+                }
+                pyarr_out.resize({static_cast<py::ssize_t>(n_out)});
+                return pyarr_out;
+            },
+            py::arg("buffer_in"));
+
+    // Process independent streams, one corrector per stream, across the thread pool
+    timing_recovery.def(
+        "process_batch",
+        [](std::vector<sdrlib::timing_recovery::GardnerSymbolTimingCorrector *> correctors,
+           std::vector<py::array> buffers_in, std::vector<py::array> buffers_out) {
+            bindings::check_batch(correctors, buffers_in.size());
+            if (buffers_out.size() != buffers_in.size())
+                throw py::value_error("buffers_in and buffers_out must have the same length");
+
+            std::vector<sdrlib::cpx *> bufs_in, bufs_out;
+            std::vector<size_t> sizes;
+            for (size_t k = 0; k < buffers_in.size(); ++k) {
+                bufs_in.push_back(bindings::buffer_ptr<sdrlib::cpx>(buffers_in[k], "buffers_in"));
+                bufs_out.push_back(
+                    bindings::buffer_ptr<sdrlib::cpx>(buffers_out[k], "buffers_out", true));
+                sizes.push_back(static_cast<size_t>(buffers_in[k].size()));
+                bindings::check_size(buffers_out[k], "buffers_out",
+                                     correctors[k]->max_output(sizes.back()));
+            }
+
+            std::vector<size_t> n_out(correctors.size());
+            sdrlib::parallel::ThreadPool &pool = bindings::thread_pool();
+            {
+                py::gil_scoped_release release;
+                pool.parallel_for(correctors.size(), [&](size_t k) {
+                    n_out[k] = correctors[k]->process(bufs_in[k], bufs_out[k], sizes[k]);
+                });
+            }
+            return n_out;
+        },
+        py::arg("correctors"), py::arg("buffers_in"), py::arg("buffers_out"),
+        "Process buffers_in[k] into buffers_out[k] with correctors[k], for all k in parallel.\n"
+        "Returns the number of symbols written to each output buffer.");
+}
@@ -75,10 +75,11 @@ class CostasLoopQPSK {
     void reset();
 
     /**
-     * @brief Retrieves a copy of the error history buffer.
-     * @return A vector containing recent error values.
+     * @brief Retrieves the error history buffer.
+     * @return A reference to the circular buffer of recent error values, valid for the lifetime
+     * of the loop (reset() clears it in place).
      */
-    sdrlib::fvec get_error_history() const;
+    const sdrlib::fvec &get_error_history() const;
 
     /**
      * @brief Processes a single complex input sample and outputs the corrected sample.
@@ -0,0 +1,152 @@
+#pragma once
+#include <optional>
+#include <vector>
+
+#include "sdrlib/types.hpp"
+
+// Frame detection-related signal processing utilities
+namespace sdrlib::framing {
+
+/**
+ * @brief A detected frame.
+ */
+struct DetectionResult {
+    /// Samples of the frame, starting with the preamble
+    sdrlib::cvec frame;
+    /// Normalized correlation metric at the detection
+    float metric = 0.0f;
+    /// Index of the preamble in the detector buffer at the time of detection
+    size_t idx = 0;
+};
+
+/**
+ * @brief Normalized correlation metric of x against a preamble.
+ *
+ * metric[k] = |sum_j x[k + j] conj(preamble[j])|^2 / (|preamble|^2 * sum_j |x[k + j]|^2) for
+ * every full overlap k (x.size() - preamble.size() + 1 values, empty if x is shorter than the
+ * preamble). The correlation is computed with KFR's FFT convolution.
+ */
+sdrlib::fvec correlation_metric(const sdrlib::cvec &x, const sdrlib::cvec &preamble);
+
+/**
+ * @class FrameDetector
+ * @brief Preamble-based frame detector: buffering and the SEARCH/ACQUIRE state machine.
+ *
+ * Port of py_utils.framing.FrameDetector. Subclasses implement detect_preamble(), which
+ * searches the buffer for a preamble. Once one is found, the detection is held until
+ * expected_frame_length samples from the preamble on have been received, so frames may span
+ * any number of process() calls.
+ *
+ * @note The class is not thread-safe.
+ */
+class FrameDetector {
+  protected:
+    /// Preamble as correlated against the buffer
+    sdrlib::cvec preamble;
+
+    /// Frame length in samples, including the preamble
+    size_t expected_frame_length;
+
+    /// Threshold on the normalized correlation metric, in [0, 1]
+    float detection_threshold;
+
+    /// Samples received but not yet consumed by a frame or discarded by the search
+    sdrlib::cvec buffer;
+
+    enum class State { Search, Acquire };
+    State state = State::Search;
+
+    /// Detection waiting for the rest of its frame
+    std::optional<DetectionResult> pending;
+
+    /**
+     * @brief Search the buffer for a preamble.
+     * @return The detection (with idx set), or std::nullopt if none was found.
+     */
+    virtual std::optional<DetectionResult> detect_preamble() = 0;
+
+  public:
+    /**
+     * @brief Constructs a FrameDetector.
+     * @param preamble The preamble starting every frame.
+     * @param expected_frame_length Frame length in samples, including the preamble.
+     * @param detection_threshold Threshold on the normalized correlation metric (default: 0.8).
+     */
+    FrameDetector(const sdrlib::cvec &preamble, size_t expected_frame_length,
+                  float detection_threshold = 0.8f);
+
+    virtual ~FrameDetector() = default;
+
+    /**
+     * @brief Clears the buffer and any partially received frame.
+     */
+    void reset();
+
+    /**
+     * @brief Appends samples to the buffer and returns the frames completed so far.
+     * @param buf_in Pointer to the input buffer of complex samples.
+     * @param n Number of samples.
+     * @return The detections whose frames were completed by this call, in order.
+     */
+    std::vector<DetectionResult> process(const sdrlib::cpx *buf_in, size_t n);
+
+    sdrlib::cvec get_preamble() const;
+    virtual void set_preamble(const sdrlib::cvec &value);
+
+    size_t get_expected_frame_length() const;
+    void set_expected_frame_length(size_t value);
+
+    float get_detection_threshold() const;
+    void set_detection_threshold(float value);
+
+    /**
+     * @brief Retrieves a copy of the detector buffer.
+     */
+    sdrlib::cvec get_buffer() const;
+};
+
+/**
+ * @class CorrelationFrameDetector
+ * @brief Detects frames by correlating with the preamble (matched filter).
+ *
+ * In Mode::First the first metric above the threshold is reported; in Mode::Max the maximum
+ * of the buffer is reported regardless of the threshold, as in the Python detector.
+ */
+class CorrelationFrameDetector : public FrameDetector {
+  public:
+    enum class Mode { First, Max };
+
+  private:
+    Mode mode;
+
+  protected:
+    std::optional<DetectionResult> detect_preamble() override;
+
+  public:
+    CorrelationFrameDetector(const sdrlib::cvec &preamble, size_t expected_frame_length,
+                             float detection_threshold = 0.8f, Mode mode = Mode::First);
+
+    Mode get_mode() const;
+    void set_mode(Mode value);
+};
+
+/**
+ * @class DifferentialCorrelationFrameDetector
+ * @brief Detects frames by correlating the first difference of the signal with that of the
+ * preamble, which makes the metric robust to small carrier frequency offsets.
+ *
+ * get_preamble() returns the differenced preamble; set_preamble() takes the raw preamble.
+ */
+class DifferentialCorrelationFrameDetector : public FrameDetector {
+  protected:
+    std::optional<DetectionResult> detect_preamble() override;
+
+  public:
+    DifferentialCorrelationFrameDetector(const sdrlib::cvec &preamble,
+                                         size_t expected_frame_length,
+                                         float detection_threshold = 0.8f);
+
+    void set_preamble(const sdrlib::cvec &value) override;
+};
+
+} // namespace sdrlib::framing
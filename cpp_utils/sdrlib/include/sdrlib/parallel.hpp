@@ -0,0 +1,74 @@
+#pragma once
+#include <atomic>
+#include <condition_variable>
+#include <cstddef>
+#include <exception>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+// Parallel execution utilities
+namespace sdrlib::parallel {
+
+/**
+ * @class ThreadPool
+ * @brief Fixed pool of worker threads for processing independent buffers in parallel.
+ *
+ * parallel_for() distributes task indices dynamically over the workers and the calling thread,
+ * so tasks of uneven length are balanced. Tasks must not share mutable state (e.g. two tasks
+ * must not process with the same CostasLoopQPSK).
+ *
+ * Notes:
+ * - parallel_for() may be called from several threads; calls are serialized.
+ * - The first exception thrown by a task is rethrown by parallel_for() once all tasks finished.
+ */
+class ThreadPool {
+  private:
+    std::vector<std::thread> workers;
+
+    /// Serializes parallel_for() calls
+    std::mutex call_mutex;
+
+    /// Protects the task state below
+    std::mutex mutex;
+    std::condition_variable cv_work;
+    std::condition_variable cv_done;
+
+    const std::function<void(size_t)> *task = nullptr;
+    size_t n_tasks = 0;
+    std::atomic<size_t> next_task{0};
+    size_t n_finished = 0;
+    size_t generation = 0;
+    bool stopping = false;
+    std::exception_ptr error;
+
+    void worker_loop();
+    void run_tasks();
+
+  public:
+    /**
+     * @brief Constructs a pool using n_threads threads in total, including the calling thread.
+     * @param n_threads Number of threads; 0 uses std::thread::hardware_concurrency().
+     */
+    explicit ThreadPool(unsigned int n_threads = 0);
+
+    ~ThreadPool();
+
+    ThreadPool(const ThreadPool &) = delete;
+    ThreadPool &operator=(const ThreadPool &) = delete;
+
+    /**
+     * @brief Number of threads used by parallel_for(), including the calling thread.
+     */
+    size_t size() const;
+
+    /**
+     * @brief Runs fn(i) for every i in [0, n) and blocks until all calls returned.
+     * @param n Number of tasks.
+     * @param fn Task function, called concurrently from several threads.
+     */
+    void parallel_for(size_t n, const std::function<void(size_t)> &fn);
+};
+
+} // namespace sdrlib::parallel
@@ -0,0 +1,114 @@
+#pragma once
+#include <array>
+
+#include "sdrlib/pid_feedback.hpp"
+#include "sdrlib/types.hpp"
+
+// Symbol timing recovery-related signal processing utilities
+namespace sdrlib::timing_recovery {
+
+/**
+ * @brief FIR weights of the cubic Lagrange (Farrow) interpolator for a fractional position d.
+ *
+ * The weights apply to four samples ordered [oldest -> newest]. d=0 returns the second oldest
+ * sample and d=1 the second newest, matching interpolation::CubicFarrowInterpolator.
+ */
+std::array<float, 4> cubic_farrow_weights(float d);
+
+/**
+ * @class GardnerSymbolTimingCorrector
+ * @brief Gardner timing error detector and cubic Farrow interpolator for 2 samples/symbol.
+ *
+ * Port of py_utils.timing_recovery.GardnerSymbolTimingCorrector. Every pair of input samples
+ * produces one symbol. The fractional delay mu is updated by a PID controller from the Gardner
+ * error once per symbol, and wraps with hysteresis (flipping the sample parity) when it drifts
+ * out of [0.2, 1].
+ *
+ * Notes:
+ * - Streams may be fed in chunks of any length; an odd trailing sample is carried into the
+ *   next call.
+ * - The class is not thread-safe.
+ */
+class GardnerSymbolTimingCorrector {
+  private:
+    /// Last four input samples, oldest first
+    std::array<sdrlib::cpx, 4> buffer{};
+
+    /// Fractional delay of the interpolated sample
+    float mu = 0.5f;
+
+    /// Parity of the samples at which the timing error is evaluated
+    unsigned int offset = 0;
+
+    /// Parity of the number of samples loaded so far
+    unsigned int phase = 0;
+
+    /// Odd sample left over from the previous call
+    sdrlib::cpx carry{0.0f, 0.0f};
+    bool has_carry = false;
+
+    /// Circular buffers of recent timing errors and mu values, one entry per output symbol
+    sdrlib::fvec error_history;
+    sdrlib::fvec mu_history;
+    size_t history_idx = 0;
+
+    /// Loop filter driving mu from the timing error
+    sdrlib::control::PIDFeedback controller;
+
+    /// Interpolate the sample at fractional position d of the buffer
+    sdrlib::cpx interpolate(float d) const;
+
+    /// Process one pair of input samples and return the output symbol
+    sdrlib::cpx process_pair(sdrlib::cpx first, sdrlib::cpx second);
+
+  public:
+    /**
+     * @brief Constructs a corrector with the given loop filter gains.
+     * @param K_p Proportional gain (default matches the Python corrector).
+     * @param K_i Integral gain.
+     * @param K_d Derivative gain.
+     * @param history_size The size of the error/mu history buffers (default: 1024).
+     */
+    GardnerSymbolTimingCorrector(float K_p = 0.1f, float K_i = 0.0f, float K_d = 0.0f,
+                                 int history_size = 1024);
+
+    /**
+     * @brief Resets the interpolator buffer, mu, the loop filter and the histories.
+     */
+    void reset();
+
+    /**
+     * @brief Gets the current fractional delay.
+     * @return The current mu.
+     */
+    float get_mu() const;
+
+    /**
+     * @brief Retrieves the timing error history buffer.
+     * @return A reference to the circular buffer of recent timing errors, valid for the lifetime
+     * of the corrector (reset() clears it in place).
+     */
+    const sdrlib::fvec &get_error_history() const;
+
+    /**
+     * @brief Retrieves the mu history buffer.
+     * @return A reference to the circular buffer of recent mu values.
+     */
+    const sdrlib::fvec &get_mu_history() const;
+
+    /**
+     * @brief Maximum number of symbols produced by process() for n input samples.
+     */
+    size_t max_output(size_t n) const;
+
+    /**
+     * @brief Processes a buffer of samples at 2 samples/symbol.
+     * @param buf_in Pointer to the input buffer of complex samples.
+     * @param buf_out Pointer to the output buffer, holding at least max_output(n) symbols.
+     * @param n Number of input samples.
+     * @return Number of symbols written to buf_out.
+     */
+    size_t process(const sdrlib::cpx *buf_in, sdrlib::cpx *buf_out, size_t n);
+};
+
+} // namespace sdrlib::timing_recovery
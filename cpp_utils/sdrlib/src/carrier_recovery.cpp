@@ -45,7 +45,7 @@ float CostasLoopQPSK::get_loop_bw() const { return loop_bw; }
 
 float CostasLoopQPSK::get_correction() const { return correction; }
 
-sdrlib::fvec CostasLoopQPSK::get_error_history() const { return error_history; }
+const sdrlib::fvec &CostasLoopQPSK::get_error_history() const { return error_history; }
 
 void CostasLoopQPSK::process_sample(sdrlib::cpx &symbol_in, sdrlib::cpx &symbol_out) {
 
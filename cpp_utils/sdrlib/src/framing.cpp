@@ -0,0 +1,187 @@
+#include <algorithm>
+#include <complex>
+#include <kfr/base.hpp>
+#include <kfr/dft.hpp>
+
+#include "sdrlib/framing.hpp"
+#include "sdrlib/types.hpp"
+
+namespace sdrlib::framing {
+
+sdrlib::fvec correlation_metric(const sdrlib::cvec &x, const sdrlib::cvec &preamble) {
+    size_t L = preamble.size();
+    if (L == 0 || x.size() < L)
+        return sdrlib::fvec();
+    size_t n_valid = x.size() - L + 1;
+
+    // Matched filter: time-reversed conjugate of the preamble
+    sdrlib::cvec matched_filter(L);
+    for (size_t j = 0; j < L; ++j)
+        matched_filter[j] = std::conj(preamble[L - 1 - j]);
+
+    // Full convolution via FFT; index k + L - 1 is the correlation at offset k
+    sdrlib::cvec matched = kfr::convolve(x, matched_filter);
+
+    double preamble_norm = 0.0;
+    for (const sdrlib::cpx &p : preamble)
+        preamble_norm += std::norm(p);
+
+    // Energy of the sliding window as a running sum of |x|^2
+    sdrlib::dvec window_norm(n_valid);
+    double window = 0.0;
+    for (size_t j = 0; j < L; ++j)
+        window += std::norm(x[j]);
+    window_norm[0] = window;
+    for (size_t k = 1; k < n_valid; ++k) {
+        window += std::norm(x[k + L - 1]) - std::norm(x[k - 1]);
+        window_norm[k] = window;
+    }
+
+    // Windows of (near) silence would divide FFT round-off by round-off in the running sum, so
+    // they get a zero metric. The floor is relative to keep the metric scale-invariant.
+    double silence = 1e-6 * *std::max_element(window_norm.begin(), window_norm.end());
+
+    sdrlib::fvec metric(n_valid);
+    for (size_t k = 0; k < n_valid; ++k) {
+        if (window_norm[k] <= silence) {
+            metric[k] = 0.0f;
+            continue;
+        }
+        double normalization = preamble_norm * window_norm[k];
+        metric[k] = static_cast<float>(std::norm(matched[k + L - 1]) / normalization);
+    }
+    return metric;
+}
+
+// FrameDetector
+
+FrameDetector::FrameDetector(const sdrlib::cvec &preamble, size_t expected_frame_length,
+                             float detection_threshold)
+    : preamble(preamble), expected_frame_length(expected_frame_length),
+      detection_threshold(detection_threshold) {
+    reset();
+}
+
+void FrameDetector::reset() {
+    state = State::Search;
+    pending.reset();
+    buffer.clear();
+}
+
+std::vector<DetectionResult> FrameDetector::process(const sdrlib::cpx *buf_in, size_t n) {
+    buffer.insert(buffer.end(), buf_in, buf_in + n);
+    std::vector<DetectionResult> results;
+
+    // Pause the state machine when the buffer can't hold a frame
+    while (buffer.size() >= expected_frame_length) {
+        if (state == State::Search) {
+            std::optional<DetectionResult> res = detect_preamble();
+            if (!res) {
+                // Keep the tail in case a preamble straddles the next call
+                size_t keep = std::min(buffer.size(), preamble.size());
+                buffer.erase(buffer.begin(), buffer.end() - keep);
+                break;
+            }
+
+            // Hold the detection until its frame is complete, which may take more calls
+            buffer.erase(buffer.begin(), buffer.begin() + res->idx);
+            pending = std::move(res);
+            state = State::Acquire;
+            continue;
+        }
+
+        // ACQUIRE: the frame is complete
+        pending->frame = sdrlib::cvec(buffer.begin(), buffer.begin() + expected_frame_length);
+        results.push_back(std::move(*pending));
+        pending.reset();
+
+        buffer.erase(buffer.begin(), buffer.begin() + expected_frame_length);
+        state = State::Search;
+    }
+
+    return results;
+}
+
+sdrlib::cvec FrameDetector::get_preamble() const { return preamble; }
+
+void FrameDetector::set_preamble(const sdrlib::cvec &value) { preamble = value; }
+
+size_t FrameDetector::get_expected_frame_length() const { return expected_frame_length; }
+
+void FrameDetector::set_expected_frame_length(size_t value) { expected_frame_length = value; }
+
+float FrameDetector::get_detection_threshold() const { return detection_threshold; }
+
+void FrameDetector::set_detection_threshold(float value) { detection_threshold = value; }
+
+sdrlib::cvec FrameDetector::get_buffer() const { return buffer; }
+
+// CorrelationFrameDetector
+
+CorrelationFrameDetector::CorrelationFrameDetector(const sdrlib::cvec &preamble,
+                                                   size_t expected_frame_length,
+                                                   float detection_threshold, Mode mode)
+    : FrameDetector(preamble, expected_frame_length, detection_threshold), mode(mode) {}
+
+CorrelationFrameDetector::Mode CorrelationFrameDetector::get_mode() const { return mode; }
+
+void CorrelationFrameDetector::set_mode(Mode value) { mode = value; }
+
+std::optional<DetectionResult> CorrelationFrameDetector::detect_preamble() {
+    sdrlib::fvec metric = correlation_metric(buffer, preamble);
+    if (metric.empty())
+        return std::nullopt;
+
+    size_t idx;
+    if (mode == Mode::First) {
+        auto it = std::find_if(metric.begin(), metric.end(),
+                               [this](float m) { return m > detection_threshold; });
+        if (it == metric.end())
+            return std::nullopt;
+        idx = static_cast<size_t>(it - metric.begin());
+    } else {
+        idx = static_cast<size_t>(std::max_element(metric.begin(), metric.end()) - metric.begin());
+    }
+
+    DetectionResult res;
+    res.idx = idx;
+    res.metric = metric[idx];
+    return res;
+}
+
+// DifferentialCorrelationFrameDetector
+
+DifferentialCorrelationFrameDetector::DifferentialCorrelationFrameDetector(
+    const sdrlib::cvec &preamble, size_t expected_frame_length, float detection_threshold)
+    : FrameDetector(preamble, expected_frame_length, detection_threshold) {
+    // The base constructor stores the raw preamble
+    set_preamble(preamble);
+}
+
+void DifferentialCorrelationFrameDetector::set_preamble(const sdrlib::cvec &value) {
+    preamble = sdrlib::cvec(value.size() > 0 ? value.size() - 1 : 0);
+    for (size_t j = 0; j < preamble.size(); ++j)
+        preamble[j] = value[j + 1] - value[j];
+}
+
+std::optional<DetectionResult> DifferentialCorrelationFrameDetector::detect_preamble() {
+    if (buffer.size() < 2)
+        return std::nullopt;
+
+    sdrlib::cvec dbuffer(buffer.size() - 1);
+    for (size_t j = 0; j < dbuffer.size(); ++j)
+        dbuffer[j] = buffer[j + 1] - buffer[j];
+
+    sdrlib::fvec metric = correlation_metric(dbuffer, preamble);
+    auto it = std::find_if(metric.begin(), metric.end(),
+                           [this](float m) { return m > detection_threshold; });
+    if (it == metric.end())
+        return std::nullopt;
+
+    DetectionResult res;
+    res.idx = static_cast<size_t>(it - metric.begin());
+    res.metric = *it;
+    return res;
+}
+
+} // namespace sdrlib::framing
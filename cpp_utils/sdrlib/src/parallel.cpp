@@ -0,0 +1,88 @@
+#include <algorithm>
+
+#include "sdrlib/parallel.hpp"
+
+namespace sdrlib::parallel {
+
+ThreadPool::ThreadPool(unsigned int n_threads) {
+    if (n_threads == 0)
+        n_threads = std::max(1u, std::thread::hardware_concurrency());
+
+    // The calling thread works too, so n_threads - 1 workers are started
+    for (unsigned int i = 1; i < n_threads; ++i)
+        workers.emplace_back(&ThreadPool::worker_loop, this);
+}
+
+ThreadPool::~ThreadPool() {
+    {
+        std::lock_guard<std::mutex> lock(mutex);
+        stopping = true;
+    }
+    cv_work.notify_all();
+    for (std::thread &worker : workers)
+        worker.join();
+}
+
+size_t ThreadPool::size() const { return workers.size() + 1; }
+
+void ThreadPool::run_tasks() {
+    for (size_t i = next_task.fetch_add(1); i < n_tasks; i = next_task.fetch_add(1)) {
+        try {
+            (*task)(i);
+        } catch (...) {
+            std::lock_guard<std::mutex> lock(mutex);
+            if (!error)
+                error = std::current_exception();
+        }
+    }
+}
+
+void ThreadPool::worker_loop() {
+    size_t seen = 0;
+    while (true) {
+        {
+            std::unique_lock<std::mutex> lock(mutex);
+            cv_work.wait(lock, [&] { return stopping || generation != seen; });
+            if (stopping)
+                return;
+            seen = generation;
+        }
+
+        run_tasks();
+
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            ++n_finished;
+        }
+        cv_done.notify_one();
+    }
+}
+
+void ThreadPool::parallel_for(size_t n, const std::function<void(size_t)> &fn) {
+    if (n == 0)
+        return;
+    std::lock_guard<std::mutex> call_lock(call_mutex);
+
+    {
+        std::lock_guard<std::mutex> lock(mutex);
+        task = &fn;
+        n_tasks = n;
+        next_task = 0;
+        n_finished = 0;
+        error = nullptr;
+        ++generation;
+    }
+    cv_work.notify_all();
+
+    run_tasks();
+
+    // Every worker takes part in every generation, so none can still be running fn after this
+    std::unique_lock<std::mutex> lock(mutex);
+    cv_done.wait(lock, [this] { return n_finished == workers.size(); });
+    task = nullptr;
+
+    if (error)
+        std::rethrow_exception(error);
+}
+
+} // namespace sdrlib::parallel
@@ -0,0 +1,128 @@
+#include <algorithm>
+#include <complex>
+#include <kfr/base.hpp>
+
+#include "sdrlib/pid_feedback.hpp"
+#include "sdrlib/timing_recovery.hpp"
+#include "sdrlib/types.hpp"
+
+namespace sdrlib::timing_recovery {
+
+std::array<float, 4> cubic_farrow_weights(float d) {
+    float d2 = d * d;
+    float d3 = d2 * d;
+    return {-d / 3 + d2 / 2 - d3 / 6, 1 - d / 2 - d2 + d3 / 2, d + d2 / 2 - d3 / 2,
+            -d / 6 + d3 / 6};
+}
+
+GardnerSymbolTimingCorrector::GardnerSymbolTimingCorrector(float K_p, float K_i, float K_d,
+                                                           int history_size)
+    : controller(K_p, K_i, K_d) {
+    error_history = sdrlib::fvec(history_size, 0.0f);
+    mu_history = sdrlib::fvec(history_size, 0.0f);
+    reset();
+}
+
+void GardnerSymbolTimingCorrector::reset() {
+    buffer.fill(sdrlib::cpx(0.0f, 0.0f));
+    mu = 0.5f;
+    offset = 0;
+    phase = 0;
+    has_carry = false;
+
+    std::fill(error_history.begin(), error_history.end(), 0.0f);
+    std::fill(mu_history.begin(), mu_history.end(), 0.0f);
+    history_idx = 0;
+
+    controller.reset();
+}
+
+float GardnerSymbolTimingCorrector::get_mu() const { return mu; }
+
+const sdrlib::fvec &GardnerSymbolTimingCorrector::get_error_history() const {
+    return error_history;
+}
+
+const sdrlib::fvec &GardnerSymbolTimingCorrector::get_mu_history() const { return mu_history; }
+
+size_t GardnerSymbolTimingCorrector::max_output(size_t n) const {
+    return (n + (has_carry ? 1 : 0)) / 2;
+}
+
+sdrlib::cpx GardnerSymbolTimingCorrector::interpolate(float d) const {
+    std::array<float, 4> h = cubic_farrow_weights(d);
+    return h[0] * buffer[0] + h[1] * buffer[1] + h[2] * buffer[2] + h[3] * buffer[3];
+}
+
+sdrlib::cpx GardnerSymbolTimingCorrector::process_pair(sdrlib::cpx first, sdrlib::cpx second) {
+    // Interpolation is best when mu is close to the center of the buffer. Wrap mu with
+    // hysteresis when it drifts out of [lower, upper] and flip the sample parity.
+    constexpr float H = 0.1f;
+    constexpr float lower = 0.2f;
+    constexpr float upper = 1.0f;
+
+    sdrlib::cpx symbol_out(0.0f, 0.0f);
+    bool have_out = false;
+    float e = 0.0f;
+
+    for (sdrlib::cpx sample : {first, second}) {
+        if (mu > upper + H) {
+            mu = lower;
+            offset ^= 1;
+        } else if (mu < lower - H) {
+            mu = upper;
+            offset ^= 1;
+        }
+
+        // Shift the next sample into the interpolator buffer
+        std::rotate(buffer.begin(), buffer.begin() + 1, buffer.end());
+        buffer[3] = sample;
+        phase ^= 1;
+
+        if (phase == offset) {
+            // Gardner TED on the samples half a symbol before and after the strobe
+            sdrlib::cpx prev = interpolate(mu - 1.0f);
+            sdrlib::cpx curr = interpolate(mu);
+            sdrlib::cpx next = interpolate(mu + 1.0f);
+            e = ((prev - next) * std::conj(curr)).real();
+            mu += controller.process(e);
+        } else {
+            // May be overwritten by the second sample if the parity flipped
+            symbol_out = interpolate(mu);
+            have_out = true;
+        }
+    }
+
+    if (!error_history.empty()) {
+        error_history[history_idx] = e;
+        mu_history[history_idx] = mu;
+        history_idx = (history_idx + 1) % error_history.size();
+    }
+
+    return have_out ? symbol_out : interpolate(mu);
+}
+
+size_t GardnerSymbolTimingCorrector::process(const sdrlib::cpx *buf_in, sdrlib::cpx *buf_out,
+                                             size_t n) {
+    size_t i = 0;
+    size_t n_out = 0;
+
+    // Complete the pair started by the previous call
+    if (has_carry && n > 0) {
+        buf_out[n_out++] = process_pair(carry, buf_in[0]);
+        has_carry = false;
+        i = 1;
+    }
+
+    for (; i + 1 < n; i += 2)
+        buf_out[n_out++] = process_pair(buf_in[i], buf_in[i + 1]);
+
+    if (i < n) {
+        carry = buf_in[i];
+        has_carry = true;
+    }
+
+    return n_out;
+}
+
+} // namespace sdrlib::timing_recovery
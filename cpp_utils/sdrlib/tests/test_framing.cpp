@@ -0,0 +1,166 @@
+#include "sdrlib/framing.hpp"
+#include "sdrlib/types.hpp"
+#include <algorithm>
+#include <cmath>
+#include <gtest/gtest.h>
+#include <vector>
+
+using namespace sdrlib;
+using namespace framing;
+
+// Zadoff-Chu sequence of odd length N with root q
+cvec zc_sequence(size_t N, int q = 1) {
+    cvec seq(N);
+    for (size_t n = 0; n < N; ++n)
+        seq[n] = std::polar(1.0f, float(-M_PI * q * n * (n + 1) / double(N)));
+    return seq;
+}
+
+// Pseudo-random unit-energy QPSK payload
+cvec qpsk_payload(size_t n, unsigned long seed = 7) {
+    cvec payload(n);
+    for (size_t k = 0; k < n; ++k) {
+        seed = (seed * 1103515245 + 12345) % (1ul << 31);
+        int bits = (seed >> 16) & 0b11;
+        payload[k] = cpx(1.0f - 2.0f * (bits >> 1), 1.0f - 2.0f * (bits & 1)) / std::sqrt(2.0f);
+    }
+    return payload;
+}
+
+class CorrelationFrameDetectorTest : public ::testing::Test {
+  protected:
+    static constexpr size_t PREAMBLE_LENGTH = 63;
+    static constexpr size_t FRAME_LENGTH = 200;
+
+    cvec preamble = zc_sequence(PREAMBLE_LENGTH);
+    CorrelationFrameDetector fd{preamble, FRAME_LENGTH, 0.8f};
+
+    // Zeros, then one frame (preamble + payload) starting at offset, then zeros
+    cvec make_signal(size_t offset, size_t n_after = 50) {
+        cvec signal(offset, cpx(0.0f, 0.0f));
+        signal.insert(signal.end(), preamble.begin(), preamble.end());
+        cvec payload = qpsk_payload(FRAME_LENGTH - PREAMBLE_LENGTH);
+        signal.insert(signal.end(), payload.begin(), payload.end());
+        signal.insert(signal.end(), n_after, cpx(0.0f, 0.0f));
+        return signal;
+    }
+
+    void SetUp() override { fd.reset(); }
+};
+
+TEST_F(CorrelationFrameDetectorTest, MetricPeaksAtPreamble) {
+    cvec signal = make_signal(40);
+
+    fvec metric = correlation_metric(signal, preamble);
+
+    ASSERT_EQ(metric.size(), signal.size() - PREAMBLE_LENGTH + 1);
+    EXPECT_NEAR(metric[40], 1.0f, 1e-4);
+    for (size_t k = 0; k < metric.size(); ++k) {
+        EXPECT_LE(metric[k], 1.0f + 1e-4f) << "at index " << k;
+        if (k != 40) {
+            EXPECT_LT(metric[k], 0.8f) << "at index " << k;
+        }
+    }
+}
+
+TEST_F(CorrelationFrameDetectorTest, MetricIsScaleInvariant) {
+    cvec signal = make_signal(10);
+    cvec scaled = signal;
+    for (auto &x : scaled)
+        x *= cpx(0.0f, 3.0f);
+
+    fvec metric = correlation_metric(signal, preamble);
+    fvec metric_scaled = correlation_metric(scaled, preamble);
+
+    for (size_t k = 0; k < metric.size(); ++k)
+        EXPECT_NEAR(metric[k], metric_scaled[k], 1e-4) << "at index " << k;
+}
+
+TEST_F(CorrelationFrameDetectorTest, DetectsFrame) {
+    cvec signal = make_signal(37);
+
+    std::vector<DetectionResult> results = fd.process(signal.data(), signal.size());
+
+    ASSERT_EQ(results.size(), 1u);
+    EXPECT_EQ(results[0].idx, 37u);
+    EXPECT_NEAR(results[0].metric, 1.0f, 1e-4);
+    ASSERT_EQ(results[0].frame.size(), FRAME_LENGTH);
+    for (size_t i = 0; i < PREAMBLE_LENGTH; ++i) {
+        EXPECT_NEAR(results[0].frame[i].real(), preamble[i].real(), 1e-6);
+        EXPECT_NEAR(results[0].frame[i].imag(), preamble[i].imag(), 1e-6);
+    }
+}
+
+TEST_F(CorrelationFrameDetectorTest, FrameSpanningCalls) {
+    cvec signal = make_signal(90);
+
+    // Feed the signal in chunks much shorter than a frame
+    std::vector<DetectionResult> results;
+    for (size_t start = 0; start < signal.size(); start += 16) {
+        size_t n = std::min<size_t>(16, signal.size() - start);
+        auto res = fd.process(signal.data() + start, n);
+        results.insert(results.end(), res.begin(), res.end());
+    }
+
+    ASSERT_EQ(results.size(), 1u);
+    EXPECT_NEAR(results[0].metric, 1.0f, 1e-4);
+    EXPECT_NEAR(results[0].frame[0].real(), preamble[0].real(), 1e-6);
+    EXPECT_NEAR(results[0].frame[0].imag(), preamble[0].imag(), 1e-6);
+}
+
+TEST_F(CorrelationFrameDetectorTest, NoDetectionWithoutPreamble) {
+    cvec payload = qpsk_payload(1000, 3);
+
+    std::vector<DetectionResult> results = fd.process(payload.data(), payload.size());
+
+    EXPECT_TRUE(results.empty());
+    // Only the tail that could hold the start of a preamble is kept
+    EXPECT_LE(fd.get_buffer().size(), PREAMBLE_LENGTH);
+}
+
+TEST_F(CorrelationFrameDetectorTest, MaxMode) {
+    CorrelationFrameDetector fd_max{preamble, FRAME_LENGTH, 0.8f,
+                                    CorrelationFrameDetector::Mode::Max};
+    cvec signal = make_signal(25);
+
+    std::vector<DetectionResult> results = fd_max.process(signal.data(), signal.size());
+
+    ASSERT_GE(results.size(), 1u);
+    EXPECT_EQ(results[0].idx, 25u);
+}
+
+TEST_F(CorrelationFrameDetectorTest, Reset) {
+    cvec signal = make_signal(20);
+
+    // Stop mid-frame, then reset
+    fd.process(signal.data(), 150);
+    fd.reset();
+
+    EXPECT_TRUE(fd.get_buffer().empty());
+    std::vector<DetectionResult> results = fd.process(signal.data() + 150, signal.size() - 150);
+    EXPECT_TRUE(results.empty());
+}
+
+TEST(DifferentialCorrelationFrameDetectorTest, DetectsFrameWithCFO) {
+    constexpr size_t FRAME_LENGTH = 200;
+    cvec preamble = zc_sequence(63);
+    DifferentialCorrelationFrameDetector fd{preamble, FRAME_LENGTH, 0.7f};
+    EXPECT_EQ(fd.get_preamble().size(), 62u);
+
+    cvec signal(30, cpx(0.0f, 0.0f));
+    signal.insert(signal.end(), preamble.begin(), preamble.end());
+    cvec payload = qpsk_payload(FRAME_LENGTH - 63);
+    signal.insert(signal.end(), payload.begin(), payload.end());
+    signal.insert(signal.end(), 50, cpx(0.0f, 0.0f));
+
+    // Small carrier frequency offset
+    for (size_t n = 0; n < signal.size(); ++n)
+        signal[n] *= std::polar(1.0f, 0.01f * float(n));
+
+    std::vector<DetectionResult> results = fd.process(signal.data(), signal.size());
+
+    ASSERT_EQ(results.size(), 1u);
+    // Difference 30 (signal[31] - signal[30]) is the first difference of the preamble
+    EXPECT_EQ(results[0].idx, 30u);
+    EXPECT_GT(results[0].metric, 0.7f);
+}
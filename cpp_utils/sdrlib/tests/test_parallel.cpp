@@ -0,0 +1,102 @@
+#include "sdrlib/carrier_recovery.hpp"
+#include "sdrlib/parallel.hpp"
+#include "sdrlib/types.hpp"
+#include <atomic>
+#include <cmath>
+#include <gtest/gtest.h>
+#include <stdexcept>
+#include <vector>
+
+using namespace sdrlib;
+using namespace parallel;
+
+class ThreadPoolTest : public ::testing::Test {
+  protected:
+    ThreadPool pool{4};
+};
+
+TEST_F(ThreadPoolTest, Size) {
+    EXPECT_EQ(pool.size(), 4u);
+    EXPECT_GE(ThreadPool().size(), 1u);
+}
+
+TEST_F(ThreadPoolTest, RunsEveryTaskOnce) {
+    constexpr size_t n = 1000;
+    std::vector<std::atomic<int>> counts(n);
+
+    pool.parallel_for(n, [&](size_t i) { counts[i]++; });
+
+    for (size_t i = 0; i < n; ++i)
+        EXPECT_EQ(counts[i].load(), 1) << "at index " << i;
+}
+
+TEST_F(ThreadPoolTest, RepeatedCalls) {
+    std::atomic<size_t> total{0};
+
+    for (size_t call = 0; call < 100; ++call)
+        pool.parallel_for(call % 7, [&](size_t i) { total += i + 1; });
+
+    // Sum over calls of 1 + 2 + ... + (call % 7)
+    size_t expected = 0;
+    for (size_t call = 0; call < 100; ++call)
+        expected += (call % 7) * (call % 7 + 1) / 2;
+    EXPECT_EQ(total.load(), expected);
+}
+
+TEST_F(ThreadPoolTest, SingleThread) {
+    ThreadPool serial{1};
+    std::vector<size_t> order;
+
+    serial.parallel_for(5, [&](size_t i) { order.push_back(i); });
+
+    EXPECT_EQ(order, (std::vector<size_t>{0, 1, 2, 3, 4}));
+}
+
+TEST_F(ThreadPoolTest, RethrowsTaskException) {
+    std::atomic<size_t> n_run{0};
+
+    EXPECT_THROW(pool.parallel_for(50,
+                                   [&](size_t i) {
+                                       n_run++;
+                                       if (i == 17)
+                                           throw std::runtime_error("task failed");
+                                   }),
+                 std::runtime_error);
+
+    // The other tasks still ran, and the pool is usable afterwards
+    EXPECT_EQ(n_run.load(), 50u);
+    std::atomic<size_t> n_after{0};
+    pool.parallel_for(10, [&](size_t) { n_after++; });
+    EXPECT_EQ(n_after.load(), 10u);
+}
+
+TEST_F(ThreadPoolTest, IndependentLoopsMatchSerial) {
+    constexpr size_t n_streams = 8;
+    constexpr size_t n = 512;
+
+    // One rotated QPSK stream per loop
+    std::vector<std::vector<cpx>> inputs(n_streams, std::vector<cpx>(n));
+    for (size_t s = 0; s < n_streams; ++s)
+        for (size_t i = 0; i < n; ++i)
+            inputs[s][i] = cpx((i % 3) ? 1.0f : -1.0f, (i % 5) ? 1.0f : -1.0f) *
+                           std::polar(1.0f, 0.01f * float(s + 1) * float(i));
+
+    std::vector<std::vector<cpx>> expected(n_streams, std::vector<cpx>(n));
+    for (size_t s = 0; s < n_streams; ++s) {
+        carrier_recovery::CostasLoopQPSK costas(1.0f / 20.0f);
+        costas.process(inputs[s].data(), expected[s].data(), n);
+    }
+
+    std::vector<carrier_recovery::CostasLoopQPSK> loops(
+        n_streams, carrier_recovery::CostasLoopQPSK(1.0f / 20.0f));
+    std::vector<std::vector<cpx>> outputs(n_streams, std::vector<cpx>(n));
+    pool.parallel_for(n_streams, [&](size_t s) {
+        loops[s].process(inputs[s].data(), outputs[s].data(), n);
+    });
+
+    for (size_t s = 0; s < n_streams; ++s) {
+        for (size_t i = 0; i < n; ++i) {
+            EXPECT_EQ(outputs[s][i], expected[s][i]) << "stream " << s << " at index " << i;
+        }
+    }
+}
@@ -0,0 +1,149 @@
+#include "sdrlib/timing_recovery.hpp"
+#include "sdrlib/types.hpp"
+#include <algorithm>
+#include <cmath>
+#include <gtest/gtest.h>
+#include <vector>
+
+using namespace sdrlib;
+using namespace timing_recovery;
+
+// Raised cosine pulse (beta = 0.5) at time t in symbols
+float raised_cosine(float t, float beta = 0.5f) {
+    float den = 1.0f - (2.0f * beta * t) * (2.0f * beta * t);
+    if (std::abs(den) < 1e-6f)
+        return float(M_PI) / 4.0f * std::sin(float(M_PI) / (2.0f * beta)) /
+               (float(M_PI) / (2.0f * beta));
+    float sinc = (t == 0.0f) ? 1.0f : std::sin(float(M_PI) * t) / (float(M_PI) * t);
+    return sinc * std::cos(float(M_PI) * beta * t) / den;
+}
+
+// Pseudo-random QPSK symbols (+-1 +-1j)
+std::vector<cpx> qpsk_symbols(size_t n) {
+    std::vector<cpx> symbols(n);
+    unsigned long state = 1;
+    for (size_t k = 0; k < n; ++k) {
+        state = (state * 1103515245 + 12345) % (1ul << 31);
+        int bits = (state >> 16) & 0b11;
+        symbols[k] = cpx(1.0f - 2.0f * (bits >> 1), 1.0f - 2.0f * (bits & 1));
+    }
+    return symbols;
+}
+
+// Pulse-shaped symbols at 2 samples/symbol, delayed by tau symbols
+std::vector<cpx> shaped_signal(const std::vector<cpx> &symbols, float tau) {
+    std::vector<cpx> signal(2 * symbols.size());
+    for (size_t m = 0; m < signal.size(); ++m) {
+        cpx acc(0.0f, 0.0f);
+        for (size_t k = 0; k < symbols.size(); ++k)
+            acc += symbols[k] * raised_cosine(m / 2.0f - float(k) - tau);
+        signal[m] = acc;
+    }
+    return signal;
+}
+
+class GardnerSymbolTimingCorrectorTest : public ::testing::Test {
+  protected:
+    GardnerSymbolTimingCorrector stc;
+
+    void SetUp() override { stc.reset(); }
+};
+
+TEST_F(GardnerSymbolTimingCorrectorTest, InitialState) {
+    EXPECT_FLOAT_EQ(stc.get_mu(), 0.5f);
+
+    for (const auto &e : stc.get_error_history()) {
+        EXPECT_FLOAT_EQ(e, 0.0f);
+    }
+}
+
+TEST_F(GardnerSymbolTimingCorrectorTest, CubicFarrowWeights) {
+    // d=0 selects the second oldest sample, d=1 the second newest
+    auto h0 = cubic_farrow_weights(0.0f);
+    auto h1 = cubic_farrow_weights(1.0f);
+    EXPECT_NEAR(h0[1], 1.0f, 1e-6);
+    EXPECT_NEAR(h1[2], 1.0f, 1e-6);
+
+    // Weights sum to one for any position
+    auto h = cubic_farrow_weights(0.37f);
+    EXPECT_NEAR(h[0] + h[1] + h[2] + h[3], 1.0f, 1e-6);
+}
+
+TEST_F(GardnerSymbolTimingCorrectorTest, OneSymbolPerSamplePair) {
+    std::vector<cpx> input(64, cpx(1.0f, 1.0f));
+    std::vector<cpx> output(stc.max_output(input.size()));
+
+    size_t n_out = stc.process(input.data(), output.data(), input.size());
+
+    EXPECT_EQ(n_out, 32u);
+}
+
+TEST_F(GardnerSymbolTimingCorrectorTest, OddChunksCarrySample) {
+    std::vector<cpx> input(8, cpx(1.0f, -1.0f));
+    std::vector<cpx> output(8);
+
+    // 5 samples: 2 symbols and one sample carried
+    EXPECT_EQ(stc.max_output(5), 2u);
+    EXPECT_EQ(stc.process(input.data(), output.data(), 5), 2u);
+
+    // Carried sample + 3 samples: 2 symbols
+    EXPECT_EQ(stc.max_output(3), 2u);
+    EXPECT_EQ(stc.process(input.data(), output.data(), 3), 2u);
+}
+
+TEST_F(GardnerSymbolTimingCorrectorTest, ChunkedMatchesSingleCall) {
+    std::vector<cpx> signal = shaped_signal(qpsk_symbols(100), 0.3f);
+
+    std::vector<cpx> expected(signal.size() / 2);
+    size_t n_expected = stc.process(signal.data(), expected.data(), signal.size());
+
+    stc.reset();
+    std::vector<cpx> output(signal.size() / 2);
+    size_t n_out = 0;
+    for (size_t start = 0; start < signal.size(); start += 7) {
+        size_t n = std::min<size_t>(7, signal.size() - start);
+        n_out += stc.process(signal.data() + start, output.data() + n_out, n);
+    }
+
+    ASSERT_EQ(n_out, n_expected);
+    for (size_t i = 0; i < n_out; ++i) {
+        EXPECT_NEAR(output[i].real(), expected[i].real(), 1e-6) << "at index " << i;
+        EXPECT_NEAR(output[i].imag(), expected[i].imag(), 1e-6) << "at index " << i;
+    }
+}
+
+TEST_F(GardnerSymbolTimingCorrectorTest, RecoversFractionalDelay) {
+    constexpr size_t num_symbols = 400;
+    std::vector<cpx> symbols = qpsk_symbols(num_symbols);
+
+    for (float tau : {0.25f, 0.75f}) {
+        stc.reset();
+        std::vector<cpx> signal = shaped_signal(symbols, tau);
+        std::vector<cpx> output(num_symbols);
+        stc.process(signal.data(), output.data(), signal.size());
+
+        // After convergence, symbols sit close to the constellation points
+        // (the end of the signal is skipped since the pulses are truncated there)
+        float mean_error = 0.0f;
+        for (size_t i = 200; i < 380; ++i) {
+            cpx decision(std::copysign(1.0f, output[i].real()),
+                         std::copysign(1.0f, output[i].imag()));
+            mean_error += std::abs(output[i] - decision) / 180.0f;
+        }
+        EXPECT_LT(mean_error, 0.2f) << "tau = " << tau;
+    }
+}
+
+TEST_F(GardnerSymbolTimingCorrectorTest, Reset) {
+    std::vector<cpx> signal = shaped_signal(qpsk_symbols(50), 0.3f);
+    std::vector<cpx> output(signal.size() / 2);
+    stc.process(signal.data(), output.data(), signal.size() - 1);
+
+    stc.reset();
+
+    EXPECT_FLOAT_EQ(stc.get_mu(), 0.5f);
+    EXPECT_EQ(stc.max_output(1), 0u); // No carried sample
+    for (const auto &e : stc.get_error_history()) {
+        EXPECT_FLOAT_EQ(e, 0.0f);
+    }
+}
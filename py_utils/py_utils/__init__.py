@@ -1,18 +1,10 @@
+from importlib import import_module as _import_module
 
-from .carrier_recovery import *
-from .channel import *
-from .coding import *
-from .control import *
-from .dsp import *
-from .equalization import *
-from .framing import *
-from .interpolators import *
-from .metrics import *
-from .modulation import *
-from .timing_recovery import *
-from .visualization import *
-
+# Submodules are imported on first attribute access (PEP 562) rather than up front, so that e.g. a worker using
+# only py_utils.modulation does not pay for matplotlib (visualization) or scipy.signal (framing).
 __all__ = [
+    "backend",
+    "capture",
     "carrier_recovery",
     "channel",
     "coding",
@@ -21,9 +13,37 @@ __all__ = [
     "equalization",
     "framing",
     "interpolators",
+    "jit_cache",
     "metrics",
     "modulation",
+    "pipeline",
+    "profiling",
+    "sweep",
     "timing_recovery",
     "visualization",
 ]
 
+# Order in which submodules are searched for a top-level name such as py_utils.rrc_filter (the names every
+# submodule used to star-import), cheapest imports first
+_SEARCH_ORDER = (
+    "backend", "control", "interpolators", "modulation", "coding", "metrics", "channel", "timing_recovery", "dsp",
+    "profiling", "capture", "jit_cache", "framing", "carrier_recovery", "equalization", "pipeline", "sweep",
+    "visualization",
+)
+
+
+def __getattr__(name):
+    if name in __all__:
+        return _import_module(f".{name}", __name__)
+    if not name.startswith('_'):
+        for module_name in _SEARCH_ORDER:
+            module = _import_module(f".{module_name}", __name__)
+            if hasattr(module, name):
+                value = getattr(module, name)
+                globals()[name] = value
+                return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,277 @@
+"""
+Backend selection between the pure Python/numba implementations in py_utils and the sdrlib C++ bindings
+(py_sdrlib, see cpp_utils/).
+
+Functions and blocks with an sdrlib port take a backend argument ('auto', 'python' or 'sdrlib'); None uses the
+global backend, which defaults to 'auto' (sdrlib if py_sdrlib is importable, else Python). 'auto' only picks ports
+that are observably the same as the Python version; ports with a different output dtype or precision (apply_cfo
+and modulate_qpsk return complex64) are only used when 'sdrlib' is requested explicitly. Run this module to
+check that both backends agree:
+
+    python -m py_utils.backend
+"""
+
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import py_sdrlib
+except ImportError:
+    py_sdrlib = None
+
+
+BACKENDS = ('auto', 'python', 'sdrlib')
+
+_backend = 'auto'
+
+
+def sdrlib_available():
+    return py_sdrlib is not None
+
+
+def set_backend(name):
+    """Set the global backend used when functions are called with backend=None"""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'. Use one of {BACKENDS}")
+    if name == 'sdrlib' and py_sdrlib is None:
+        raise ImportError("sdrlib backend requested but py_sdrlib is not installed (see cpp_utils/README.md)")
+    _backend = name
+
+
+def get_backend():
+    return _backend
+
+
+@contextmanager
+def use_backend(name):
+    """Temporarily set the global backend"""
+    previous = _backend
+    set_backend(name)
+    try:
+        yield
+    finally:
+        set_backend(previous)
+
+
+def resolve_backend(backend=None):
+    """Concrete backend ('python' or 'sdrlib') for a per-call backend argument"""
+    backend = _backend if backend is None else backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Use one of {BACKENDS}")
+    if backend == 'auto':
+        return 'sdrlib' if py_sdrlib is not None else 'python'
+    if backend == 'sdrlib' and py_sdrlib is None:
+        raise ImportError("sdrlib backend requested but py_sdrlib is not installed (see cpp_utils/README.md)")
+    return backend
+
+
+### sdrlib implementations ###
+# Registered by operation name, with the same call signature and output conventions as the py_utils version
+
+_SDRLIB = {}
+# Ports whose results differ observably from py_utils (e.g. dtype), used only when sdrlib is requested explicitly
+_EXPLICIT_ONLY = set()
+
+
+def register(op, auto=True):
+    def decorator(fn):
+        _SDRLIB[op] = fn
+        if not auto:
+            _EXPLICIT_ONLY.add(op)
+        return fn
+    return decorator
+
+
+def native(op, backend=None):
+    """sdrlib implementation of op if backend resolves to sdrlib and op is ported, else None"""
+    if op not in _SDRLIB or resolve_backend(backend) != 'sdrlib':
+        return None
+    if op in _EXPLICIT_ONLY and (_backend if backend is None else backend) == 'auto':
+        return None
+    return _SDRLIB[op]
+
+
+def _cpx(signal):
+    """sdrlib buffers are C-contiguous complex64"""
+    return np.ascontiguousarray(signal, dtype=np.complex64)
+
+
+@register('apply_cfo', auto=False)
+def _apply_cfo(signal, w_offset):
+    signal = _cpx(signal)
+    out = np.empty_like(signal)
+    py_sdrlib.channel.apply_cfo(signal, out, w_offset)
+    return out
+
+
+@register('modulate_qpsk', auto=False)
+def _modulate_qpsk(bits):
+    bits = np.asarray(bits).ravel()
+    if len(bits) % 2 != 0:
+        raise ValueError("Input bit array length must be even.")
+    pairs = np.ascontiguousarray(2*bits[::2] + bits[1::2], dtype=np.intc)
+    out = np.empty(len(pairs), dtype=np.complex64)
+    py_sdrlib.modulation.modulate_qpsk(pairs, out)
+    # sdrlib maps to +-1 +-1j; py_utils symbols have unit energy
+    out *= np.float32(1/np.sqrt(2))
+    return out
+
+
+@register('demodulate_qpsk')
+def _demodulate_qpsk(symbols):
+    symbols = _cpx(symbols)
+    pairs = np.empty(len(symbols), dtype=np.intc)
+    py_sdrlib.modulation.demodulate_qpsk(symbols, pairs)
+    bits = np.empty((len(symbols), 2), dtype=np.uint8)
+    bits[:, 0] = pairs >> 1
+    bits[:, 1] = pairs & 1
+    return bits.ravel()
+
+
+@register('CostasLoopQPSK')
+def _costas_loop_qpsk(loop_bw):
+    return py_sdrlib.carrier_recovery.CostasLoopQPSK(loop_bw)
+
+
+@register('PIDFeedback')
+def _pid_feedback(K_p=0.0, K_i=0.0, K_d=0.0):
+    return py_sdrlib.control.PIDFeedback(K_p, K_i, K_d)
+
+
+@register('farrow_interpolate')
+def _farrow_interpolate(samples, mu, integer_offset=0):
+    samples = _cpx(samples)
+    out = np.empty_like(samples)
+    py_sdrlib.interpolation.CubicFarrowInterpolator().process(samples, out, mu, integer_offset)
+    return out
+
+
+@register('GardnerSymbolTimingCorrector')
+def _gardner(K_p=0.1, K_i=0.0, K_d=0.0):
+    # Symbols are returned by process(chunk); odd samples are carried between calls
+    return py_sdrlib.timing_recovery.GardnerSymbolTimingCorrector(K_p, K_i, K_d)
+
+
+@register('CorrelationFrameDetector')
+def _correlation_frame_detector(preamble, expected_frame_length, detection_threshold=0.8, mode='first'):
+    return py_sdrlib.framing.CorrelationFrameDetector(_cpx(preamble), expected_frame_length, detection_threshold,
+                                                      mode)
+
+
+### Equivalence harness ###
+
+def _equivalence_cases(n, rng):
+    # Imported here: py_utils modules import this module for dispatch
+    from .carrier_recovery import CostasLoopQPSK
+    from .channel import apply_awgn, apply_cfo, apply_sto
+    from .control import PIDFeedback
+    from .dsp import rrc
+    from .framing import CorrelationFrameDetector, zadoff_chu
+    from .interpolators import CubicFarrowInterpolator
+    from .modulation import demodulate_qpsk, modulate_qpsk
+    from .timing_recovery import GardnerSymbolTimingCorrector
+
+    bits = rng.integers(0, 2, 2*n)
+    symbols = modulate_qpsk(bits, backend='python')
+    received = apply_awgn(apply_cfo(symbols, w_offset=0.01, backend='python'), 15, rng=rng).astype(np.complex64)
+
+    def costas(backend):
+        loop = CostasLoopQPSK(1/20, backend=backend)
+        out = np.empty(n, dtype=np.complex64)
+        loop.process(received, out)
+        return out
+
+    def costas_errors(backend):
+        # Split over calls, each (for the default n) longer than sdrlib's 1024-entry error ring: error_history must
+        # still hold one error per symbol of the last call, in time order
+        loop = CostasLoopQPSK(1/20, backend=backend)
+        split = n // 3
+        loop.process(received[:split], np.empty(split, dtype=np.complex64))
+        loop.process(received[split:], np.empty(n - split, dtype=np.complex64))
+        return loop.error_history
+
+    def pid(backend):
+        controller = PIDFeedback(0.1, 0.01, 0.001) if backend == 'python' else _pid_feedback(0.1, 0.01, 0.001)
+        return np.array([controller.process(e) for e in received.real[:256]])
+
+    def farrow(backend):
+        if backend == 'python':
+            return CubicFarrowInterpolator().process_batch(received[:1024], 0.3, 0)
+        return _farrow_interpolate(received[:1024], 0.3, 0)
+
+    # Matched-filtered 2 samples/symbol signal with a fractional timing offset
+    shaped = np.convolve(np.repeat(symbols, 2), rrc(21, 0.35, 2), mode='same')
+    shaped = apply_awgn(apply_sto(shaped, 0.3), 20, rng=rng).astype(np.complex64)
+
+    def gardner(backend):
+        if backend == 'python':
+            return GardnerSymbolTimingCorrector().process(shaped)
+        # Odd chunks exercise the sample carried between calls
+        stc = _gardner()
+        return np.concatenate([stc.process(shaped[:1001]), stc.process(shaped[1001:])])
+
+    preamble = zadoff_chu(63).astype(np.complex64)
+    frame_len = 256
+    frames = np.concatenate([np.concatenate((np.zeros(37 + k, np.complex64), preamble, symbols[:frame_len - 63]))
+                             for k in range(4)])
+    frames = apply_awgn(frames, 10, rng=rng).astype(np.complex64)
+
+    def frame_sync(backend):
+        fd = (CorrelationFrameDetector(preamble, frame_len) if backend == 'python'
+              else _correlation_frame_detector(preamble, frame_len))
+        results = [res for start in range(0, len(frames), 300) for res in fd.process(frames[start:start + 300])]
+        return np.concatenate([res.frame for res in results]) if results else np.empty(0, np.complex64)
+
+    # name -> (function of backend, absolute tolerance)
+    return {
+        'apply_cfo': (lambda b: apply_cfo(symbols, w_offset=0.01, backend=b), 1e-3),
+        'modulate_qpsk': (lambda b: modulate_qpsk(bits, backend=b), 1e-6),
+        'demodulate_qpsk': (lambda b: demodulate_qpsk(received, backend=b), 0),
+        'CostasLoopQPSK': (costas, 1e-3),
+        'CostasLoopQPSK.error_history': (costas_errors, 1e-3),
+        'PIDFeedback': (pid, 1e-4),
+        'farrow_interpolate': (farrow, 1e-5),
+        'GardnerSymbolTimingCorrector': (gardner, 1e-4),
+        'CorrelationFrameDetector': (frame_sync, 1e-6),
+    }
+
+
+def check_equivalence(ops=None, n=4096, seed=0):
+    """
+    Run every ported operation (or those in ops) on the same inputs with both backends.
+    Returns a list of (op, max_abs_error, tolerance, passed). Requires py_sdrlib.
+    """
+    if py_sdrlib is None:
+        raise ImportError("py_sdrlib is not installed; nothing to compare against (see cpp_utils/README.md)")
+
+    cases = _equivalence_cases(n, np.random.default_rng(seed))
+    results = []
+    for op, (run, tol) in cases.items():
+        if ops and op not in ops:
+            continue
+        ref = np.asarray(run('python'))
+        out = np.asarray(run('sdrlib'))
+        if ref.shape != out.shape:
+            results.append((op, np.inf, tol, False))
+            continue
+        err = float(np.max(np.abs(ref.astype(np.complex128) - out))) if ref.size else 0.0
+        results.append((op, err, tol, err <= tol))
+    return results
+
+
+def main():
+    if py_sdrlib is None:
+        print("py_sdrlib is not installed; only the python backend is available")
+        return 0
+    failed = 0
+    for op, err, tol, passed in check_equivalence():
+        print(f"{op:<30} max |python - sdrlib| = {err:.3e}  (tol {tol:g})  {'ok' if passed else 'MISMATCH'}")
+        failed += not passed
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Throughput benchmarks for the py_utils DSP blocks and their sdrlib (C++) counterparts.
+
+Run as a script to print a table and optionally write/compare JSON results:
+
+    python -m py_utils.benchmark --out results.json
+    python -m py_utils.benchmark --baseline results.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+from . import carrier_recovery, channel, coding, dsp, framing, interpolators, modulation, timing_recovery
+
+try:
+    import py_sdrlib
+except ImportError:
+    py_sdrlib = None
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    backend: str
+    n_samples: int
+    chunk_size: int
+    seconds: float
+    samples_per_sec: float
+    peak_mem_bytes: int
+
+
+### Benchmark definitions ###
+# Each setup(signal) returns a callable that processes one chunk; state is kept between chunks.
+
+def _qpsk_signal(n, rng):
+    symbols = modulation.modulate(rng.integers(0, 256, (n + 3) // 4, dtype=np.uint8), 'qpsk')[:n]
+    return channel.apply_awgn(symbols, 20, rng=rng).astype(np.complex64)
+
+
+def _rrc(signal):
+    return lambda chunk: dsp.rrc_filter(chunk, 21, Ts=2)
+
+
+def _gardner(signal):
+    stc = timing_recovery.GardnerSymbolTimingCorrector()
+    return stc.process
+
+
+def _costas(signal):
+    costas = carrier_recovery.CostasLoopQPSK(1/20, backend='python')
+    return lambda chunk: costas.process(chunk, np.empty_like(chunk))
+
+
+def _costas_njit(signal):
+    from .control import PIDFeedback
+    controller = PIDFeedback(0.04, 0.03)
+    return lambda chunk: carrier_recovery.costas_loop(chunk, controller)
+
+
+def _costas_sdrlib(signal):
+    costas = py_sdrlib.carrier_recovery.CostasLoopQPSK(1/20)
+    return lambda chunk: costas.process(chunk, np.empty_like(chunk))
+
+
+def _frame_detector(signal):
+    preamble = framing.zadoff_chu(63).astype(np.complex64)
+    fd = framing.CorrelationFrameDetector(preamble, 1024, detection_threshold=0.8)
+    return fd.process
+
+
+def _apply_cfo(signal):
+    return lambda chunk: channel.apply_cfo(chunk, 0.01, backend='python')
+
+
+def _apply_cfo_sdrlib(signal):
+    return lambda chunk: py_sdrlib.channel.apply_cfo(chunk, np.empty_like(chunk), 0.01*2*np.pi)
+
+
+def _farrow(signal):
+    farrow = interpolators.CubicFarrowInterpolator()
+    return lambda chunk: farrow.process_batch(chunk, 0.3, 0)
+
+
+def _farrow_sdrlib(signal):
+    farrow = py_sdrlib.interpolation.CubicFarrowInterpolator()
+    return lambda chunk: farrow.process(chunk, np.empty_like(chunk), 0.3, 0)
+
+
+def _farrow_resampler(signal):
+    return interpolators.FarrowResampler(1.0001).process
+
+
+def _channel_simulator(signal):
+    return channel.ChannelSimulator(snr_db=20, pct_offset=0.01, mu=0.3, signal_power=1.0, seed=0).process
+
+
+def _demodulate_qpsk(signal):
+    return lambda chunk: modulation.demodulate_qpsk(chunk, backend='python')
+
+
+def _demodulate_lut(signal):
+    return lambda chunk: modulation.demodulate(chunk, 'qpsk')
+
+
+def _demodulate_sdrlib(signal):
+    return lambda chunk: py_sdrlib.modulation.demodulate_qpsk(chunk, np.empty(len(chunk), dtype=np.intc))
+
+
+def _llr_64qam(signal):
+    return lambda chunk: modulation.demodulate_soft(chunk, '64qam', noise_var=0.01)
+
+
+def _viterbi(signal):
+    decoder = coding.ViterbiDecoder()
+    # Treat each sample as a pair of soft coded bits
+    return lambda chunk: decoder.process(chunk.view(np.float32))
+
+
+# name -> list of (backend, setup)
+BENCHMARKS = {
+    'rrc_filter': [('python', _rrc)],
+    'GardnerSymbolTimingCorrector': [('numba', _gardner)],
+    'CostasLoopQPSK': [('numba', _costas), ('sdrlib', _costas_sdrlib)],
+    'costas_loop': [('numba', _costas_njit)],
+    'CorrelationFrameDetector': [('python', _frame_detector)],
+    'apply_cfo': [('python', _apply_cfo), ('sdrlib', _apply_cfo_sdrlib)],
+    'CubicFarrowInterpolator': [('python', _farrow), ('sdrlib', _farrow_sdrlib)],
+    'FarrowResampler': [('numba', _farrow_resampler)],
+    'ChannelSimulator': [('numba', _channel_simulator)],
+    'demodulate_qpsk': [('python', _demodulate_qpsk), ('numba', _demodulate_lut), ('sdrlib', _demodulate_sdrlib)],
+    'llr_64qam': [('numba', _llr_64qam)],
+    'ViterbiDecoder': [('numba', _viterbi)],
+}
+
+# Pure-Python per-sample blocks are capped at this many samples to keep the suite fast
+SLOW_BLOCKS = {('CubicFarrowInterpolator', 'python')}
+SLOW_MAX_SAMPLES = 10**5
+
+
+### Running ###
+
+def _run_chunks(run, signal, chunk_size):
+    for start in range(0, len(signal), chunk_size):
+        run(signal[start:start + chunk_size])
+
+
+def run_benchmark(name, backend, setup, n_samples, chunk_size=None, repeat=3, seed=0):
+    """Time one block on n_samples samples fed in chunks of chunk_size (None: one chunk). Best of repeat."""
+    rng = np.random.default_rng(seed)
+    signal = _qpsk_signal(n_samples, rng)
+    chunk_size = chunk_size or n_samples
+
+    # Warm up (JIT compilation, table construction) on a small input
+    _run_chunks(setup(signal), signal[:min(1024, n_samples)], chunk_size)
+
+    best = np.inf
+    for _ in range(repeat):
+        run = setup(signal)
+        start = time.perf_counter()
+        _run_chunks(run, signal, chunk_size)
+        best = min(best, time.perf_counter() - start)
+
+    # Peak memory allocated by the block itself, in a separate untimed run
+    run = setup(signal)
+    tracemalloc.start()
+    _run_chunks(run, signal, chunk_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return BenchmarkResult(name, backend, n_samples, chunk_size, best, n_samples / best, peak)
+
+
+def run_suite(sizes=(10**4, 10**5), chunk_sizes=(1024, 16384, None), names=None, repeat=3, verbose=True):
+    """Run every available benchmark (optionally only those in names) over all sizes and chunk sizes"""
+    results = []
+    for name, variants in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for backend, setup in variants:
+            if backend == 'sdrlib' and py_sdrlib is None:
+                continue
+            for n in sizes:
+                if (name, backend) in SLOW_BLOCKS and n > SLOW_MAX_SAMPLES:
+                    continue
+                for chunk in chunk_sizes:
+                    if chunk is not None and chunk >= n:
+                        continue
+                    res = run_benchmark(name, backend, setup, n, chunk, repeat)
+                    results.append(res)
+                    if verbose:
+                        print(_format(res))
+    return results
+
+
+def _format(res):
+    return f"{res.name:<30} {res.backend:<8} n={res.n_samples:<9} chunk={res.chunk_size:<9} " \
+           f"{res.samples_per_sec/1e6:10.3f} MS/s  peak {res.peak_mem_bytes/2**20:8.2f} MiB"
+
+
+def _key(res):
+    return res['name'], res['backend'], res['n_samples'], res['chunk_size']
+
+
+def save_results(results, path):
+    meta = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'sdrlib': py_sdrlib is not None,
+    }
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': [asdict(r) for r in results]}, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Compare results against baseline results (as loaded by load_results()).
+    Returns (name, backend, n_samples, chunk_size, ratio) for every case slower than baseline by more than tolerance.
+    """
+    base = {_key(r): r for r in baseline}
+    regressions = []
+    for res in results:
+        res = asdict(res) if isinstance(res, BenchmarkResult) else res
+        ref = base.get(_key(res))
+        if ref is None:
+            continue
+        ratio = res['samples_per_sec'] / ref['samples_per_sec']
+        if ratio < 1 - tolerance:
+            regressions.append((*_key(res), ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark py_utils and sdrlib DSP blocks.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5])
+    parser.add_argument('--chunks', type=int, nargs='+', default=[1024, 16384, 0],
+                        help="Chunk sizes; 0 processes the whole input at once")
+    parser.add_argument('--blocks', nargs='+', default=None, help=f"Subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against results in this JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown vs. baseline")
+    args = parser.parse_args(argv)
+
+    chunks = [c or None for c in args.chunks]
+    results = run_suite(args.sizes, chunks, args.blocks, args.repeat)
+
+    if args.out:
+        save_results(results, args.out)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        for name, backend, n, chunk, ratio in regressions:
+            print(f"REGRESSION {name} [{backend}] n={n} chunk={chunk}: {ratio:.2f}x baseline")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+import json
+import os
+import numpy as np
+
+
+### IQ capture files ###
+
+# SigMF datatype -> (component dtype, full-scale value used to map integers to [-1, 1))
+IQ_FORMATS = {
+    'cf32_le': (np.dtype('<f4'), 1.0),
+    'ci16_le': (np.dtype('<i2'), 32768.0),
+    'ci8': (np.dtype('i1'), 128.0),
+}
+
+_FORMAT_ALIASES = {
+    'cf32': 'cf32_le', 'complex64': 'cf32_le', 'fc32': 'cf32_le',
+    'ci16': 'ci16_le', 'sc16': 'ci16_le',
+    'sc8': 'ci8', 'ci8_le': 'ci8',
+}
+
+SIGMF_VERSION = '1.0.0'
+
+
+def _datatype(fmt):
+    fmt = _FORMAT_ALIASES.get(fmt, fmt)
+    if fmt not in IQ_FORMATS:
+        raise ValueError(f"Unsupported IQ format '{fmt}'. Use one of {list(IQ_FORMATS)} or {list(_FORMAT_ALIASES)}")
+    return fmt
+
+
+def _paths(path):
+    """(data, meta) paths: a SigMF pair for .sigmf-data/.sigmf-meta paths, else a raw file with a .sigmf-meta sidecar"""
+    base, ext = os.path.splitext(str(path))
+    if ext in ('.sigmf-data', '.sigmf-meta'):
+        return base + '.sigmf-data', base + '.sigmf-meta'
+    return str(path), base + '.sigmf-meta'
+
+
+def iq_to_complex(raw, fmt, out=None):
+    """Convert interleaved IQ components (shape (N, 2) or (2N,)) to complex64 scaled to [-1, 1)"""
+    dtype, full_scale = IQ_FORMATS[_datatype(fmt)]
+    raw = np.asarray(raw).reshape(-1, 2)
+    if out is None:
+        out = np.empty(len(raw), dtype=np.complex64)
+    out.real = raw[:, 0]
+    out.imag = raw[:, 1]
+    if full_scale != 1.0:
+        out *= np.float32(1 / full_scale)
+    return out
+
+
+def complex_to_iq(signal, fmt):
+    """Convert complex samples to interleaved IQ components of format fmt, saturating integer formats"""
+    dtype, full_scale = IQ_FORMATS[_datatype(fmt)]
+    signal = np.asarray(signal)
+    raw = np.empty((len(signal), 2), dtype=dtype)
+    if dtype.kind == 'f':
+        raw[:, 0] = signal.real
+        raw[:, 1] = signal.imag
+    else:
+        info = np.iinfo(dtype)
+        for k, part in enumerate((signal.real, signal.imag)):
+            raw[:, k] = np.clip(np.rint(part * full_scale), info.min, info.max)
+    return raw.reshape(-1)
+
+
+class IQReader:
+    """
+    Memory-mapped reader for raw interleaved IQ captures (cf32, ci16, ci8) with an optional SigMF metadata file.
+
+    The data is never loaded as a whole: indexing and chunks() return views into the memory map, so recordings
+    larger than memory can be streamed into a Pipeline or receiver blocks at storage bandwidth. cf32 data is viewed
+    directly as complex64; integer data is returned as raw (N, 2) component views, or converted per chunk to
+    complex64 with as_complex=True.
+
+        with IQReader('capture.sigmf-data') as rec:
+            for chunk in rec.chunks(65536, overlap=20, as_complex=True):
+                ...
+    """
+    def __init__(self, path, fmt=None, sample_rate=None):
+        self.data_path, self.meta_path = _paths(path)
+
+        self.metadata = {}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.metadata = json.load(f)
+        glob = self.metadata.get('global', {})
+        captures = self.metadata.get('captures', [{}])
+
+        fmt = fmt or glob.get('core:datatype')
+        if fmt is None:
+            raise ValueError(f"No IQ format given and no metadata found at {self.meta_path}")
+        self.datatype = _datatype(fmt)
+        self.sample_rate = sample_rate if sample_rate is not None else glob.get('core:sample_rate')
+        self.center_freq = captures[0].get('core:frequency') if captures else None
+
+        dtype, self.full_scale = IQ_FORMATS[self.datatype]
+        # np.memmap cannot map an empty file, e.g. a capture IQWriter has only just created
+        if os.path.getsize(self.data_path) == 0:
+            raw = np.empty(0, dtype=dtype)
+        else:
+            raw = np.memmap(self.data_path, dtype=dtype, mode='r')
+        self._raw = raw[:len(raw) - len(raw) % 2].reshape(-1, 2)
+        self._samples = self._raw.reshape(-1).view(np.complex64) if self.datatype == 'cf32_le' else None
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the memory map (views handed out keep it alive until they are dropped)"""
+        self._raw = np.empty((0, 2), dtype=self._raw.dtype)
+        self._samples = None
+
+    @property
+    def duration(self):
+        return len(self) / self.sample_rate if self.sample_rate else None
+
+    @property
+    def raw(self):
+        """Interleaved components as an (N, 2) memory-mapped view"""
+        return self._raw
+
+    def read(self, start=0, n=None, as_complex=True):
+        """Samples [start, start + n). A view for cf32 (or as_complex=False), a complex64 copy for integer formats"""
+        stop = len(self) if n is None else min(start + n, len(self))
+        if self._samples is not None and as_complex:
+            return self._samples[start:stop]
+        raw = self._raw[start:stop]
+        return iq_to_complex(raw, self.datatype) if as_complex else raw
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError("IQReader supports contiguous slices only")
+        start, stop, _ = index.indices(len(self))
+        return self.read(start, max(stop - start, 0))
+
+    def chunks(self, chunk_size, overlap=0, start=0, stop=None, as_complex=True):
+        """
+        Yield consecutive chunks of chunk_size samples from [start, stop), each beginning overlap samples before the
+        end of the previous one (e.g. n_taps - 1 for block filtering). The last chunk may be shorter.
+        """
+        if not 0 <= overlap < chunk_size:
+            raise ValueError("overlap must be in [0, chunk_size)")
+        stop = len(self) if stop is None else min(stop, len(self))
+        step = chunk_size - overlap
+        pos = start
+        while pos < stop:
+            yield self.read(pos, min(chunk_size, stop - pos), as_complex)
+            if pos + chunk_size >= stop:
+                break
+            pos += step
+
+    def __iter__(self):
+        return self.chunks(65536)
+
+
+class IQWriter:
+    """
+    Streaming writer for raw interleaved IQ captures with a SigMF metadata file, written on close().
+    Complex chunks are converted to fmt as they are written (integer formats saturate at full scale).
+    Instances are callable, so they can be passed as the sink of Pipeline.run().
+    """
+    def __init__(self, path, fmt='cf32', sample_rate=None, center_freq=None, description=None, metadata=True):
+        self.data_path, self.meta_path = _paths(path)
+        self.datatype = _datatype(fmt)
+        self.sample_rate = sample_rate
+        self.center_freq = center_freq
+        self.description = description
+        self.write_metadata = metadata
+        self.n_samples = 0
+        self._file = open(self.data_path, 'wb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, chunk):
+        """Append complex samples (or raw interleaved components already in the file format)"""
+        chunk = np.asarray(chunk)
+        if np.iscomplexobj(chunk):
+            raw = complex_to_iq(chunk, self.datatype)
+        else:
+            raw = np.ascontiguousarray(chunk, dtype=IQ_FORMATS[self.datatype][0]).reshape(-1)
+        self._file.write(raw.data)
+        self.n_samples += len(raw) // 2
+
+    __call__ = write
+
+    def metadata(self):
+        glob = {'core:datatype': self.datatype, 'core:version': SIGMF_VERSION}
+        if self.sample_rate is not None:
+            glob['core:sample_rate'] = self.sample_rate
+        if self.description is not None:
+            glob['core:description'] = self.description
+        capture = {'core:sample_start': 0}
+        if self.center_freq is not None:
+            capture['core:frequency'] = self.center_freq
+        return {'global': glob, 'captures': [capture], 'annotations': []}
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        if self.write_metadata:
+            with open(self.meta_path, 'w') as f:
+                json.dump(self.metadata(), f, indent=2)
@@ -4,7 +4,8 @@ from numba import njit
 from numba.experimental import jitclass
 import numpy as np
 from .framing import DifferentialCorrelationFrameDetector
-from .control import PIDFeedback
+from .control import PIDFeedback, pid_update
+from .backend import native
 from abc import ABC
 import math
 
@@ -31,36 +32,45 @@ class PhaseLockDetector:
                 self.is_locked = True
         return self.is_locked
 
-# njit sped up function from ~6s to ~0.6s
-@njit
-def costas_loop(symbols, controller, error_history=None, theta=None):
-    if theta is None: theta = 0.0
-    sym_rot = np.empty(len(symbols), dtype=np.complex64)
-
-    for i, s in enumerate(symbols):
+# njit sped up function from ~6s to ~0.6s. nogil lets it run alongside other stages in threads
+@njit(nogil=True, cache=True)
+def _costas_kernel(symbols_in, symbols_out, pid_state, error_history, theta):
+    """Costas loop over symbols_in, writing derotated symbols to symbols_out. Returns the final VCO phase."""
+    for i in range(len(symbols_in)):
         # Rotate signal by current VCO phase
-        sym_rot[i] = s * np.exp(-1j*theta)
+        symbols_out[i] = symbols_in[i] * np.exp(-1j*theta)
 
         # Decision directed error signal
-        I = sym_rot[i].real
-        Q = sym_rot[i].imag
+        I = symbols_out[i].real
+        Q = symbols_out[i].imag
         ref = np.sign(I) + 1j*np.sign(Q)
-        e = np.angle(sym_rot[i] * np.conj(ref))
+        e = np.angle(symbols_out[i] * np.conj(ref))
 
         # Update VCO input
-        theta += controller.process(e)
+        theta += pid_update(pid_state, e)
         if error_history is not None: error_history[i] = e
 
+    return theta
+
+
+def costas_loop(symbols, controller, error_history=None, theta=None):
+    if theta is None: theta = 0.0
+    sym_rot = np.empty(len(symbols), dtype=np.complex64)
+    _costas_kernel(symbols, sym_rot, controller.state, error_history, float(theta))
     return sym_rot
 
 class CostasLoopQPSK:
-    def __init__(self, loop_bw: float):
+    def __init__(self, loop_bw: float, backend=None):
         # Recommended loop bandwidth: R/20 to R/200 where R = sample rate
         # Found at: https://john-gentile.com/kb/dsp/PI_filter.html
+        # With the sdrlib backend the loop runs in sdrlib::carrier_recovery::CostasLoopQPSK (see backend.py)
+        impl = native('CostasLoopQPSK', backend)
+        self._native = impl(loop_bw) if impl is not None else None
         self.loop_bw = loop_bw
 
         self.error_history = None
         self.correction = 0.0
+        self._ring_idx = 0
 
     @property
     def loop_bw(self):
@@ -70,6 +80,8 @@ class CostasLoopQPSK:
     def loop_bw(self, value):
         # Below equations derived at: https://john-gentile.com/kb/dsp/PI_filter.html
         self._loop_bw = value
+        if self._native is not None:
+            self._native.loop_bw = value
 
         damping_factor = 0.707
         alpha = 1 - 2 * damping_factor**2
@@ -83,8 +95,14 @@ class CostasLoopQPSK:
     def reset(self):
         self.error_history = None
         self.correction = 0.0
+        self._ring_idx = 0
+        if self._native is not None:
+            self._native.reset()
 
     def process(self, symbols_in, symbols_out):
+        if self._native is not None:
+            return self._process_native(symbols_in, symbols_out)
+
         # Ensure error history is allocated
         if self.error_history is None or len(self.error_history) != len(symbols_in):
             self.error_history = np.empty(len(symbols_in), dtype=np.float32)
@@ -93,19 +111,33 @@ class CostasLoopQPSK:
         if len(symbols_out) != len(symbols_in):
             raise ValueError("symbols_out must be the same length as symbols_in")
 
-        for i, s in enumerate(symbols_in):
-            # Rotate signal by current VCO phase
-            symbols_out[i] = s * np.exp(-1j*self.correction)
+        self.correction = _costas_kernel(symbols_in, symbols_out, self.controller.state, self.error_history,
+                                         float(self.correction))
+
+    def _process_native(self, symbols_in, symbols_out):
+        if len(symbols_out) != len(symbols_in):
+            raise ValueError("symbols_out must be the same length as symbols_in")
+
+        # sdrlib works on contiguous complex64 buffers; anything else goes through a temporary
+        direct = symbols_out.dtype == np.complex64 and symbols_out.flags.c_contiguous
+        out = symbols_out if direct else np.empty(len(symbols_out), dtype=np.complex64)
+        symbols_in = np.ascontiguousarray(symbols_in, dtype=np.complex64)
+
+        # sdrlib keeps the latest errors in a fixed-size ring buffer. Process at most one ring of symbols at a time
+        # and copy its errors out in time order, so error_history matches the Python loop (one error per symbol)
+        if self.error_history is None or len(self.error_history) != len(symbols_in):
+            self.error_history = np.empty(len(symbols_in), dtype=np.float32)
+        ring = self._native.error_history
+        for start in range(0, len(symbols_in), len(ring)):
+            stop = min(start + len(ring), len(symbols_in))
+            self._native.process(symbols_in[start:stop], out[start:stop])
+            self.error_history[start:stop] = ring[(self._ring_idx + np.arange(stop - start)) % len(ring)]
+            self._ring_idx = (self._ring_idx + stop - start) % len(ring)
 
-            # Decision directed error signal
-            I = symbols_out[i].real
-            Q = symbols_out[i].imag
-            ref = np.sign(I) + 1j*np.sign(Q)
-            e = np.angle(symbols_out[i] * np.conj(ref))
-            self.error_history[i] = e 
+        if not direct:
+            symbols_out[:] = out
 
-            # Update VCO input
-            self.correction += self.controller.process(e)
+        self.correction = self._native.correction
         
 
 class CoarseCFOCorrector(ABC):
@@ -1,23 +1,33 @@
 import numpy as np
-from .interpolators import CubicFarrowInterpolator
+from numba import njit
+from .backend import native
+from .interpolators import CubicFarrowInterpolator, FarrowResampler, cubic_farrow_weights
 
-def apply_awgn(signal, snr_db):
-    """Apply AWGN (additive Gaussian white noise) to signal"""
+def apply_awgn(signal, snr_db, rng=None):
+    """Apply AWGN (additive Gaussian white noise) to signal, drawing from rng if given"""
     signal_power = np.mean(abs(signal) ** 2)
     noise_power = signal_power / (10**(snr_db / 10))
-   
-    awgn = np.sqrt(noise_power / 2) * (np.random.normal(0, 1, len(signal)) + 1j * np.random.normal(0, 1, len(signal)))
+
+    normal = np.random.normal if rng is None else rng.normal
+    awgn = np.sqrt(noise_power / 2) * (normal(0, 1, len(signal)) + 1j * normal(0, 1, len(signal)))
     sig_noisy = signal + awgn
 
     return sig_noisy
 
 
-def apply_cfo(signal, pct_offset=0.03, w_offset=None):
-    """Apply carrier frequency offset to signal"""
+def apply_cfo(signal, pct_offset=0.03, w_offset=None, backend=None):
+    """
+    Apply carrier frequency offset to signal. backend: see backend.py; the sdrlib port (complex64, float32 phase)
+    is only used when backend='sdrlib' is requested explicitly
+    """
     # testing/realistic: 1-5%, aggressive: 10%
 
     if w_offset is None:
         w_offset = pct_offset*(2*np.pi)  # radians/sample
+
+    impl = native('apply_cfo', backend)
+    if impl is not None:
+        return impl(signal, w_offset)
        
     n = np.arange(len(signal))
     sig_offset = signal * np.exp(1j*w_offset*n)
@@ -40,4 +50,309 @@ def apply_fto(frames: np.ndarray, max_delay):
         offset = np.zeros(np.random.randint(1, max_delay))
         sig_out = np.concatenate([sig_out, offset, frame])
     
-    return sig_out
\ No newline at end of file
+    return sig_out
+
+
+### Streaming channel simulator ###
+
+@njit(nogil=True, cache=True)
+def _channel_kernel(signal, out, noise, history, h, gain, w_offset, phase):
+    """Fused STO (4-tap Farrow FIR), gain, CFO rotation and AWGN. Returns the updated carrier phase."""
+    h0, h1, h2, h3 = h
+    s0, s1, s2 = history[0], history[1], history[2]
+
+    for i in range(len(signal)):
+        s3 = signal[i]
+        y = h0*s0 + h1*s1 + h2*s2 + h3*s3
+        out[i] = gain * y * np.exp(1j*phase) + noise[i]
+
+        phase += w_offset
+        s0, s1, s2 = s1, s2, s3
+
+    history[0], history[1], history[2] = s0, s1, s2
+    return np.fmod(phase, 2*np.pi)
+
+
+class ChannelSimulator:
+    """
+    Streaming channel applying STO, gain, CFO and AWGN in a single pass per chunk.
+
+    Phase, interpolator history and noise generator are carried between calls to process(), so a long capture
+    split into chunks of any size produces the same output as one call on the whole capture (given a fixed
+    signal_power). The STO interpolator introduces a fixed latency of two samples.
+
+    Parameters
+    ----------
+    snr_db : float, optional
+        SNR at the channel output in dB. If None, no noise is added.
+    pct_offset : float, optional
+        Carrier frequency offset as a fraction of the sample rate. Ignored if w_offset is given.
+    w_offset : float, optional
+        Carrier frequency offset in radians/sample.
+    mu : float, optional
+        Fractional timing offset, as in apply_sto().
+    integer_offset : int, optional
+        Integer timing offset, as in apply_sto().
+    gain : complex, optional
+        Complex channel gain.
+    signal_power : float, optional
+        Power of the input signal used to scale the noise. If None, it is measured on the first non-empty chunk
+        and held fixed afterwards.
+    seed : int or np.random.SeedSequence, optional
+        Seed for the per-instance noise generator.
+    """
+    def __init__(self, snr_db=None, pct_offset=0.0, w_offset=None, mu=0.0, integer_offset=0, gain=1.0,
+                 signal_power=None, seed=None):
+        self.snr_db = snr_db
+        self.w_offset = pct_offset*(2*np.pi) if w_offset is None else w_offset
+        self.mu = mu
+        self.integer_offset = integer_offset
+        self.gain = gain
+        self.seed = seed
+
+        self._signal_power_init = signal_power
+        self.reset()
+
+    @property
+    def mu(self):
+        return self._mu
+
+    @mu.setter
+    def mu(self, value):
+        self._mu = value
+        self._update_taps()
+
+    @property
+    def integer_offset(self):
+        return self._integer_offset
+
+    @integer_offset.setter
+    def integer_offset(self, value):
+        self._integer_offset = value
+        self._update_taps()
+
+    def _update_taps(self):
+        # Fixed delay -> the Farrow structure reduces to a constant 4-tap FIR filter
+        if hasattr(self, '_mu') and hasattr(self, '_integer_offset'):
+            self._taps = cubic_farrow_weights(self._mu - self._integer_offset)
+
+    def reset(self):
+        """Reset phase, interpolator history and noise generator to their initial state"""
+        self.rng = np.random.default_rng(self.seed)
+        self.phase = 0.0
+        self.signal_power = self._signal_power_init
+        self._history = np.zeros(3, dtype=np.complex64)
+
+    def noise_std(self):
+        """Per-component standard deviation of the noise, or 0 if no noise is applied"""
+        if self.snr_db is None:
+            return 0.0
+        noise_power = self.signal_power * abs(self.gain)**2 / (10**(self.snr_db / 10))
+        return np.sqrt(noise_power / 2)
+
+    def process(self, signal, out=None):
+        """Pass a chunk of samples through the channel. Returns complex64 samples, written to out if given."""
+        signal = np.asarray(signal, dtype=np.complex64)
+        n = len(signal)
+        if out is None:
+            out = np.empty(n, dtype=np.complex64)
+        elif len(out) != n:
+            raise ValueError("out must be the same length as signal")
+
+        if self.signal_power is None and n > 0:
+            self.signal_power = float(np.vdot(signal, signal).real / n)
+
+        # Draw complex64 noise directly: interleaved float32 pairs viewed as complex
+        noise_std = self.noise_std()
+        if noise_std > 0:
+            noise = self.rng.standard_normal(2*n, dtype=np.float32).view(np.complex64)
+            noise *= np.float32(noise_std)
+        else:
+            noise = np.zeros(n, dtype=np.complex64)
+
+        self.phase = _channel_kernel(signal, out, noise, self._history, self._taps,
+                                     np.complex64(self.gain), self.w_offset, self.phase)
+        return out
+
+
+def _check_ppm(ppm):
+    # The resampling ratio 1 + ppm*1e-6 must stay positive
+    if not np.all(np.asarray(ppm, dtype=np.float64) > -1e6):
+        raise ValueError("Clock offset must be greater than -1e6 ppm (a positive resampling ratio).")
+
+
+class ClockDriftChannel:
+    """
+    Sample-rate offset and clock drift between transmitter and receiver.
+
+    The receiver clock runs ppm parts-per-million fast relative to the transmitter, and ppm changes linearly by
+    ppm_per_sample for every input sample. Resampling is done by a streaming Farrow resampler, so captures can be
+    processed in chunks.
+
+    Parameters
+    ----------
+    ppm : float, optional
+        Initial receiver clock offset in parts-per-million.
+    ppm_per_sample : float, optional
+        Linear drift of the clock offset, in ppm per input sample.
+    mu : float, optional
+        Initial fractional sampling phase.
+    """
+    def __init__(self, ppm=0.0, ppm_per_sample=0.0, mu=0.0):
+        _check_ppm(ppm)
+        self._ppm_init = ppm
+        self.ppm_per_sample = ppm_per_sample
+        self._resampler = FarrowResampler(mu=mu)
+        self.reset()
+
+    def reset(self):
+        """Restore the initial clock offset and clear the resampler state"""
+        self.ppm = self._ppm_init
+        self._resampler.reset()
+
+    def process(self, signal, ppm=None):
+        """
+        Resample a chunk of samples to the receiver clock.
+
+        ppm optionally gives the clock offset for every input sample of this chunk (e.g. a measured or
+        sinusoidal drift profile), overriding the linear drift model.
+        """
+        n = len(signal)
+        if ppm is None:
+            ppm = self.ppm + self.ppm_per_sample * np.arange(n)
+            self.ppm += self.ppm_per_sample * n
+        _check_ppm(ppm)
+        return self._resampler.process(signal, ratio=1 + np.asarray(ppm)*1e-6)
+
+
+### Multipath fading ###
+
+class MultipathFadingChannel:
+    """
+    Tapped-delay-line Rayleigh/Rician fading channel for many independent realizations at once.
+
+    Tap gains are generated with the Zheng-Xiao sum-of-sinusoids model, vectorized over realizations, taps and
+    samples. Time and delay-line state are carried between calls, so a realization can be streamed in chunks.
+
+    See:
+        Y. R. Zheng and C. Xiao, “Simulation models with correct statistical properties for Rayleigh fading
+        channels,” IEEE Transactions on Communications, vol. 51, no. 6, pp. 920-928, 2003,
+        doi: 10.1109/TCOMM.2003.813259.
+
+    Parameters
+    ----------
+    n_realizations : int
+        Number of independent channel realizations.
+    path_delays : array_like of int
+        Delay of each tap in samples.
+    path_powers_db : array_like of float, optional
+        Average power of each tap in dB. Normalized so the total power is 1. Default is equal power.
+    doppler : float, optional
+        Maximum Doppler frequency as a fraction of the sample rate.
+    k_factor : float, optional
+        Rician K-factor (linear) of the first tap. If None or 0, all taps are Rayleigh.
+    n_sinusoids : int, optional
+        Number of sinusoids per quadrature component.
+    seed : int or np.random.SeedSequence, optional
+        Seed for the random phases and angles of arrival.
+    """
+    # Max number of float64 elements in the (realizations x taps x sinusoids x samples) phase block
+    MAX_BLOCK_ELEMENTS = 2**22
+
+    def __init__(self, n_realizations, path_delays, path_powers_db=None, doppler=1e-4, k_factor=None,
+                 n_sinusoids=16, seed=None):
+        self.n_realizations = n_realizations
+        self.path_delays = np.asarray(path_delays, dtype=np.int64)
+        if np.any(self.path_delays < 0):
+            raise ValueError("Path delays must be non-negative.")
+        if path_powers_db is None:
+            path_powers_db = np.zeros(len(self.path_delays))
+        path_powers = 10**(np.asarray(path_powers_db, dtype=np.float64) / 10)
+        if len(path_powers) != len(self.path_delays):
+            raise ValueError("path_powers_db must have one entry per path delay.")
+        self._tap_amplitudes = np.sqrt(path_powers / np.sum(path_powers))
+
+        self.doppler = doppler
+        self.k_factor = k_factor
+        self.n_sinusoids = n_sinusoids
+        self.seed = seed
+        self.reset()
+
+    @property
+    def n_taps(self):
+        return len(self.path_delays)
+
+    def reset(self):
+        """Redraw the realizations from the seed and clear time and delay-line state"""
+        R, T, M = self.n_realizations, self.n_taps, self.n_sinusoids
+        rng = np.random.default_rng(self.seed)
+
+        # Random parameters of the sum-of-sinusoids model
+        theta = rng.uniform(-np.pi, np.pi, (R, T, 1))
+        n = np.arange(1, M + 1)
+        alpha = (2*np.pi*n - np.pi + theta) / (4*M)
+        self._cos_alpha = np.cos(alpha)
+        self._sin_alpha = np.sin(alpha)
+        psi = rng.uniform(-np.pi, np.pi, (R, T, M))
+        self._cos_psi = np.cos(psi)[:, :, None, :]
+        self._sin_psi = np.sin(psi)[:, :, None, :]
+        self._phi = rng.uniform(-np.pi, np.pi, (R, T, 1, 1))
+
+        # Line-of-sight component (first tap only)
+        self._los_cos_theta = np.cos(rng.uniform(-np.pi, np.pi, (R, 1)))
+        self._los_phi = rng.uniform(-np.pi, np.pi, (R, 1))
+
+        self._t = 0
+        self._tail = np.zeros((1, int(self.path_delays.max(initial=0))), dtype=np.complex64)
+
+    def gains(self, n_samples):
+        """Generate the next n_samples of tap gains. Returns a complex64 (realizations x taps x samples) tensor."""
+        R, T, M = self.n_realizations, self.n_taps, self.n_sinusoids
+        w_d = 2*np.pi*self.doppler
+        g = np.empty((R, T, n_samples), dtype=np.complex64)
+
+        # Process samples in blocks to bound the size of the phase tensor
+        block = max(1, self.MAX_BLOCK_ELEMENTS // (R * T * M))
+        for start in range(0, n_samples, block):
+            stop = min(start + block, n_samples)
+            wt = w_d * np.arange(self._t + start, self._t + stop, dtype=np.float64)
+
+            # (R, T, 1, M) @ (R, T, M, N) -> sum over sinusoids
+            x_c = self._cos_psi @ np.cos(self._cos_alpha[..., None] * wt + self._phi)
+            x_s = self._sin_psi @ np.cos(self._sin_alpha[..., None] * wt + self._phi)
+            g[:, :, start:stop] = np.sqrt(2/M) * (x_c[:, :, 0] + 1j*x_s[:, :, 0])
+
+            if self.k_factor:
+                K = self.k_factor
+                los = np.exp(1j*(self._los_cos_theta * wt + self._los_phi))
+                g[:, 0, start:stop] = (np.sqrt(K)*los + g[:, 0, start:stop]) / np.sqrt(K + 1)
+
+        self._t += n_samples
+        g *= self._tap_amplitudes[None, :, None].astype(np.float32)
+        return g
+
+    def process(self, signal, gains=None):
+        """
+        Pass signal through every realization of the channel.
+
+        signal may be shared by all realizations (shape (N,)) or one per realization (shape (realizations, N)).
+        If gains is None, the next N samples of gains are generated. Returns a complex64 (realizations, N) array.
+        """
+        signal = np.atleast_2d(np.asarray(signal, dtype=np.complex64))
+        n = signal.shape[-1]
+        if gains is None:
+            gains = self.gains(n)
+
+        # Prepend the delay-line history from the previous chunk
+        n_hist = self._tail.shape[-1]
+        n_rows = max(signal.shape[0], self._tail.shape[0])
+        x_ext = np.concatenate((np.broadcast_to(self._tail, (n_rows, n_hist)),
+                                np.broadcast_to(signal, (n_rows, n))), axis=-1)
+
+        # Time-varying convolution: one vectorized multiply-accumulate per tap
+        out = np.zeros((self.n_realizations, n), dtype=np.complex64)
+        for t, d in enumerate(self.path_delays):
+            out += gains[:, t, :] * x_ext[:, n_hist - d : n_hist - d + n]
+
+        self._tail = x_ext[:, x_ext.shape[-1] - n_hist:].copy()
+        return out
@@ -1,8 +1,9 @@
 
+from functools import lru_cache
 import numpy as np
 from numba import njit
 
-@njit
+@njit(cache=True)
 def diff_encode_psk_symbols(symbols):
     encoded = np.zeros(len(symbols) + 1, dtype=np.complex64)
     
@@ -12,6 +13,614 @@ def diff_encode_psk_symbols(symbols):
 
     return encoded
 
-@njit
+@njit(cache=True)
 def diff_decode_psk_symbols(symbols):
-    return symbols[1:]/symbols[:-1] * np.sqrt(1j)
\ No newline at end of file
+    return symbols[1:]/symbols[:-1] * np.sqrt(1j)
+
+### Integer-phase differential coding ###
+
+def _phase_dtype(M):
+    return np.uint8 if M <= 256 else np.int64
+
+
+def psk_phase_index(symbols, M, offset=0.0):
+    """Quantize the phase of symbols to the nearest of M positions offset + 2*pi*k/M. Returns integer k."""
+    k = np.rint((np.angle(symbols) - offset) * (M / (2*np.pi))).astype(np.int64) % M
+    return k.astype(_phase_dtype(M))
+
+
+def psk_symbols(indices, M, offset=0.0):
+    """Map integer phase indices k to complex64 unit symbols exp(j*(offset + 2*pi*k/M))"""
+    return np.exp(1j*(offset + (2*np.pi/M) * np.asarray(indices, dtype=np.float64))).astype(np.complex64)
+
+
+def diff_encode_phase(indices, M, ref=0):
+    """
+    Differentially encode M-PSK phase indices: out[n] = (ref + indices[0] + ... + indices[n]) mod M.
+    Returns the encoded indices and the new reference (the last encoded index).
+
+    For QPSK, psk_symbols(out, 4, offset=np.pi/4) with ref=0 matches diff_encode_psk_symbols() without its leading
+    reference symbol.
+    """
+    indices = np.asarray(indices).ravel()
+    dtype = _phase_dtype(M)
+    ref = int(ref) % M
+    if M & (M - 1) == 0 and M <= 256:
+        # Power-of-two M divides 256, so uint8 wrap-around is already modulo M
+        out = np.cumsum(indices.astype(np.uint8, copy=False), dtype=np.uint8)
+        out += np.uint8(ref)
+        out &= np.uint8(M - 1)
+    else:
+        out = ((np.cumsum(indices, dtype=np.int64) + ref) % M).astype(dtype)
+
+    new_ref = int(out[-1]) if len(out) > 0 else ref
+    return out, new_ref
+
+
+def diff_decode_phase(indices, M, ref=0):
+    """
+    Differentially decode M-PSK phase indices: out[n] = (indices[n] - indices[n-1]) mod M, with indices[-1] = ref.
+    Returns the decoded indices and the new reference (the last received index).
+    """
+    indices = np.asarray(indices).ravel()
+    if len(indices) == 0:
+        return np.empty(0, dtype=_phase_dtype(M)), ref
+
+    prev = np.empty_like(indices, dtype=np.int64)
+    prev[0] = ref
+    prev[1:] = indices[:-1]
+    out = ((indices.astype(np.int64) - prev) % M).astype(_phase_dtype(M))
+    return out, int(indices[-1])
+
+
+class DiffPSKEncoder:
+    """Streaming differential M-PSK encoder on integer phase indices. The reference phase carries across calls."""
+    def __init__(self, M=4, ref=0):
+        self.M = M
+        self._ref_init = ref
+        self.reset()
+
+    def reset(self):
+        self.ref = self._ref_init
+
+    def process(self, indices):
+        out, self.ref = diff_encode_phase(indices, self.M, self.ref)
+        return out
+
+
+class DiffPSKDecoder:
+    """Streaming differential M-PSK decoder on integer phase indices. The last received phase carries across calls."""
+    def __init__(self, M=4, ref=0):
+        self.M = M
+        self._ref_init = ref
+        self.reset()
+
+    def reset(self):
+        self.ref = self._ref_init
+
+    def process(self, indices):
+        out, self.ref = diff_decode_phase(indices, self.M, self.ref)
+        return out
+
+
+### Convolutional coding ###
+
+# Puncturing patterns, one row per generator polynomial (DVB-S convention for the (171, 133) code)
+PUNCTURE_PATTERNS = {
+    '1/2': ((1,), (1,)),
+    '2/3': ((1, 0), (1, 1)),
+    '3/4': ((1, 0, 1), (1, 1, 0)),
+    '5/6': ((1, 0, 1, 0, 1), (1, 1, 0, 1, 0)),
+    '7/8': ((1, 0, 0, 0, 1, 0, 1), (1, 1, 1, 1, 0, 1, 0)),
+}
+
+
+def _puncture_mask(puncture, n_out):
+    if puncture is None:
+        puncture = PUNCTURE_PATTERNS['1/2']
+    elif isinstance(puncture, str):
+        puncture = PUNCTURE_PATTERNS[puncture]
+    mask = np.asarray(puncture, dtype=bool)
+    if mask.ndim != 2 or mask.shape[0] != n_out:
+        raise ValueError("Puncturing pattern must have one row per generator polynomial.")
+    return mask
+
+
+class ConvolutionalEncoder:
+    """
+    Streaming feed-forward convolutional encoder with optional puncturing.
+
+    Generators are given in octal convention, MSB applied to the newest input bit. The default is the K=7
+    (171, 133) code. Bits are unpacked 0/1 values; coded bits are ordered step by step, one per (unpunctured)
+    generator. Shift register contents and puncturing phase carry across calls.
+    """
+    def __init__(self, generators=(0o171, 0o133), K=7, puncture=None):
+        self.generators = tuple(generators)
+        self.K = K
+        self.puncture_mask = _puncture_mask(puncture, len(self.generators))
+        self._taps = np.array([[(g >> (K - 1 - i)) & 1 for i in range(K)] for g in self.generators], dtype=np.uint8)
+        self.reset()
+
+    @property
+    def rate(self):
+        return self.puncture_mask.shape[1] / np.count_nonzero(self.puncture_mask)
+
+    def reset(self):
+        self._state = np.zeros(self.K - 1, dtype=np.uint8)
+        self._step = 0
+
+    def process(self, bits):
+        """Encode a chunk of bits. Returns coded bits as uint8."""
+        bits = np.asarray(bits, dtype=np.uint8).ravel()
+        n = len(bits)
+        ext = np.concatenate((self._state, bits))
+
+        # Each output stream is a mod-2 convolution of the input with its generator taps
+        coded = np.empty((n, len(self.generators)), dtype=np.uint8)
+        for j, taps in enumerate(self._taps):
+            coded[:, j] = np.convolve(ext, taps, mode='valid') & 1
+
+        self._state = ext[len(ext) - (self.K - 1):]
+
+        # Puncture, keeping track of the position within the pattern
+        period = self.puncture_mask.shape[1]
+        phase = (self._step + np.arange(n)) % period
+        self._step = (self._step + n) % period
+        return coded[self.puncture_mask[:, phase].T]
+
+    def flush(self):
+        """Encode K-1 zero tail bits, returning the encoder to the all-zero state"""
+        return self.process(np.zeros(self.K - 1, dtype=np.uint8))
+
+
+@njit(cache=True)
+def _viterbi_acs(llrs, n_out, metrics, branch_index, decisions):
+    """
+    Add-compare-select over every trellis state for each step. Metrics are correlations (higher is better).
+    branch_index[s, lsb] is the expected output word of the branch into state s from predecessor with that LSB.
+    """
+    S = len(metrics)
+    n_words = 1 << n_out
+    branch_metrics = np.empty(n_words, dtype=np.float32)
+    prev = metrics.copy()
+    new = np.empty_like(metrics)
+
+    for t in range(len(llrs) // n_out):
+        # Correlation of the received LLRs with every possible output word (bit j of the word = output j)
+        for w in range(n_words):
+            bm = np.float32(0.0)
+            for j in range(n_out):
+                llr = llrs[t*n_out + j]
+                bm += -llr if (w >> (n_out - 1 - j)) & 1 else llr
+            branch_metrics[w] = bm
+
+        for s in range(S):
+            # Predecessors of s differ only in their LSB, which is shifted out of the register
+            p0 = (s << 1) & (S - 1)
+            m0 = prev[p0] + branch_metrics[branch_index[s, 0]]
+            m1 = prev[p0 | 1] + branch_metrics[branch_index[s, 1]]
+            if m1 > m0:
+                new[s] = m1
+                decisions[t, s] = 1
+            else:
+                new[s] = m0
+                decisions[t, s] = 0
+        prev, new = new, prev
+
+        # Periodically normalize to keep metrics bounded
+        if t % 64 == 63:
+            best = prev.max()
+            for s in range(S):
+                prev[s] -= best
+
+    best = prev.max()
+    for s in range(S):
+        metrics[s] = prev[s] - best
+
+
+@njit(cache=True)
+def _viterbi_traceback(decisions, n_steps, state, K, bits):
+    """Trace back from state at step n_steps-1, writing the decided input bit of every step"""
+    S = 1 << (K - 1)
+    for t in range(n_steps - 1, -1, -1):
+        bits[t] = state >> (K - 2)
+        state = ((state << 1) & (S - 1)) | decisions[t, state]
+
+
+class ViterbiDecoder:
+    """
+    Streaming Viterbi decoder for the codes produced by ConvolutionalEncoder.
+
+    Input is soft LLRs, log(P(b=0)/P(b=1)) as produced by Constellation.llr(), or hard 0/1 bits if soft=False.
+    Punctured positions are re-inserted as erasures. Decisions are released once they are traceback_depth steps
+    old, so memory is bounded by the chunk size plus the traceback window. Call flush() at the end of a stream.
+    """
+    def __init__(self, generators=(0o171, 0o133), K=7, puncture=None, traceback_depth=None, soft=True):
+        self.generators = tuple(generators)
+        self.K = K
+        self.n_states = 2**(K - 1)
+        self.soft = soft
+        self.puncture_mask = _puncture_mask(puncture, len(self.generators))
+        if traceback_depth is None:
+            traceback_depth = 5*K if self.puncture_mask.all() else 10*K
+        self.traceback_depth = traceback_depth
+
+        # Expected output word (first generator in the MSB) for each state and each of its two predecessors
+        n_out = len(self.generators)
+        self._branch_index = np.zeros((self.n_states, 2), dtype=np.int64)
+        for s in range(self.n_states):
+            b = s >> (K - 2)
+            for lsb in range(2):
+                p = ((s << 1) & (self.n_states - 1)) | lsb
+                register = (b << (K - 1)) | p
+                for g in self.generators:
+                    parity = bin(register & g).count('1') & 1
+                    self._branch_index[s, lsb] = (self._branch_index[s, lsb] << 1) | parity
+
+        # Depuncturing: positions of kept coded bits within one (steps x outputs) pattern period
+        self._kept = np.flatnonzero(self.puncture_mask.T.ravel())
+        self.reset()
+
+    def reset(self):
+        # Encoder starts in the all-zero state
+        self._metrics = np.full(self.n_states, -1e9, dtype=np.float32)
+        self._metrics[0] = 0.0
+        self._decisions = np.empty((0, self.n_states), dtype=np.uint8)
+        self._n = 0
+        self._pending = np.empty(0, dtype=np.float32)
+
+    def _depuncture(self, llrs, final=False):
+        """Expand received LLRs to whole trellis steps, with zeros at punctured positions"""
+        llrs = np.concatenate((self._pending, llrs))
+        n_out = len(self.generators)
+        period_len = self.puncture_mask.size
+        n_kept = len(self._kept)
+
+        n_periods = len(llrs) // n_kept
+        full = np.zeros((n_periods, period_len), dtype=np.float32)
+        full[:, self._kept] = llrs[:n_periods*n_kept].reshape(n_periods, n_kept)
+        full = full.ravel()
+        rest = llrs[n_periods*n_kept:]
+
+        if final and len(rest) > 0:
+            # Partial period at the end of the stream
+            partial = np.zeros(period_len, dtype=np.float32)
+            partial[self._kept[:len(rest)]] = rest
+            n_steps = self._kept[len(rest) - 1] // n_out + 1
+            full = np.concatenate((full, partial[:n_steps*n_out]))
+            rest = rest[:0]
+
+        self._pending = rest
+        return full
+
+    def _acs(self, llrs):
+        n_steps = len(llrs) // len(self.generators)
+        if self._n + n_steps > len(self._decisions):
+            grown = np.empty((self._n + n_steps, self.n_states), dtype=np.uint8)
+            grown[:self._n] = self._decisions[:self._n]
+            self._decisions = grown
+        _viterbi_acs(llrs, len(self.generators), self._metrics, self._branch_index,
+                     self._decisions[self._n:self._n + n_steps])
+        self._n += n_steps
+
+    def _release(self, n_release, state):
+        bits = np.empty(self._n, dtype=np.uint8)
+        _viterbi_traceback(self._decisions, self._n, state, self.K, bits)
+
+        # Keep only the undecided window
+        self._decisions[:self._n - n_release] = self._decisions[n_release:self._n]
+        self._n -= n_release
+        return bits[:n_release]
+
+    def process(self, data):
+        """Decode a chunk of LLRs (or hard bits). Returns the decided bits that have left the traceback window."""
+        data = np.asarray(data).ravel()
+        llrs = data.astype(np.float32) if self.soft else 1 - 2*data.astype(np.float32)
+        self._acs(self._depuncture(llrs))
+
+        if self._n <= self.traceback_depth:
+            return np.empty(0, dtype=np.uint8)
+        return self._release(self._n - self.traceback_depth, int(np.argmax(self._metrics)))
+
+    def flush(self, terminated=True):
+        """
+        Decode every remaining step. If terminated, the stream is assumed to end with the encoder's K-1 zero
+        tail bits: the traceback starts from the zero state and the tail bits are dropped.
+        """
+        self._acs(self._depuncture(np.empty(0, dtype=np.float32), final=True))
+        state = 0 if terminated else int(np.argmax(self._metrics))
+        bits = self._release(self._n, state)
+        return bits[:len(bits) - (self.K - 1)] if terminated else bits
+
+
+def conv_encode(bits, generators=(0o171, 0o133), K=7, puncture=None, terminate=True):
+    """Convolutionally encode a whole bit sequence, optionally appending the K-1 zero tail bits"""
+    encoder = ConvolutionalEncoder(generators, K, puncture)
+    coded = encoder.process(bits)
+    return np.concatenate((coded, encoder.flush())) if terminate else coded
+
+
+def viterbi_decode(data, generators=(0o171, 0o133), K=7, puncture=None, terminated=True, soft=True):
+    """Viterbi decode a whole sequence of LLRs (or hard bits) produced by conv_encode()"""
+    decoder = ViterbiDecoder(generators, K, puncture, soft=soft)
+    return np.concatenate((decoder.process(data), decoder.flush(terminated)))
+
+
+### CRC ###
+
+def _reflect(value, width):
+    return int(format(value, f'0{width}b')[::-1], 2)
+
+
+@njit(cache=True)
+def _crc_update_normal(crc, data, table, width, mask):
+    shift = width - 8
+    for b in data:
+        crc = ((crc << 8) & mask) ^ table[((crc >> shift) ^ b) & 0xFF]
+    return crc
+
+
+@njit(cache=True)
+def _crc_update_reflected(crc, data, table):
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    return crc
+
+
+# (width, poly, init, refin, refout, xorout) in the Rocksoft model
+CRC_PRESETS = {
+    'crc16-ccitt': (16, 0x1021, 0xFFFF, False, False, 0x0000),
+    'crc16-arc': (16, 0x8005, 0x0000, True, True, 0x0000),
+    'crc32': (32, 0x04C11DB7, 0xFFFFFFFF, True, True, 0xFFFFFFFF),
+    'crc32c': (32, 0x1EDC6F41, 0xFFFFFFFF, True, True, 0xFFFFFFFF),
+}
+
+
+class CRC:
+    """
+    Streaming table-driven CRC (Rocksoft model), processing one byte per table lookup.
+
+    Use a preset name from CRC_PRESETS (e.g. 'crc32') or give the model parameters. Data is bytes or a uint8
+    array (e.g. np.packbits output); update() may be called once per chunk.
+    """
+    def __init__(self, preset='crc32', width=None, poly=None, init=0, refin=False, refout=False, xorout=0):
+        if width is None:
+            width, poly, init, refin, refout, xorout = CRC_PRESETS[preset]
+        if not 8 <= width <= 32:
+            raise ValueError("CRC width must be between 8 and 32 bits.")
+
+        self.width = width
+        self.poly = poly
+        self.init = init
+        self.refin = refin
+        self.refout = refout
+        self.xorout = xorout
+        self.mask = (1 << width) - 1
+        self._table = _crc_table(width, poly, refin)
+        self.reset()
+
+    def reset(self):
+        self._crc = _reflect(self.init, self.width) if self.refin else self.init
+
+    def update(self, data):
+        """Feed a chunk of bytes into the CRC"""
+        data = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray)) else \
+            np.asarray(data, dtype=np.uint8).ravel()
+        if self.refin:
+            self._crc = int(_crc_update_reflected(np.int64(self._crc), data, self._table))
+        else:
+            self._crc = int(_crc_update_normal(np.int64(self._crc), data, self._table, self.width, np.int64(self.mask)))
+        return self
+
+    @property
+    def value(self):
+        """CRC of all data fed so far"""
+        crc = self._crc
+        if self.refin != self.refout:
+            crc = _reflect(crc, self.width)
+        return crc ^ self.xorout
+
+    def compute(self, data):
+        """CRC of data on its own, leaving the running state untouched"""
+        crc = CRC(width=self.width, poly=self.poly, init=self.init, refin=self.refin, refout=self.refout,
+                  xorout=self.xorout)
+        return crc.update(data).value
+
+    def to_bytes(self, value=None):
+        """CRC as bytes: little-endian for reflected CRCs, big-endian otherwise"""
+        value = self.value if value is None else value
+        return np.frombuffer(value.to_bytes(self.width // 8, 'little' if self.refout else 'big'), dtype=np.uint8)
+
+    def append(self, data):
+        """Return data with its CRC appended"""
+        data = np.asarray(bytearray(data) if isinstance(data, bytes) else data, dtype=np.uint8).ravel()
+        return np.concatenate((data, self.to_bytes(self.compute(data))))
+
+    def check(self, frame):
+        """Check a frame produced by append()"""
+        frame = np.asarray(bytearray(frame) if isinstance(frame, bytes) else frame, dtype=np.uint8).ravel()
+        n = self.width // 8
+        if len(frame) < n:
+            return False
+        return np.array_equal(self.to_bytes(self.compute(frame[:-n])), frame[-n:])
+
+
+@lru_cache(maxsize=None)
+def _crc_table(width, poly, refin):
+    table = np.empty(256, dtype=np.int64)
+    mask = (1 << width) - 1
+    if refin:
+        poly_r = _reflect(poly, width)
+        for b in range(256):
+            c = b
+            for _ in range(8):
+                c = (c >> 1) ^ poly_r if c & 1 else c >> 1
+            table[b] = c
+    else:
+        top = 1 << (width - 1)
+        for b in range(256):
+            c = b << (width - 8)
+            for _ in range(8):
+                c = ((c << 1) ^ poly) & mask if c & top else (c << 1) & mask
+            table[b] = c
+    table.flags.writeable = False
+    return table
+
+
+### LFSRs and scrambling ###
+
+# Primitive polynomials by degree, bit k set for the x^k term
+PRIMITIVE_POLYNOMIALS = {
+    3: 0b1011, 4: 0x13, 5: 0x25, 6: 0x43, 7: 0x83, 8: 0x11D, 9: 0x211, 10: 0x409, 11: 0x805, 12: 0x1053,
+    13: 0x201B, 14: 0x4443, 15: 0x8003, 16: 0x1100B, 17: 0x20009, 18: 0x40081, 19: 0x80027, 20: 0x100009,
+    21: 0x200005, 22: 0x400003, 23: 0x800021, 24: 0x100001B,
+}
+
+
+def _degree(poly):
+    n = poly.bit_length() - 1
+    if not 1 <= n <= 32:
+        raise ValueError("Polynomial degree must be between 1 and 32.")
+    return n
+
+
+def _parity(x):
+    return bin(x).count('1') & 1
+
+
+def _lfsr_bit_step(state, x, poly, n):
+    # Fibonacci LFSR with characteristic polynomial poly: s[k+n] = sum(c_i * s[k+i]), state bit i = s[k+i].
+    # The output s[k] is XORed onto the input bit (additive scrambling).
+    out = (state & 1) ^ x
+    feedback = _parity(state & poly & ((1 << n) - 1))
+    return out, (state >> 1) | (feedback << (n - 1))
+
+
+def _multiplicative_bit_step(state, x, poly, n, descramble):
+    # Self-synchronizing scrambler y[k] = x[k] ^ sum(c_i * y[k-i]), i=1..n, state bit i-1 = y[k-i]
+    feedback = _parity(state & (poly >> 1))
+    out = x ^ feedback
+    y = x if descramble else out
+    return out, ((state << 1) | y) & ((1 << n) - 1)
+
+
+@lru_cache(maxsize=None)
+def _byte_tables(kind, poly):
+    """
+    Tables for advancing a bit-serial scrambler/LFSR by one byte per lookup.
+
+    Both the output byte and the next state are linear (over GF(2)) in the current state and input byte, so
+    they are the XOR of one table entry per state byte plus one for the input byte.
+    """
+    n = _degree(poly)
+    if kind == 'additive':
+        step = lambda state, x: _lfsr_bit_step(state, x, poly, n)
+    else:
+        step = lambda state, x: _multiplicative_bit_step(state, x, poly, n, kind == 'descramble')
+
+    def run_byte(state, byte):
+        out = 0
+        for t in range(8):
+            bit, state = step(state, (byte >> (7 - t)) & 1)
+            out |= bit << (7 - t)
+        return out, state
+
+    n_state_bytes = (n + 7) // 8
+    state_out = np.zeros((n_state_bytes, 256), dtype=np.int64)
+    state_next = np.zeros((n_state_bytes, 256), dtype=np.int64)
+    for j in range(n_state_bytes):
+        for v in range(256):
+            state_out[j, v], state_next[j, v] = run_byte((v << (8*j)) & ((1 << n) - 1), 0)
+
+    input_out = np.zeros(256, dtype=np.int64)
+    input_next = np.zeros(256, dtype=np.int64)
+    for v in range(256):
+        input_out[v], input_next[v] = run_byte(0, v)
+
+    for table in (state_out, state_next, input_out, input_next):
+        table.flags.writeable = False
+    return state_out, state_next, input_out, input_next
+
+
+@njit(cache=True)
+def _byte_machine(state, data, out, state_out, state_next, input_out, input_next):
+    n_state_bytes = state_out.shape[0]
+    for i in range(len(data)):
+        o = input_out[data[i]]
+        nxt = input_next[data[i]]
+        for j in range(n_state_bytes):
+            v = (state >> (8*j)) & 0xFF
+            o ^= state_out[j, v]
+            nxt ^= state_next[j, v]
+        out[i] = o
+        state = nxt
+    return state
+
+
+class _ByteScrambler:
+    def __init__(self, kind, poly, seed):
+        self.poly = poly
+        self.degree = _degree(poly)
+        self.seed = seed
+        self._tables = _byte_tables(kind, poly)
+        self.reset()
+
+    def reset(self):
+        self.state = self.seed
+
+    def process(self, data):
+        """Process a chunk of packed bits (uint8, np.packbits order). Returns uint8."""
+        data = np.asarray(data, dtype=np.uint8).ravel()
+        out = np.empty(len(data), dtype=np.uint8)
+        self.state = int(_byte_machine(np.int64(self.state), data, out, *self._tables))
+        return out
+
+
+class LFSR(_ByteScrambler):
+    """
+    Fibonacci linear-feedback shift register generating 8 output bits per table lookup.
+
+    poly is the characteristic polynomial with bit k set for the x^k term (see PRIMITIVE_POLYNOMIALS); a primitive
+    polynomial gives a maximal-length sequence. seed is the nonzero initial state, its bit 0 being the first
+    output bit. State carries across calls.
+    """
+    def __init__(self, poly, seed=1):
+        if seed == 0:
+            raise ValueError("LFSR seed must be nonzero.")
+        super().__init__('additive', poly, seed)
+
+    def next_bytes(self, n_bytes):
+        """Next 8*n_bytes output bits, packed (np.packbits order)"""
+        return self.process(np.zeros(n_bytes, dtype=np.uint8))
+
+
+class AdditiveScrambler(LFSR):
+    """
+    Additive (synchronous) scrambler: XOR packed data with an LFSR sequence. Scrambling and descrambling are the
+    same operation, and both ends must start from the same seed.
+    """
+
+
+class MultiplicativeScrambler(_ByteScrambler):
+    """
+    Multiplicative (self-synchronizing) scrambler y[k] = x[k] ^ sum(c_i * y[k-i]) over the taps of poly, processed
+    8 bits per table lookup. With descramble=True it inverts the scrambler, resynchronizing after degree bits
+    regardless of its initial state.
+    """
+    def __init__(self, poly, seed=0, descramble=False):
+        self.descramble = descramble
+        super().__init__('descramble' if descramble else 'scramble', poly, seed)
+
+
+@lru_cache(maxsize=64)
+def lfsr_sequence(poly, seed=1, n_bits=None):
+    """
+    Cached read-only LFSR output of n_bits bits (unpacked uint8) from the given seed. n_bits defaults to one
+    period of a maximal-length sequence, 2^degree - 1.
+    """
+    if n_bits is None:
+        n_bits = 2**_degree(poly) - 1
+    packed = LFSR(poly, seed).next_bytes((n_bits + 7) // 8)
+    bits = np.unpackbits(packed)[:n_bits]
+    bits.flags.writeable = False
+    return bits
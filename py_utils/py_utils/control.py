@@ -1,35 +1,73 @@
+import numpy as np
+from numba import njit
 
-import numba
-from numba import jit, njit, float64
-from numba.experimental import jitclass
+
+# PID state layout: gains followed by the running error sum and the previous error
+K_P, K_I, K_D, SUM_E, PREV_E = range(5)
+
+
+@njit(nogil=True, cache=True)
+def pid_update(state, e):
+    """One PID step on a PIDFeedback.state array (updated in place). Callable from other compiled kernels."""
+    state[SUM_E] += e
+    d = e - state[PREV_E]
+    x = (state[K_I] * state[SUM_E]) + (state[K_P] * e) + (state[K_D] * d)
+
+    state[PREV_E] = e
+
+    return x
 
 
-spec = [
-    ('K_p', float64),
-    ('K_i', float64),
-    ('K_d', float64),
-    ('sum_e', float64),
-    ('prev_e', float64),
-]
-@jitclass(spec)
 class PIDFeedback:
+    """
+    PID controller. Gains and memory live in the float64 array state (see pid_update()), so compiled loops take
+    the array rather than the object and stay cacheable across processes.
+    """
     def __init__(self, K_p=0.0, K_i=0.0, K_d=0.0):
+        self.state = np.zeros(5)
         self.K_p = K_p
         self.K_i = K_i
         self.K_d = K_d
 
-        self.sum_e = 0.0
-        self.prev_e = 0.0
+    @property
+    def K_p(self):
+        return self.state[K_P]
+
+    @K_p.setter
+    def K_p(self, value):
+        self.state[K_P] = value
+
+    @property
+    def K_i(self):
+        return self.state[K_I]
+
+    @K_i.setter
+    def K_i(self, value):
+        self.state[K_I] = value
+
+    @property
+    def K_d(self):
+        return self.state[K_D]
+
+    @K_d.setter
+    def K_d(self, value):
+        self.state[K_D] = value
+
+    @property
+    def sum_e(self):
+        return self.state[SUM_E]
+
+    @property
+    def prev_e(self):
+        return self.state[PREV_E]
 
     def update(self, e):
-        self.sum_e += e
-        d = e - self.prev_e
-        x = (self.K_i * self.sum_e) + (self.K_p * e) + (self.K_d * d)
+        return pid_update(self.state, float(e))
 
-        self.prev_e = e
+    def process(self, e):
+        # Same interface as sdrlib's PIDFeedback, used by the recovery loops
+        return self.update(e)
 
-        return x
-    
     def reset(self):
-        self.sum_e = 0.0
-        self.prev_e = 0.0
\ No newline at end of file
+        self.state[SUM_E] = 0.0
+        self.state[PREV_E] = 0.0
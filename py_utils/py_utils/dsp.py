@@ -5,6 +5,11 @@ from numba import jit, njit, float64
 from numba.experimental import jitclass
 import numpy as np
 import scipy
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd
+
+from .interpolators import FarrowResampler
 
 def upsample(signal, factor):
     sig_upsampled = np.zeros(signal.size*factor, dtype=signal.dtype)
@@ -47,9 +52,374 @@ def rrc_filter(signal, n_taps=21, beta=0.35, Ts=2, trim=True):
     else:
         return y
 
-@njit
+@njit(cache=True)
 def iir_lowpass(x, y_prev, alpha):
     # 0 < alpha < 1
     # lower alpha -> smoother output
     return (1 - alpha) * y_prev + alpha * x
 
+
+### Integer IQ ingest ###
+
+@njit(nogil=True, cache=True)
+def _ingest_kernel(raw, out, taps, work, scale, dc, dc_alpha):
+    """
+    Scale interleaved integer IQ, remove DC with a one-pole mean tracker and FIR filter, writing complex64 to out.
+    work holds the filter history in its first len(taps)-1 entries and is updated in place. Returns the DC estimate.
+    """
+    n_hist = len(taps) - 1
+    n = raw.shape[0]
+
+    for i in range(n):
+        x = complex(raw[i, 0] * scale, raw[i, 1] * scale)
+        if dc_alpha > 0:
+            dc = iir_lowpass(x, dc, dc_alpha)
+            x -= dc
+        work[n_hist + i] = x
+
+    for i in range(n):
+        acc = 0j
+        for k in range(n_hist + 1):
+            acc += taps[k] * work[n_hist + i - k]
+        out[i] = acc
+
+    for k in range(n_hist):
+        work[k] = work[n + k]
+    return dc
+
+
+class IQIngestFilter:
+    """
+    Front-end stage for integer IQ from SDRs/captures (sc16, sc8, or interleaved float32): scaling to [-1, 1), DC
+    removal and the RRC matched filter fused into one compiled pass that emits complex64, instead of expanding the
+    input to complex128 before rrc_filter().
+
+    Input is interleaved components, shape (N, 2) or (2N,). Output i is the full convolution output (delayed by
+    (n_taps-1)//2 samples, like pipeline.FIRFilter); state is carried between chunks. dc_alpha=None disables DC
+    removal. Follows the pipeline block interface (process/reset/rate/max_output).
+    """
+    rate = 1.0
+    dtype = np.complex64
+
+    def __init__(self, n_taps=21, beta=0.35, Ts=2, dc_alpha=1e-3, taps=None, full_scale=None):
+        taps = rrc(n_taps, beta, Ts) if taps is None else np.asarray(taps)
+        # RRC taps are real: filtering with real taps halves the multiplies
+        self.taps = taps.real.astype(np.float32) if not np.any(np.imag(taps)) else taps.astype(np.complex64)
+        self.delay = (len(self.taps) - 1) // 2
+        self.dc_alpha = 0.0 if dc_alpha is None else dc_alpha
+        self.full_scale = full_scale
+        self.reset()
+
+    def reset(self):
+        self.dc = 0j
+        self._work = np.zeros(len(self.taps) - 1, dtype=np.complex64)
+
+    def process(self, raw, out=None):
+        raw = np.asarray(raw)
+        raw = raw.reshape(-1, 2) if raw.ndim == 1 else raw
+        n = len(raw)
+
+        if self.full_scale is not None:
+            full_scale = self.full_scale
+        elif raw.dtype.kind == 'i':
+            full_scale = -float(np.iinfo(raw.dtype).min)
+        else:
+            full_scale = 1.0
+
+        if out is None:
+            out = np.empty(n, dtype=np.complex64)
+        elif len(out) < n:
+            raise ValueError("out is shorter than the input chunk")
+
+        n_hist = len(self.taps) - 1
+        if len(self._work) < n_hist + n:
+            work = np.empty(n_hist + n, dtype=np.complex64)
+            work[:n_hist] = self._work[:n_hist]
+            self._work = work
+
+        self.dc = _ingest_kernel(raw, out, self.taps, self._work, np.float32(1 / full_scale),
+                                 complex(self.dc), self.dc_alpha)
+        return out[:n]
+
+    def max_output(self, n_in):
+        return n_in
+
+
+### Resampling ###
+
+@lru_cache(maxsize=64)
+def resampler_prototype(L, M, taps_per_phase=16, kaiser_beta=8.0):
+    """
+    Lowpass prototype for an L/M polyphase resampler (L * taps_per_phase taps, gain L, cutoff at the lower of the
+    two Nyquist rates). Cached and read-only.
+    """
+    h = scipy.signal.firwin(L * taps_per_phase, 1 / max(L, M), window=('kaiser', kaiser_beta)) * L
+    h = h.astype(np.float32)
+    h.flags.writeable = False
+    return h
+
+
+@njit(nogil=True, cache=True)
+def _polyphase_kernel(x, out, work, h, L, M, t):
+    """
+    Polyphase L/M resampling of x. work holds K-1 samples of history followed by room for x (K taps per phase).
+    t is the time of the next output in units of 1/L input samples, relative to the first sample of x.
+    Returns the number of outputs and t relative to the next chunk.
+    """
+    K = len(h) // L
+    n_hist = K - 1
+    n_in = len(x)
+    for i in range(n_in):
+        work[n_hist + i] = x[i]
+
+    n_out = 0
+    while t // L < n_in:
+        n = t // L
+        phase = t % L
+        acc = 0j
+        for k in range(K):
+            acc += h[phase + k*L] * work[n_hist + n - k]
+        out[n_out] = acc
+        n_out += 1
+        t += M
+
+    for k in range(n_hist):
+        work[k] = work[n_in + k]
+    return n_out, t - n_in * L
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational resampler: upsample by L, lowpass, downsample by M, computed with a polyphase filter bank so
+    only the kept outputs are calculated. Filter history and output phase are carried between chunks, so chunked
+    output equals whole-array output. Group delay is (L*taps_per_phase - 1) / (2*M) output samples.
+    Follows the pipeline block interface (process/reset/rate/max_output).
+    """
+    dtype = np.complex64
+
+    def __init__(self, L, M, taps_per_phase=16, kaiser_beta=8.0, taps=None):
+        g = gcd(L, M)
+        self.L, self.M = L // g, M // g
+        self.rate = self.L / self.M
+        self.taps = resampler_prototype(self.L, self.M, taps_per_phase, kaiser_beta) if taps is None else \
+            np.asarray(taps, dtype=np.float32)
+        if len(self.taps) % self.L:
+            self.taps = np.concatenate((self.taps, np.zeros(self.L - len(self.taps) % self.L, dtype=np.float32)))
+        self.reset()
+
+    def reset(self):
+        self._t = 0
+        self._work = np.zeros(len(self.taps) // self.L - 1, dtype=np.complex64)
+
+    def max_output(self, n_in):
+        return (n_in * self.L) // self.M + 1
+
+    def process(self, signal, out=None):
+        signal = np.asarray(signal, dtype=np.complex64)
+        if out is None:
+            out = np.empty(self.max_output(len(signal)), dtype=np.complex64)
+        elif len(out) < self.max_output(len(signal)):
+            raise ValueError("out is too small for the resampled chunk")
+
+        n_hist = len(self.taps) // self.L - 1
+        if len(self._work) < n_hist + len(signal):
+            work = np.empty(n_hist + len(signal), dtype=np.complex64)
+            work[:n_hist] = self._work[:n_hist]
+            self._work = work
+
+        n_out, self._t = _polyphase_kernel(signal, out, self._work, self.taps, self.L, self.M, self._t)
+        return out[:n_out]
+
+
+class ArbitraryResampler:
+    """
+    Streaming resampler for any (irrational or time-varying) ratio = output rate / input rate, built on
+    interpolators.FarrowResampler. When decimating, a cached Kaiser lowpass at the output Nyquist rate is applied
+    first to prevent aliasing. Follows the pipeline block interface (process/reset/rate/max_output).
+    """
+    dtype = np.complex64
+
+    def __init__(self, ratio, n_taps=63, kaiser_beta=8.0):
+        self.rate = ratio
+        self._farrow = FarrowResampler(ratio)
+        self.taps = _antialias_taps(ratio, n_taps, kaiser_beta) if ratio < 1 else None
+        self.reset()
+
+    def reset(self):
+        self._farrow.reset()
+        self._history = np.zeros(0 if self.taps is None else len(self.taps) - 1, dtype=np.complex64)
+
+    def max_output(self, n_in):
+        return int(np.ceil((n_in + 1) * self.rate)) + 1
+
+    def process(self, signal, out=None):
+        signal = np.asarray(signal, dtype=np.complex64)
+        if self.taps is not None:
+            x = np.concatenate((self._history, signal))
+            self._history = x[len(x) - len(self._history):]
+            signal = np.convolve(x, self.taps, mode='valid').astype(np.complex64)
+
+        y = self._farrow.process(signal)
+        if out is None:
+            return y
+        out[:len(y)] = y
+        return out[:len(y)]
+
+
+@lru_cache(maxsize=64)
+def _antialias_taps(ratio, n_taps, kaiser_beta):
+    h = scipy.signal.firwin(n_taps, ratio, window=('kaiser', kaiser_beta)).astype(np.float32)
+    h.flags.writeable = False
+    return h
+
+
+def resampler(fs_in, fs_out, max_factor=512, kaiser_beta=8.0, taps_per_phase=16, n_taps=63):
+    """
+    Streaming resampler from fs_in to fs_out: a PolyphaseResampler if the ratio is a fraction L/M with L, M up to
+    max_factor (e.g. 2.4 Msps -> 2 samples/symbol at 250 ksym/s gives 5/24), else an ArbitraryResampler.
+
+    Which class is chosen depends on the ratio, so the filter options of both are accepted and each is used only
+    where it applies: kaiser_beta by both, taps_per_phase by PolyphaseResampler and n_taps (anti-aliasing filter
+    length when decimating) by ArbitraryResampler.
+    """
+    ratio = Fraction(fs_out / fs_in).limit_denominator(max_factor)
+    if ratio.numerator <= max_factor and abs(float(ratio) - fs_out / fs_in) <= 1e-12 * fs_out / fs_in:
+        return PolyphaseResampler(ratio.numerator, ratio.denominator, taps_per_phase=taps_per_phase,
+                                  kaiser_beta=kaiser_beta)
+    return ArbitraryResampler(fs_out / fs_in, n_taps=n_taps, kaiser_beta=kaiser_beta)
+
+
+### Spectral estimation ###
+
+@lru_cache(maxsize=32)
+def spectral_window(name, n):
+    """Cached, read-only float32 window of length n (any scipy.signal.get_window name; None for rectangular)"""
+    win = np.ones(n) if name is None else scipy.signal.get_window(name, n)
+    win = win.astype(np.float32)
+    win.flags.writeable = False
+    return win
+
+
+class _SegmentedFFT:
+    """Splits a stream into windowed, overlapping nfft-sample segments and returns their power spectra"""
+    def __init__(self, nfft=1024, overlap=0.5, window='hann', Fs=None):
+        if not 0 <= overlap < 1:
+            raise ValueError("overlap must be a fraction in [0, 1)")
+        self.nfft = nfft
+        self.step = nfft - int(round(overlap * nfft))
+        self.window = window
+        self.Fs = Fs
+        self._win = spectral_window(window, nfft)
+        self.reset()
+
+    def reset(self):
+        self._buffer = np.empty(0, dtype=np.complex64)
+
+    @property
+    def freqs(self):
+        return np.fft.fftshift(np.fft.fftfreq(self.nfft, 1 / self.Fs if self.Fs else 1))
+
+    def _power(self, chunk):
+        """Power spectra (n_segments, nfft) of every segment completed by chunk; the remainder is kept"""
+        x = np.concatenate((self._buffer, np.asarray(chunk, dtype=np.complex64)))
+        n_seg = (len(x) - self.nfft) // self.step + 1 if len(x) >= self.nfft else 0
+        self._buffer = x[n_seg * self.step:]
+        if n_seg == 0:
+            return np.empty((0, self.nfft), dtype=np.float32)
+
+        segments = np.lib.stride_tricks.sliding_window_view(x, self.nfft)[::self.step][:n_seg]
+        spectra = scipy.fft.fft(segments * self._win, axis=1, workers=-1)
+        return (spectra.real**2 + spectra.imag**2).astype(np.float32)
+
+
+class WelchPSD(_SegmentedFFT):
+    """
+    Streaming Welch power spectral density estimate: chunks are split into windowed, overlapping segments whose
+    periodograms are averaged. Only the running average is kept, so memory is bounded for any stream length.
+
+    alpha=None averages all segments equally; otherwise each segment is blended in with weight alpha
+    (exponential averaging) so the estimate tracks a changing spectrum.
+    """
+    def __init__(self, nfft=1024, overlap=0.5, window='hann', Fs=None, alpha=None):
+        self.alpha = alpha
+        super().__init__(nfft, overlap, window, Fs)
+
+    def reset(self):
+        super().reset()
+        self._avg = np.zeros(self.nfft, dtype=np.float64)
+        self.n_segments = 0
+
+    def update(self, chunk):
+        power = self._power(chunk)
+        n = len(power)
+        if n == 0:
+            return self
+        if self.alpha is None:
+            self._avg += (power.sum(axis=0) - n * self._avg) / (self.n_segments + n)
+        else:
+            # Closed form of sequential updates avg = (1-alpha)*avg + alpha*p, starting from the first segment
+            spectra = power
+            if self.n_segments == 0:
+                self._avg = spectra[0].astype(np.float64)
+                spectra = spectra[1:]
+            m = len(spectra)
+            weights = self.alpha * (1 - self.alpha) ** np.arange(m - 1, -1, -1)
+            self._avg = (1 - self.alpha) ** m * self._avg + weights @ spectra
+        self.n_segments += n
+        return self
+
+    process = update
+
+    @property
+    def psd(self):
+        """Two-sided PSD (fftshifted, matching freqs), in power per Hz if Fs is set, else per cycle/sample"""
+        scale = 1 / ((self.Fs or 1) * np.sum(self._win.astype(np.float64)**2))
+        return np.fft.fftshift(self._avg * scale)
+
+
+class Waterfall(_SegmentedFFT):
+    """
+    Streaming spectrogram: every n_avg segments are averaged into one PSD row, and the newest depth rows are kept
+    in a fixed ring buffer, so a live or memory-mapped stream can be monitored with bounded memory.
+    """
+    def __init__(self, nfft=1024, depth=256, window='hann', Fs=None, overlap=0.0, n_avg=1):
+        self.depth = depth
+        self.n_avg = n_avg
+        super().__init__(nfft, overlap, window, Fs)
+
+    def reset(self):
+        super().reset()
+        self._rows = np.zeros((self.depth, self.nfft), dtype=np.float32)
+        self._pending = np.empty((0, self.nfft), dtype=np.float32)
+        self.n_rows = 0
+
+    def update(self, chunk):
+        power = self._power(chunk)
+        if len(self._pending):
+            power = np.concatenate((self._pending, power))
+        n_new = len(power) // self.n_avg
+        self._pending = power[n_new * self.n_avg:]
+        if n_new == 0:
+            return self
+
+        scale = 1 / ((self.Fs or 1) * np.sum(self._win.astype(np.float64)**2))
+        rows = power[:n_new * self.n_avg].reshape(n_new, self.n_avg, self.nfft).mean(axis=1) * scale
+        rows = np.fft.fftshift(rows, axes=1)[-self.depth:]
+        idx = (self.n_rows + np.arange(n_new)[-len(rows):]) % self.depth
+        self._rows[idx] = rows
+        self.n_rows += n_new
+        return self
+
+    process = update
+
+    @property
+    def history(self):
+        """Stored PSD rows, oldest first, shape (min(n_rows, depth), nfft)"""
+        if self.n_rows < self.depth:
+            return self._rows[:self.n_rows]
+        return np.roll(self._rows, -(self.n_rows % self.depth), axis=0)
+
+    @property
+    def row_duration(self):
+        """Time covered by one row, in seconds if Fs is set, else samples"""
+        return self.n_avg * self.step / (self.Fs or 1)
@@ -1,9 +1,11 @@
 
 from dataclasses import dataclass
+from functools import lru_cache
 import numpy as np
-from scipy import signal
+import scipy
 
 from .channel import apply_cfo
+from .coding import PRIMITIVE_POLYNOMIALS, lfsr_sequence
 
 
 ### PREAMBLES ###
@@ -27,9 +29,47 @@ def zadoff_chu(N: int, q: int=1):
     return np.exp(-j*np.pi*q*n*(n+1)/N)
 
 
-def pn(N: int):
-    """Generate a Pseudo-random Number (PN) sequence of length N"""
-    return np.random.randint(2, size=N)
+def pn(N: int, poly: int=None, seed: int=1):
+    """
+    Generate a Pseudo-random Number (PN) sequence of length N from a maximal-length sequence
+
+    If poly is None, the primitive polynomial of the smallest degree whose period covers N is used.
+    """
+    if poly is None:
+        degree = max(3, int(np.ceil(np.log2(N + 1))))
+        poly = PRIMITIVE_POLYNOMIALS[degree]
+    return np.array(lfsr_sequence(poly, seed, N), dtype=int)
+
+
+def mseq(poly: int, seed: int=1):
+    """
+    One period (2^degree - 1 bits) of the maximal-length sequence of a primitive polynomial, as read-only uint8 bits.
+    Sequences are cached by polynomial and seed.
+    """
+    return lfsr_sequence(poly, seed)
+
+
+# Preferred pairs of primitive polynomials for Gold codes, by degree
+GOLD_PREFERRED_PAIRS = {
+    5: (0o45, 0o75),
+    6: (0o103, 0o147),
+    7: (0o211, 0o217),
+    9: (0o1021, 0o1131),
+    10: (0o2011, 0o2415),
+    11: (0o4005, 0o4445),
+}
+
+
+@lru_cache(maxsize=256)
+def gold(degree: int, shift: int=0, seed: int=1):
+    """
+    Gold code of length 2^degree - 1: the XOR of a preferred pair of m-sequences, the second cyclically shifted by
+    shift. Shifts 0..2^degree-2 give distinct codes with bounded three-valued cross-correlation.
+    """
+    poly1, poly2 = GOLD_PREFERRED_PAIRS[degree]
+    code = mseq(poly1, seed) ^ np.roll(mseq(poly2, seed), -shift)
+    code.flags.writeable = False
+    return code
 
 
 def to_frames(preamble: np.ndarray, payload: np.ndarray, n: int):
@@ -62,17 +102,21 @@ class FrameDetector:
         self.expected_frame_length = expected_frame_length
         self.preamble = preamble
 
-        self._state = "SEARCH"
-        self.buffer = np.empty(0, dtype=np.complex64)
+        self.reset()
 
         self.debug = None
+
+    def reset(self):
+        """Clear the buffer and any partially received frame"""
+        self._state = "SEARCH"
+        self._pending = None
+        self.buffer = np.empty(0, dtype=np.complex64)
         
 
     def process(self, new_samples: np.ndarray):
-        """Update the buffer and check if there are any frames detected"""
+        """Update the buffer and return the frames completed so far"""
         self.buffer = np.concatenate((self.buffer, new_samples))
         results = []
-        idx = 0
 
         while True:
             # Pause state machine when buffer can't hold a frame
@@ -83,7 +127,8 @@ class FrameDetector:
             if self._state == "SEARCH":
                 res = self._detect_preamble()
                 if res is not None:
-                    results.append(res)
+                    # Hold the detection until its frame is complete, which may take more calls
+                    self._pending = res
                     self.buffer = self.buffer[res.idx:]
                     self._state = "ACQUIRE"
                     continue
@@ -93,9 +138,9 @@ class FrameDetector:
 
             # ACQUIRE state: Add result to list of results
             if self._state == "ACQUIRE":
-                frame = np.array(self.buffer[:self.expected_frame_length])
-                results[idx].frame = frame
-                idx += 1
+                self._pending.frame = np.array(self.buffer[:self.expected_frame_length])
+                results.append(self._pending)
+                self._pending = None
 
                 self.buffer = self.buffer[self.expected_frame_length:]
                 self._state = "SEARCH"
@@ -149,10 +194,10 @@ class CorrelationFrameDetector(FrameDetector):
 
     def _detect_preamble(self):
         """Apply matched filter to signal and report the index of the first spike"""
-        matched = signal.convolve(self._matched_filter, self.buffer, mode='valid')
+        matched = scipy.signal.convolve(self._matched_filter, self.buffer, mode='valid')
 
         # Compute energy of sliding window for normalization
-        window_norm = signal.convolve(np.ones_like(self._matched_filter), np.abs(self.buffer)**2, mode='valid')
+        window_norm = scipy.signal.convolve(np.ones_like(self._matched_filter), np.abs(self.buffer)**2, mode='valid')
         normalization = (self._preamble_norm * window_norm).astype(np.float32)
 
         # Avoid division by zero
@@ -206,10 +251,10 @@ class DifferentialCorrelationFrameDetector(FrameDetector):
     def _detect_preamble(self):
         """Apply matched filter to signal and report the index of the first spike"""
         dbuffer = self.buffer[1:] - self.buffer[:-1]
-        matched = signal.convolve(self._matched_filter, dbuffer, mode='valid')
+        matched = scipy.signal.convolve(self._matched_filter, dbuffer, mode='valid')
 
         # Compute energy of sliding window for normalization
-        window_norm = signal.convolve(np.ones_like(self._matched_filter), np.abs(dbuffer)**2, mode='valid')
+        window_norm = scipy.signal.convolve(np.ones_like(self._matched_filter), np.abs(dbuffer)**2, mode='valid')
         normalization = (self._preamble_norm * window_norm).astype(np.float32)
 
         # Avoid division by zero
@@ -283,7 +328,10 @@ class AcquisitionFrameDetector(FrameDetector):
         results = []
         metrics = []
         for i, det in enumerate(self._corr_detectors):
-            res = det.process(self.buffer)[0]
+            # Only the detection step of each sub-detector is used; its own buffering and state machine are not
+            det.buffer = self.buffer
+            res = det._detect_preamble()
+            det.reset()
             if res is not None:
                 res.cfo = self.cfo_vector[i]
                 results.append(res)
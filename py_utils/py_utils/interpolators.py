@@ -1,6 +1,7 @@
 
 from collections import deque
 import numpy as np
+from numba import njit
 
 
 # Simple linear interpolator class
@@ -20,6 +21,22 @@ class LinearInterpolator:
         x0, x1 = self.buffer[0], self.buffer[1]
         return (1 - mu)*x0 + mu*x1
 
+@njit(cache=True)
+def cubic_farrow_weights(d):
+    """
+    FIR weights of the cubic Lagrange (Farrow) interpolator for a fractional position d.
+    Weights apply to four samples ordered [oldest -> newest]. d=0 returns the second oldest sample
+    and d=1 returns the second newest, matching CubicFarrowInterpolator.interpolate(d).
+    """
+    d2 = d * d
+    d3 = d2 * d
+    h0 = -d/3 + d2/2 - d3/6
+    h1 = 1 - d/2 - d2 + d3/2
+    h2 = d + d2/2 - d3/2
+    h3 = -d/6 + d3/6
+    return h0, h1, h2, h3
+
+
 class CubicFarrowInterpolator:
     """
     Cubic Lagrange interpolator using Farrow structure.
@@ -86,3 +103,85 @@ class CubicFarrowInterpolator:
         last_val = samples[-1] if len(samples) > 0 else 0.0j
         padded = np.concatenate([samples, np.full(2, last_val, dtype=samples.dtype)])
         return self.process_batch(padded, mu, integer_offset)[2:]
+
+
+
+@njit(nogil=True, cache=True)
+def farrow_resample(signal, out, history, mu, step):
+    """
+    Resample signal with the cubic Farrow interpolator, writing outputs to out.
+
+    step[i] is the output sample spacing (in input samples) while between input samples i-1 and i, so a
+    time-varying rate can be given per input sample. history holds the last three input samples of the previous
+    call and is updated in place. Returns the number of outputs written and the fractional position carried into
+    the next call.
+    """
+    s0, s1, s2 = history[0], history[1], history[2]
+    n_out = 0
+
+    for i in range(len(signal)):
+        s3 = signal[i]
+
+        # Interpolate between s1 and s2 for every output instant that falls in this input interval
+        while mu < 1.0:
+            if n_out >= len(out):
+                raise ValueError("Output buffer too small for resampled signal.")
+            h0, h1, h2, h3 = cubic_farrow_weights(mu)
+            out[n_out] = h0*s0 + h1*s1 + h2*s2 + h3*s3
+            n_out += 1
+            mu += step[i]
+
+        mu -= 1.0
+        s0, s1, s2 = s1, s2, s3
+
+    history[0], history[1], history[2] = s0, s1, s2
+    return n_out, mu
+
+
+def _check_ratio(ratio):
+    # Written as "not all > 0" so NaN is rejected too
+    if not np.all(np.asarray(ratio, dtype=np.float64) > 0):
+        raise ValueError("Resampling ratio must be positive.")
+
+
+class FarrowResampler:
+    """
+    Streaming arbitrary-ratio resampler built on the cubic Farrow interpolator.
+
+    ratio is the output rate divided by the input rate. It may be changed between calls, or given per input
+    sample to process() for a time-varying rate. Interpolator history and fractional phase are carried between
+    calls. Introduces a fixed latency of two input samples. No anti-aliasing filter is applied.
+    """
+    def __init__(self, ratio=1.0, mu=0.0):
+        self.ratio = ratio
+        self._mu_init = mu
+        self.reset()
+
+    @property
+    def ratio(self):
+        return self._ratio
+
+    @ratio.setter
+    def ratio(self, value):
+        _check_ratio(value)
+        self._ratio = value
+
+    def reset(self):
+        """Clear interpolator history and reset the fractional phase"""
+        self.mu = self._mu_init
+        self._history = np.zeros(3, dtype=np.complex64)
+
+    def process(self, signal, ratio=None):
+        """Resample a chunk of samples. ratio overrides self.ratio and may be a scalar or one value per sample."""
+        signal = np.asarray(signal, dtype=np.complex64)
+        ratio = self.ratio if ratio is None else ratio
+        _check_ratio(ratio)
+
+        step = 1.0 / np.broadcast_to(np.asarray(ratio, dtype=np.float64), signal.shape)
+
+        # Upper bound on outputs: every interval produces at most ceil(1/min_step) samples
+        max_out = int(np.ceil((len(signal) + 1) / step.min())) + 1 if len(signal) > 0 else 0
+        out = np.empty(max_out, dtype=np.complex64)
+        n_out, self.mu = farrow_resample(signal, out, self._history, self.mu, step)
+
+        return out[:n_out]
@@ -0,0 +1,131 @@
+"""
+Ahead-of-time warm-up of the numba kernels.
+
+Every @njit kernel is compiled with cache=True, so its machine code is stored next to the source (or in
+NUMBA_CACHE_DIR) and later processes load it from disk instead of compiling. warmup() runs each kernel once on a
+tiny input with the dtypes used in practice, which fills that cache:
+
+    python -m py_utils.jit_cache
+
+Calling warmup() in a parent process before forking workers (as sweep.iter_sweep() does) also saves them the
+one-time numba start-up of loading the cache.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+
+### Warm-up definitions ###
+# Each function exercises the compiled kernels of one submodule through its public API.
+
+def _signal(n=64):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(n) + 1j*rng.standard_normal(n)).astype(np.complex64)
+
+
+def _carrier_recovery():
+    from .carrier_recovery import CostasLoopQPSK, costas_loop
+    from .control import PIDFeedback
+    x = _signal()
+    CostasLoopQPSK(1/20, backend='python').process(x, np.empty_like(x))
+    costas_loop(x, PIDFeedback(0.04, 0.03))
+
+
+def _channel():
+    from .channel import ChannelSimulator
+    ChannelSimulator(snr_db=20, pct_offset=0.01, mu=0.3, signal_power=1.0, seed=0).process(_signal())
+
+
+def _coding():
+    from .coding import (CRC, PRIMITIVE_POLYNOMIALS, AdditiveScrambler, ViterbiDecoder, conv_encode,
+                         diff_decode_psk_symbols, diff_encode_psk_symbols)
+    x = _signal()
+    diff_decode_psk_symbols(diff_encode_psk_symbols(x))
+    bits = np.random.default_rng(0).integers(0, 2, 64).astype(np.uint8)
+    coded = conv_encode(bits)
+    ViterbiDecoder().process(1 - 2*coded.astype(np.float32))
+    ViterbiDecoder(soft=False).process(coded)
+    data = np.packbits(bits)
+    CRC('crc32').update(data)
+    CRC('crc16-ccitt').update(data)
+    AdditiveScrambler(PRIMITIVE_POLYNOMIALS[7]).process(data)
+
+
+def _dsp():
+    from .dsp import ArbitraryResampler, IQIngestFilter, PolyphaseResampler
+    x = _signal()
+    IQIngestFilter().process(np.zeros(128, dtype=np.int16))
+    PolyphaseResampler(3, 2).process(x)
+    ArbitraryResampler(0.9).process(x)
+
+
+def _interpolators():
+    from .interpolators import FarrowResampler
+    FarrowResampler(1.0001).process(_signal())
+
+
+def _metrics():
+    from .metrics import evm, snr_data_aided, snr_m2m4
+    x = _signal()
+    evm(x, x)
+    snr_data_aided(x, x)
+    snr_m2m4(x)
+
+
+def _modulation():
+    from .modulation import demodulate, demodulate_soft
+    x = _signal()
+    demodulate(x, 'qpsk')
+    demodulate(x, '8psk')
+    demodulate_soft(x, '16qam')
+    demodulate_soft(x, '8psk')
+
+
+def _timing_recovery():
+    from .timing_recovery import GardnerSymbolTimingCorrector
+    GardnerSymbolTimingCorrector().process(_signal())
+
+
+WARMUPS = {
+    'carrier_recovery': _carrier_recovery,
+    'channel': _channel,
+    'coding': _coding,
+    'dsp': _dsp,
+    'interpolators': _interpolators,
+    'metrics': _metrics,
+    'modulation': _modulation,
+    'timing_recovery': _timing_recovery,
+}
+
+
+def warmup(modules=None, verbose=False):
+    """
+    Compile (or load from the on-disk cache) the numba kernels of the given submodules (default: all of WARMUPS).
+    Returns a dict of the seconds spent per submodule.
+    """
+    modules = WARMUPS if modules is None else modules
+    unknown = set(modules) - set(WARMUPS)
+    if unknown:
+        raise ValueError(f"No warm-up for {', '.join(sorted(unknown))}; choose from {', '.join(WARMUPS)}")
+
+    timings = {}
+    for name in modules:
+        start = time.perf_counter()
+        WARMUPS[name]()
+        timings[name] = time.perf_counter() - start
+        if verbose:
+            print(f"{name:<20} {timings[name]*1e3:10.1f} ms")
+    return timings
+
+
+def main(argv=None):
+    modules = (sys.argv[1:] if argv is None else argv) or None
+    timings = warmup(modules, verbose=True)
+    print(f"{'total':<20} {sum(timings.values())*1e3:10.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,9 @@
 
+from statistics import NormalDist
 import numpy as np
+from numba import njit
+
+from .modulation import get_constellation
 
 ### Metrics ###
 
@@ -9,4 +13,258 @@ def compute_er(tx, rx):
     
     n_err = np.sum(tx != rx)
     er = n_err / tx.size
-    return er, n_err
\ No newline at end of file
+    return er, n_err
+
+### Streaming error rate ###
+
+# Number of set bits in every byte value
+_POPCOUNT = np.array([bin(v).count('1') for v in range(256)], dtype=np.uint8)
+
+
+class ErrorRateCounter:
+    """
+    Streaming bit error rate accumulator with a Wilson score confidence interval and early-stop criteria.
+
+    Chunks are compared as packed bytes (np.packbits order) by XOR and a popcount table, or as unpacked bits with
+    packed=False. The run is considered done once any configured stop criterion is met.
+
+    Parameters
+    ----------
+    min_errors : int, optional
+        Stop once this many errors have been counted.
+    max_rel_width : float, optional
+        Stop once the confidence interval width relative to the BER falls below this value (requires errors).
+    max_bits : int, optional
+        Stop once this many bits have been compared.
+    confidence : float, optional
+        Confidence level of the interval. Default is 0.95.
+    """
+    def __init__(self, min_errors=None, max_rel_width=None, max_bits=None, confidence=0.95):
+        self.min_errors = min_errors
+        self.max_rel_width = max_rel_width
+        self.max_bits = max_bits
+        self.confidence = confidence
+        self._z = NormalDist().inv_cdf(0.5 + confidence/2)
+        self.reset()
+
+    def reset(self):
+        self.n_err = 0
+        self.n_bits = 0
+
+    def update(self, tx, rx, n_bits=None, packed=True):
+        """
+        Accumulate errors between a chunk of transmitted and received bits.
+        n_bits limits the comparison to the first n_bits bits, e.g. to ignore padding in the last packed byte.
+        """
+        tx = np.asarray(tx).ravel()
+        rx = np.asarray(rx).ravel()
+        if tx.size != rx.size:
+            raise ValueError("tx and rx must be the same size.")
+        if not packed:
+            n_bits = tx.size if n_bits is None else min(n_bits, tx.size)
+            tx = np.packbits(tx.astype(np.uint8, copy=False))
+            rx = np.packbits(rx.astype(np.uint8, copy=False))
+
+        diff = np.bitwise_xor(tx.astype(np.uint8, copy=False), rx.astype(np.uint8, copy=False))
+        total_bits = diff.size * 8
+        if n_bits is not None and n_bits < total_bits:
+            # Mask off bits beyond n_bits (MSB first within a byte)
+            diff = diff[:(n_bits + 7) // 8]
+            if n_bits % 8:
+                diff[-1] &= np.uint8((0xFF << (8 - n_bits % 8)) & 0xFF)
+            total_bits = n_bits
+
+        self.n_err += int(_POPCOUNT[diff].sum(dtype=np.int64))
+        self.n_bits += total_bits
+        return self
+
+    @property
+    def ber(self):
+        return self.n_err / self.n_bits if self.n_bits else float('nan')
+
+    @property
+    def interval(self):
+        """Wilson score confidence interval (low, high) of the BER"""
+        if self.n_bits == 0:
+            return 0.0, 1.0
+        n, z = self.n_bits, self._z
+        p = self.n_err / n
+        center = (p + z*z/(2*n)) / (1 + z*z/n)
+        half = z * np.sqrt(p*(1 - p)/n + z*z/(4*n*n)) / (1 + z*z/n)
+        return max(0.0, center - half), min(1.0, center + half)
+
+    @property
+    def done(self):
+        """True once any of the stop criteria is met"""
+        if self.min_errors is not None and self.n_err >= self.min_errors:
+            return True
+        if self.max_bits is not None and self.n_bits >= self.max_bits:
+            return True
+        if self.max_rel_width is not None and self.n_err > 0:
+            low, high = self.interval
+            return (high - low) / self.ber <= self.max_rel_width
+        return False
+
+    def __repr__(self):
+        low, high = self.interval
+        return f"ErrorRateCounter(ber={self.ber:.3e}, n_err={self.n_err}, n_bits={self.n_bits}, " \
+               f"ci=({low:.3e}, {high:.3e}))"
+
+
+### Signal quality ###
+
+@njit(cache=True)
+def _power_moments(symbols):
+    """Sum of |x|^2 and |x|^4 in one pass"""
+    m2 = 0.0
+    m4 = 0.0
+    for x in symbols:
+        p = x.real*x.real + x.imag*x.imag
+        m2 += p
+        m4 += p*p
+    return m2, m4
+
+
+@njit(cache=True)
+def _error_moments(rx, ref):
+    """Sums of |ref|^2, |rx - ref|^2, |rx|^2 and rx*conj(ref) in one pass"""
+    p_ref = 0.0
+    p_err = 0.0
+    p_rx = 0.0
+    corr = 0j
+    for n in range(len(rx)):
+        e = rx[n] - ref[n]
+        p_ref += ref[n].real*ref[n].real + ref[n].imag*ref[n].imag
+        p_err += e.real*e.real + e.imag*e.imag
+        p_rx += rx[n].real*rx[n].real + rx[n].imag*rx[n].imag
+        corr += rx[n] * np.conj(ref[n])
+    return p_ref, p_err, p_rx, corr
+
+
+def _as_symbols(x):
+    return np.ascontiguousarray(x, dtype=np.complex64).ravel()
+
+
+def _to_db(x):
+    return 10*np.log10(x) if x > 0 else (np.inf if x == 0 else np.nan)
+
+
+def constellation_kurtosis(scheme):
+    """Kurtosis E|a|^4 / (E|a|^2)^2 of a constellation (1 for PSK), as needed by snr_m2m4()"""
+    points = get_constellation(scheme).points.astype(np.complex128)
+    p = np.abs(points)**2
+    return np.mean(p**2) / np.mean(p)**2
+
+
+def evm(rx, ref):
+    """RMS error vector magnitude of rx relative to reference symbols ref, in percent"""
+    p_ref, p_err, _, _ = _error_moments(_as_symbols(rx), _as_symbols(ref))
+    return 100*np.sqrt(p_err / p_ref)
+
+
+def mer_db(rx, ref):
+    """Modulation error ratio of rx relative to reference symbols ref, in dB"""
+    p_ref, p_err, _, _ = _error_moments(_as_symbols(rx), _as_symbols(ref))
+    return _to_db(p_ref / p_err) if p_err > 0 else np.inf
+
+
+def _snr_data_aided(p_ref, p_rx, corr):
+    # ML complex gain estimate g = <rx, ref> / <ref, ref>; residual |rx - g*ref|^2 is the noise energy
+    signal = abs(corr)**2 / p_ref
+    noise = p_rx - signal
+    return _to_db(signal / noise) if noise > 0 else np.inf
+
+
+def snr_data_aided(rx, ref):
+    """Data-aided SNR estimate in dB, after removing the best-fit complex gain between ref and rx"""
+    p_ref, _, p_rx, corr = _error_moments(_as_symbols(rx), _as_symbols(ref))
+    return _snr_data_aided(p_ref, p_rx, corr)
+
+
+def _snr_m2m4(m2, m4, kurtosis):
+    # M4 = k_a*S^2 + 4*S*N + 2*N^2 with M2 = S + N, for complex Gaussian noise (kurtosis 2)
+    s2 = (2*m2*m2 - m4) / (2 - kurtosis)
+    if s2 <= 0:
+        return -np.inf
+    S = np.sqrt(s2)
+    N = m2 - S
+    return _to_db(S / N) if N > 0 else np.inf
+
+
+def snr_m2m4(rx, kurtosis=1.0):
+    """
+    Blind second/fourth-order moment (M2M4) SNR estimate in dB. kurtosis is that of the constellation, see
+    constellation_kurtosis(); 1 for PSK.
+
+    See:
+        D. R. Pauluzzi and N. C. Beaulieu, “A comparison of SNR estimation techniques for the AWGN channel,”
+        IEEE Transactions on Communications, vol. 48, no. 10, pp. 1681-1691, 2000, doi: 10.1109/26.871393.
+    """
+    symbols = _as_symbols(rx)
+    m2, m4 = _power_moments(symbols)
+    return _snr_m2m4(m2 / len(symbols), m4 / len(symbols), kurtosis)
+
+
+class SymbolQualityMonitor:
+    """
+    Streaming EVM / MER / SNR accumulator for symbol-rate signals.
+
+    Each update() accumulates moments in one pass over a complex64 block. If reference symbols are given, EVM and
+    MER are data-aided and a data-aided SNR is available. Otherwise, if scheme is set, the nearest constellation
+    point is used as the reference (decision-directed). The blind M2M4 SNR is always available.
+    """
+    def __init__(self, scheme=None):
+        self.constellation = get_constellation(scheme) if scheme is not None else None
+        self.kurtosis = constellation_kurtosis(self.constellation) if self.constellation is not None else 1.0
+        self.reset()
+
+    def reset(self):
+        self.n_symbols = 0
+        self._m2 = 0.0
+        self._m4 = 0.0
+        self._n_ref = 0
+        self._p_ref = 0.0
+        self._p_err = 0.0
+        self._p_rx = 0.0
+        self._corr = 0j
+
+    def update(self, symbols, ref=None):
+        symbols = _as_symbols(symbols)
+        m2, m4 = _power_moments(symbols)
+        self._m2 += m2
+        self._m4 += m4
+        self.n_symbols += len(symbols)
+
+        if ref is None and self.constellation is not None:
+            ref = self.constellation.points[self.constellation.decide(symbols)]
+        if ref is not None:
+            p_ref, p_err, p_rx, corr = _error_moments(symbols, _as_symbols(ref))
+            self._n_ref += len(symbols)
+            self._p_ref += p_ref
+            self._p_err += p_err
+            self._p_rx += p_rx
+            self._corr += corr
+        return self
+
+    @property
+    def evm(self):
+        """RMS EVM in percent"""
+        return 100*np.sqrt(self._p_err / self._p_ref) if self._p_ref > 0 else np.nan
+
+    @property
+    def mer_db(self):
+        if self._p_ref == 0:
+            return np.nan
+        return _to_db(self._p_ref / self._p_err) if self._p_err > 0 else np.inf
+
+    @property
+    def snr_db(self):
+        """Data-aided (or decision-directed) SNR in dB"""
+        return _snr_data_aided(self._p_ref, self._p_rx, self._corr) if self._p_ref > 0 else np.nan
+
+    @property
+    def snr_m2m4_db(self):
+        """Blind M2M4 SNR in dB"""
+        if self.n_symbols == 0:
+            return np.nan
+        return _snr_m2m4(self._m2 / self.n_symbols, self._m4 / self.n_symbols, self.kurtosis)
@@ -1,8 +1,10 @@
 
 import numpy as np
+from numba import njit
+from .backend import native
 
 
-def modulate_qpsk(bits):
+def modulate_qpsk(bits, backend=None):
     """
     Gray code mapping:
     [0, 0]: +1 +1j
@@ -10,6 +12,9 @@ def modulate_qpsk(bits):
     [1, 1]: -1 -1j
     [1, 0]: -1 +1j
     """
+    impl = native('modulate_qpsk', backend)
+    if impl is not None:
+        return impl(bits)
 
     # Ensure input is a flat array of bits of even length
     bits = np.asarray(bits).ravel()
@@ -24,7 +29,7 @@ def modulate_qpsk(bits):
     return symbols
 
 
-def demodulate_qpsk(symbols):
+def demodulate_qpsk(symbols, backend=None):
     """
     Gray code demapping:
     +1 +1j: [0, 0]
@@ -32,6 +37,9 @@ def demodulate_qpsk(symbols):
     -1 -1j: [1, 1]
     -1 +1j: [1, 0]
     """
+    impl = native('demodulate_qpsk', backend)
+    if impl is not None:
+        return impl(symbols)
 
     # De-map each symbol, making optimum decision given AWGN
     bits = np.zeros(shape=(len(symbols), 2), dtype=np.uint8)
@@ -43,4 +51,290 @@ def demodulate_qpsk(symbols):
 
 
 def optimum_decider_qpsk(symbols):
-    return np.sign(symbols.real) + 1j*np.sign(symbols.imag)
\ No newline at end of file
+    return np.sign(symbols.real) + 1j*np.sign(symbols.imag)
+
+
+### Generic constellations ###
+
+def _gray(n):
+    return n ^ (n >> 1)
+
+
+@njit(cache=True)
+def _decide_qam(symbols, levels_per_axis, scale, decision_labels, labels):
+    # Quantize each axis independently to its nearest level (level 0 is the most positive)
+    L = levels_per_axis
+    for n in range(len(symbols)):
+        i_level = int(np.floor((L - symbols[n].real / scale) / 2))
+        q_level = int(np.floor((L - symbols[n].imag / scale) / 2))
+        i_level = min(max(i_level, 0), L - 1)
+        q_level = min(max(q_level, 0), L - 1)
+        labels[n] = decision_labels[i_level * L + q_level]
+
+
+@njit(cache=True)
+def _decide_psk(symbols, order, decision_labels, labels):
+    # Quantize the phase to the nearest of the order positions around the circle
+    k = order / (2*np.pi)
+    for n in range(len(symbols)):
+        position = int(np.floor(np.arctan2(symbols[n].imag, symbols[n].real) * k + 0.5)) % order
+        labels[n] = decision_labels[position]
+
+
+@njit(cache=True)
+def _llr_qam_maxlog(symbols, amplitudes, level_labels, scale, llr_gain, llrs):
+    # Max-log separates over the I and Q axes of square QAM, so each axis is a Gray-coded PAM: for every bit, find
+    # the nearest level with the bit 0 and with the bit 1 (distances in units of scale)
+    L = len(amplitudes)
+    m = int(np.log2(L))
+    k = 2*m
+    dist = np.empty(L, dtype=np.float32)
+    for n in range(len(symbols)):
+        for axis in range(2):
+            u = symbols[n].real / scale if axis == 0 else symbols[n].imag / scale
+            for l in range(L):
+                dist[l] = (u - amplitudes[l])**2
+            for j in range(m):
+                mask = 1 << (m - 1 - j)
+                d0 = np.float32(np.inf)
+                d1 = np.float32(np.inf)
+                for l in range(L):
+                    if level_labels[l] & mask:
+                        d1 = min(d1, dist[l])
+                    else:
+                        d0 = min(d0, dist[l])
+                llrs[n*k + axis*m + j] = llr_gain * (d1 - d0)
+
+
+@njit(cache=True)
+def _llr_exhaustive(symbols, points, bits_per_symbol, noise_var, exact, llrs):
+    # Compare the received symbol against every constellation point, one bit at a time
+    k = bits_per_symbol
+    M = len(points)
+    metrics = np.empty(M, dtype=np.float32)
+    for n in range(len(symbols)):
+        for p in range(M):
+            d = symbols[n] - points[p]
+            metrics[p] = -(d.real*d.real + d.imag*d.imag) / noise_var
+
+        for b in range(k):
+            mask = 1 << (k - 1 - b)
+            max0 = -np.inf
+            max1 = -np.inf
+            for p in range(M):
+                if p & mask:
+                    max1 = max(max1, metrics[p])
+                else:
+                    max0 = max(max0, metrics[p])
+
+            if exact:
+                # log-sum-exp around the maxima for numerical stability
+                sum0 = 0.0
+                sum1 = 0.0
+                for p in range(M):
+                    if p & mask:
+                        sum1 += np.exp(metrics[p] - max1)
+                    else:
+                        sum0 += np.exp(metrics[p] - max0)
+                llrs[n*k + b] = (max0 + np.log(sum0)) - (max1 + np.log(sum1))
+            else:
+                llrs[n*k + b] = max0 - max1
+
+
+class Constellation:
+    """
+    Gray-coded M-PSK or square M-QAM constellation with lookup-table mapping and demapping.
+
+    Bits are handled packed, as produced by np.packbits (MSB first). Each symbol carries bits_per_symbol bits,
+    the first bit in the MSB of its label, and points[label] is its complex64 constellation point. Points are
+    normalized to unit average energy.
+
+    QAM labels split into an in-phase half and a quadrature half, each Gray-coded along its axis with bit value
+    0 on the positive side, so 'qpsk' matches modulate_qpsk(). PSK labels are Gray-coded around the circle,
+    starting at angle 0.
+    """
+    def __init__(self, name, kind, bits_per_symbol):
+        if kind not in ('psk', 'qam'):
+            raise ValueError("Constellation kind must either be 'psk' or 'qam'")
+        if kind == 'qam' and bits_per_symbol % 2 != 0:
+            raise ValueError("Square QAM requires an even number of bits per symbol.")
+
+        self.name = name
+        self.kind = kind
+        self.bits_per_symbol = bits_per_symbol
+        self.order = 2**bits_per_symbol
+
+        k = bits_per_symbol
+        positions = np.arange(self.order)
+        if kind == 'psk':
+            # Position p around the circle carries label gray(p)
+            self._decision_labels = _gray(positions).astype(np.uint16)
+            self.points = np.empty(self.order, dtype=np.complex64)
+            self.points[self._decision_labels] = np.exp(2j*np.pi*positions/self.order)
+        else:
+            # Level l along each axis (l=0 most positive) carries axis label gray(l)
+            self.levels_per_axis = 2**(k // 2)
+            L = self.levels_per_axis
+            self.scale = np.sqrt(3 / (2*(self.order - 1)))
+            level_label = _gray(np.arange(L))
+            amplitude = np.empty(L)
+            amplitude[level_label] = (L - 1) - 2*np.arange(L)
+            # Per-axis levels (level l, l=0 most positive) for the max-log demapper
+            self._axis_amplitudes = ((L - 1) - 2*np.arange(L)).astype(np.float32)
+            self._axis_labels = level_label.astype(np.int64)
+
+            labels = np.arange(self.order)
+            i_label, q_label = labels >> (k // 2), labels & (L - 1)
+            self.points = (self.scale * (amplitude[i_label] + 1j*amplitude[q_label])).astype(np.complex64)
+
+            # Decision index (i_level * L + q_level) -> label
+            decision_labels = (level_label[:, None] << (k // 2)) | level_label[None, :]
+            self._decision_labels = decision_labels.ravel().astype(np.uint16)
+
+        # Symbols are packed in groups of whole bytes: lcm(8, k) bits per group
+        self._group_bits = np.lcm(8, k)
+        self._group_bytes = self._group_bits // 8
+        self._group_symbols = self._group_bits // k
+        self._shifts = (k * np.arange(self._group_symbols)[::-1]).astype(np.uint32)
+        self._byte_shifts = (8 * np.arange(self._group_bytes)[::-1]).astype(np.uint32)
+
+        # For k dividing 8, one table lookup maps a byte straight to its symbols
+        if self._group_bytes == 1:
+            byte_labels = (np.arange(256)[:, None] >> self._shifts) & (self.order - 1)
+            self._byte_lut = self.points[byte_labels]
+
+    def __repr__(self):
+        return f"Constellation('{self.name}', kind='{self.kind}', bits_per_symbol={self.bits_per_symbol})"
+
+    def labels_to_bytes(self, labels):
+        """Pack symbol labels into bytes, padding the last group with zero bits"""
+        labels = np.asarray(labels, dtype=np.uint32).ravel()
+        pad = (-len(labels)) % self._group_symbols
+        if pad:
+            labels = np.concatenate((labels, np.zeros(pad, dtype=np.uint32)))
+
+        # Bit fields are disjoint, so summing them is equivalent to OR-ing them
+        words = (labels.reshape(-1, self._group_symbols) << self._shifts).sum(axis=1, dtype=np.uint32)
+        return ((words[:, None] >> self._byte_shifts) & 0xFF).astype(np.uint8).ravel()
+
+    def bytes_to_labels(self, data, n_symbols=None):
+        """
+        Unpack bytes into symbol labels. If n_symbols is None, every bit of data is unpacked: when the bit count
+        is not a multiple of bits_per_symbol, the last symbol is padded with zero bits.
+        """
+        data = np.asarray(data, dtype=np.uint8).ravel()
+        if n_symbols is None:
+            n_symbols = -(-len(data) * 8 // self.bits_per_symbol)
+        pad = (-len(data)) % self._group_bytes
+        if pad:
+            data = np.concatenate((data, np.zeros(pad, dtype=np.uint8)))
+
+        words = (data.reshape(-1, self._group_bytes).astype(np.uint32) << self._byte_shifts).sum(axis=1,
+                                                                                                   dtype=np.uint32)
+        labels = (words[:, None] >> self._shifts) & (self.order - 1)
+        return labels.ravel()[:n_symbols]
+
+    def map(self, data, n_symbols=None):
+        """
+        Map packed bits (uint8, np.packbits order) to complex64 symbols.
+        If n_symbols is None, every bit of data is mapped: when the bit count is not a multiple of
+        bits_per_symbol, the last symbol is padded with zero bits (so demapping returns trailing zero padding,
+        never altered data bits).
+        """
+        data = np.asarray(data, dtype=np.uint8).ravel()
+        if self._group_bytes == 1:
+            symbols = self._byte_lut[data].ravel()
+            return symbols if n_symbols is None else symbols[:n_symbols]
+        return self.points[self.bytes_to_labels(data, n_symbols)]
+
+    def decide(self, symbols):
+        """Return the label of the nearest constellation point for each symbol (minimum distance decision)"""
+        symbols = np.ascontiguousarray(symbols, dtype=np.complex64).ravel()
+        labels = np.empty(len(symbols), dtype=np.uint16)
+        if self.kind == 'psk':
+            _decide_psk(symbols, self.order, self._decision_labels, labels)
+        else:
+            _decide_qam(symbols, self.levels_per_axis, np.float32(self.scale), self._decision_labels, labels)
+        return labels
+
+    def demap(self, symbols):
+        """Hard-decision demap symbols to packed bits (uint8, np.packbits order)"""
+        return self.labels_to_bytes(self.decide(symbols))
+
+    def llr(self, symbols, noise_var, mode='maxlog', int8_scale=None):
+        """
+        Soft-decision demap symbols to log-likelihood ratios, log(P(b=0)/P(b=1)), one per bit in label order.
+
+        Parameters
+        ----------
+        symbols : array_like
+            Received complex symbols.
+        noise_var : float
+            Complex noise variance E|n|^2, relative to the unit-energy constellation.
+        mode : {"maxlog", "exact"}, optional
+            "exact" evaluates the log-sum-exp over every constellation point. "maxlog" uses the max-log
+            approximation (nearest point with each bit value), computed per axis for QAM and in closed form for
+            BPSK; it equals the max-log LLR over the full constellation. Default is "maxlog".
+        int8_scale : float, optional
+            If given, LLRs are multiplied by int8_scale, rounded and saturated to int8.
+
+        Returns
+        -------
+        llrs : np.ndarray
+            float32 (or int8) LLRs of length len(symbols)*bits_per_symbol.
+        """
+        if mode not in ('maxlog', 'exact'):
+            raise ValueError("LLR mode must either be 'maxlog' or 'exact'")
+        if noise_var <= 0:
+            raise ValueError("Noise variance must be positive.")
+
+        symbols = np.ascontiguousarray(symbols, dtype=np.complex64).ravel()
+        llrs = np.empty(len(symbols) * self.bits_per_symbol, dtype=np.float32)
+        if mode == 'maxlog' and self.kind == 'qam':
+            llr_gain = np.float32(self.scale**2 / noise_var)
+            _llr_qam_maxlog(symbols, self._axis_amplitudes, self._axis_labels, np.float32(self.scale), llr_gain, llrs)
+        elif mode == 'maxlog' and self.order == 2:
+            np.multiply(symbols.real, np.float32(4 / noise_var), out=llrs)
+        else:
+            _llr_exhaustive(symbols, self.points, self.bits_per_symbol, np.float32(noise_var), mode == 'exact', llrs)
+
+        if int8_scale is not None:
+            return np.clip(np.rint(llrs * np.float32(int8_scale)), -127, 127).astype(np.int8)
+        return llrs
+
+
+CONSTELLATIONS = {
+    'bpsk': Constellation('bpsk', 'psk', 1),
+    'qpsk': Constellation('qpsk', 'qam', 2),
+    '8psk': Constellation('8psk', 'psk', 3),
+    '16qam': Constellation('16qam', 'qam', 4),
+    '64qam': Constellation('64qam', 'qam', 6),
+}
+
+
+def get_constellation(scheme):
+    """Return a Constellation by name (e.g. 'qpsk', '16qam'), or pass a Constellation through"""
+    if isinstance(scheme, Constellation):
+        return scheme
+    try:
+        return CONSTELLATIONS[scheme.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown modulation scheme '{scheme}'. Options: {list(CONSTELLATIONS)}") from None
+
+
+def modulate(data, scheme='qpsk', n_symbols=None):
+    """
+    Map packed bits (uint8, np.packbits order) to complex64 symbols of the given scheme, zero-padding the last
+    symbol if needed. See Constellation.map()
+    """
+    return get_constellation(scheme).map(data, n_symbols)
+
+
+def demodulate(symbols, scheme='qpsk'):
+    """Hard-decision demap symbols of the given scheme to packed bits (uint8, np.packbits order)"""
+    return get_constellation(scheme).demap(symbols)
+
+
+def demodulate_soft(symbols, scheme='qpsk', noise_var=1.0, mode='maxlog', int8_scale=None):
+    """Soft-decision demap symbols of the given scheme to LLRs. See Constellation.llr()"""
+    return get_constellation(scheme).llr(symbols, noise_var, mode, int8_scale)
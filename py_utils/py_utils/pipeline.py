@@ -0,0 +1,353 @@
+import queue
+import threading
+import numpy as np
+from abc import ABC, abstractmethod
+
+from .backend import native
+from .carrier_recovery import CostasLoopQPSK
+from .dsp import rrc
+from .timing_recovery import GardnerSymbolTimingCorrector
+
+
+### Streaming block protocol ###
+
+class Block(ABC):
+    """
+    Streaming block: process(chunk, out=None) consumes a chunk of samples and returns the samples produced so far,
+    carrying state between calls so a stream can be fed in arbitrary chunks.
+
+    rate is the (nominal) number of output samples per input sample and max_output(n) bounds the output of one call
+    with n input samples, so callers can preallocate out. When out is given, outputs are written to its start and
+    a view of the written part is returned.
+    """
+    rate = 1.0
+    dtype = np.complex64
+
+    @abstractmethod
+    def process(self, chunk, out=None):
+        raise NotImplementedError
+
+    def reset(self):
+        pass
+
+    def max_output(self, n_in):
+        return int(np.ceil(n_in * self.rate)) + 1
+
+
+def _write(out, data):
+    """Copy data to the start of out (if given) and return the written view"""
+    if out is None:
+        return data
+    if len(data) > len(out):
+        raise ValueError(f"out holds {len(out)} samples but the block produced {len(data)}")
+    out[:len(data)] = data
+    return out[:len(data)]
+
+
+class FIRFilter(Block):
+    """Streaming FIR filter. Output i is the full convolution output, i.e. delayed by delay samples for symmetric taps."""
+    def __init__(self, taps):
+        self.taps = np.asarray(taps)
+        self.delay = (len(self.taps) - 1) // 2
+        self.dtype = np.result_type(self.taps.dtype, np.complex64)
+        self.reset()
+
+    @classmethod
+    def rrc(cls, n_taps=21, beta=0.35, Ts=2):
+        """Root-raised cosine matched filter, the streaming equivalent of dsp.rrc_filter()"""
+        return cls(rrc(n_taps, beta, Ts))
+
+    def reset(self):
+        self._history = np.zeros(len(self.taps) - 1, dtype=self.dtype)
+
+    def process(self, chunk, out=None):
+        x = np.concatenate((self._history, chunk))
+        self._history = x[len(x) - len(self._history):]
+        return _write(out, np.convolve(x, self.taps, mode='valid'))
+
+    def max_output(self, n_in):
+        return n_in
+
+
+class Map(Block):
+    """Stateless (or self-contained) function of a chunk, e.g. demodulation. reset is called by reset() if given."""
+    def __init__(self, fn, rate=1.0, dtype=np.complex64, reset=None):
+        self.fn = fn
+        self.rate = rate
+        self.dtype = dtype
+        self._reset = reset
+
+    def reset(self):
+        if self._reset is not None:
+            self._reset()
+
+    def process(self, chunk, out=None):
+        return _write(out, self.fn(chunk))
+
+
+class ChannelBlock(Block):
+    """Adapter for channel.ChannelSimulator (or any block with process(signal, out) of equal lengths)"""
+    def __init__(self, channel):
+        self.channel = channel
+
+    def reset(self):
+        self.channel.reset()
+
+    def process(self, chunk, out=None):
+        return self.channel.process(chunk, None if out is None else out[:len(chunk)])
+
+    def max_output(self, n_in):
+        return n_in
+
+
+class TimingRecoveryBlock(Block):
+    """
+    Adapter for GardnerSymbolTimingCorrector (2 samples/symbol in, 1 symbol out).
+
+    Odd chunks are split so the corrector always receives sample pairs. Unless keep_logs is set, the corrector's
+    mu/error logs are cleared after every chunk to keep memory constant. Without stc, the corrector comes from
+    backend (see backend.py); the sdrlib corrector carries odd samples itself and keeps fixed-size histories.
+    """
+    rate = 0.5
+
+    def __init__(self, stc=None, keep_logs=False, backend=None):
+        if stc is None:
+            impl = native('GardnerSymbolTimingCorrector', backend)
+            stc = impl() if impl is not None else GardnerSymbolTimingCorrector()
+        self.stc = stc
+        self.keep_logs = keep_logs
+        self._native = not isinstance(stc, GardnerSymbolTimingCorrector)
+        self._carry = np.empty(0, dtype=np.complex64)
+
+    def reset(self):
+        self.stc.reset()
+        self._carry = np.empty(0, dtype=np.complex64)
+
+    def process(self, chunk, out=None):
+        if self._native:
+            return _write(out, self.stc.process(np.ascontiguousarray(chunk, dtype=np.complex64)))
+
+        if len(self._carry):
+            chunk = np.concatenate((self._carry, chunk))
+        n_even = len(chunk) - len(chunk) % 2
+        self._carry = np.array(chunk[n_even:], dtype=np.complex64)
+
+        symbols = self.stc.process(chunk[:n_even]) if n_even else np.empty(0, dtype=np.complex64)
+        if not self.keep_logs:
+            self.stc.mu_log.clear()
+            self.stc.e_log.clear()
+        return _write(out, symbols)
+
+    def max_output(self, n_in):
+        return (n_in + 1) // 2 + 1
+
+
+class CarrierRecoveryBlock(Block):
+    """Adapter for CostasLoopQPSK"""
+    def __init__(self, costas=None, loop_bw=1/20, backend=None):
+        self.costas = costas if costas is not None else CostasLoopQPSK(loop_bw, backend=backend)
+
+    def reset(self):
+        self.costas.reset()
+
+    def process(self, chunk, out=None):
+        if out is None:
+            out = np.empty(len(chunk), dtype=np.complex64)
+        out = out[:len(chunk)]
+        self.costas.process(chunk, out)
+        return out
+
+    def max_output(self, n_in):
+        return n_in
+
+
+class FrameSyncBlock(Block):
+    """
+    Adapter for framing.FrameDetector subclasses (or their sdrlib ports in py_sdrlib.framing). Outputs the samples
+    of every completed frame back to back (each expected_frame_length long, starting with the preamble); the
+    DetectionResults of the last call are kept in detections.
+    """
+    def __init__(self, detector):
+        self.detector = detector
+        self.detections = []
+
+    def reset(self):
+        self.detector.reset()
+        self.detections = []
+
+    def process(self, chunk, out=None):
+        self.detections = self.detector.process(chunk)
+        frames = [res.frame for res in self.detections]
+        return _write(out, np.concatenate(frames) if frames else np.empty(0, dtype=self.dtype))
+
+    def max_output(self, n_in):
+        # Frames can only be cut from the detector's buffer, which never exceeds one frame plus a preamble
+        return n_in + self.detector.expected_frame_length + len(self.detector.preamble)
+
+
+### Pipeline ###
+
+class Pipeline:
+    """
+    Chain of streaming blocks run chunk by chunk through fixed, preallocated buffers between stages, so arbitrarily
+    long streams (e.g. np.memmap captures) are processed in constant memory.
+
+        rx = Pipeline([FIRFilter.rrc(21, Ts=2), TimingRecoveryBlock(), CarrierRecoveryBlock(loop_bw=1/20),
+                       Map(demodulate_qpsk, rate=2, dtype=np.uint8)], chunk_size=4096)
+        for bits in rx.stream(samples):
+            ...
+    """
+    def __init__(self, blocks, chunk_size=4096):
+        self.blocks = list(blocks)
+        self.chunk_size = chunk_size
+
+        # Size every inter-stage buffer for the worst case output of a full chunk
+        self._buffer_specs = []
+        n = chunk_size
+        for block in self.blocks:
+            n = block.max_output(n)
+            self._buffer_specs.append((n, getattr(block, 'dtype', np.complex64)))
+        self._buffers = [np.empty(n, dtype=dtype) for n, dtype in self._buffer_specs]
+
+    @property
+    def rate(self):
+        """Nominal output samples per input sample of the whole chain"""
+        return float(np.prod([block.rate for block in self.blocks]))
+
+    def reset(self):
+        for block in self.blocks:
+            block.reset()
+
+    def process(self, chunk):
+        """Process one chunk of at most chunk_size samples. Returns a view into an internal buffer, valid until the next call."""
+        if len(chunk) > self.chunk_size:
+            raise ValueError(f"Chunk of {len(chunk)} samples exceeds chunk_size={self.chunk_size}")
+        data = chunk
+        for block, buffer in zip(self.blocks, self._buffers):
+            data = block.process(data, buffer)
+        return data
+
+    def stream(self, source):
+        """
+        Yield the output of every chunk of source: an array (sliced into chunk_size views) or an iterable of chunks.
+        Outputs are views into internal buffers; copy them to keep them past the next iteration.
+        """
+        for chunk in self._chunks(source):
+            yield self.process(chunk)
+
+    def _chunks(self, source):
+        """Split source into views of at most chunk_size samples"""
+        chunks = [source] if isinstance(source, np.ndarray) else source
+        for chunk in chunks:
+            for start in range(0, len(chunk), self.chunk_size):
+                yield chunk[start:start + self.chunk_size]
+
+    def run(self, source, sink=None):
+        """Process all of source, passing every output to sink(out) or, if sink is None, returning them concatenated"""
+        if sink is not None:
+            for out in self.stream(source):
+                sink(out)
+            return None
+        outputs = [out.copy() for out in self.stream(source)]
+        if not outputs:
+            return np.empty(0, dtype=self._buffers[-1].dtype if self._buffers else np.complex64)
+        return np.concatenate(outputs)
+
+
+### Multithreaded executor ###
+
+_STOP = object()
+
+
+class ThreadedPipeline(Pipeline):
+    """
+    Pipeline whose stages each run in their own thread, connected by bounded queues of queue_depth chunks.
+
+    Each stage writes into a fixed pool of queue_depth + 2 buffers and only takes a new one once the next stage has
+    released an old one, so a slow stage applies backpressure upstream and memory stays constant. Stages that
+    release the GIL (numba nogil kernels, sdrlib calls, most numpy operations) then run concurrently, and the total
+    throughput approaches that of the slowest stage instead of the sum of all stages.
+
+    stream() outputs are valid until the next iteration, as for Pipeline. process() runs one chunk serially.
+    """
+    def __init__(self, blocks, chunk_size=4096, queue_depth=4):
+        super().__init__(blocks, chunk_size)
+        self.queue_depth = queue_depth
+
+    def _worker(self, block, pool, q_in, q_out, errors):
+        failed = False
+        while True:
+            item = q_in.get()
+            if item is _STOP:
+                break
+            data, release = item
+            out = None
+            if not failed:
+                buffer = pool.get()
+                try:
+                    out = block.process(data, buffer)
+                except BaseException as exc:
+                    # Keep draining the input so upstream stages can finish, but stop producing
+                    errors.append(exc)
+                    failed = True
+                    pool.put(buffer)
+            release()
+            if out is not None:
+                q_out.put((out, lambda buffer=buffer: pool.put(buffer)))
+        q_out.put(_STOP)
+
+    def _feeder(self, source, q_out, abort, errors):
+        try:
+            for chunk in self._chunks(source):
+                if abort.is_set():
+                    break
+                q_out.put((chunk, lambda: None))
+        except BaseException as exc:
+            errors.append(exc)
+        q_out.put(_STOP)
+
+    def stream(self, source):
+        """
+        Yield the output of every chunk of source (see Pipeline.stream()), with all stages running concurrently.
+        Exceptions raised by a stage or by the source are re-raised here once the pipeline has drained.
+        """
+        queues = [queue.Queue(maxsize=self.queue_depth) for _ in range(len(self.blocks) + 1)]
+        errors = []
+        abort = threading.Event()
+
+        threads = [threading.Thread(target=self._feeder, args=(source, queues[0], abort, errors), daemon=True)]
+        for k, (block, (n, dtype)) in enumerate(zip(self.blocks, self._buffer_specs)):
+            pool = queue.Queue()
+            for _ in range(self.queue_depth + 2):
+                pool.put(np.empty(n, dtype=dtype))
+            threads.append(threading.Thread(target=self._worker, args=(block, pool, queues[k], queues[k + 1], errors),
+                                            daemon=True))
+        for thread in threads:
+            thread.start()
+
+        finished = False
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _STOP:
+                    finished = True
+                    break
+                out, release = item
+                try:
+                    yield out
+                finally:
+                    release()
+        finally:
+            # If the consumer stopped early, stop the source and drain so every thread can exit
+            if not finished:
+                abort.set()
+                while True:
+                    item = queues[-1].get()
+                    if item is _STOP:
+                        break
+                    item[1]()
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
@@ -0,0 +1,188 @@
+import functools
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+### Per-stage instrumentation ###
+
+# Attributes holding growing buffers/logs in the stateful blocks ('_fd.buffer': detector inside CFO correctors)
+BUFFER_ATTRS = ('buffer', 'signal', 'error_history', 'mu_log', 'e_log', '_fd.buffer')
+# Buffers the input chunk is appended to before processing, so they peak mid-call at (length before + chunk)
+INPUT_BUFFER_ATTRS = ('buffer', 'signal', '_fd.buffer')
+
+
+@dataclass
+class StageStats:
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    samples_in: int = 0
+    samples_out: int = 0
+    buffer_hwm: dict = field(default_factory=dict)
+
+    @property
+    def throughput(self):
+        """Input samples per second spent in this stage"""
+        return self.samples_in / self.seconds if self.seconds > 0 else float('inf')
+
+    @property
+    def seconds_per_call(self):
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+def _get_attr(obj, path):
+    for name in path.split('.'):
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def _buffer_lengths(block, attrs):
+    lengths = {}
+    for attr in attrs:
+        buf = _get_attr(block, attr)
+        if isinstance(buf, (np.ndarray, list)):
+            lengths[attr] = len(buf)
+    return lengths
+
+
+def _count_in(args, kwargs):
+    """Length of the first array argument (the input chunk)"""
+    for arg in (*args, *kwargs.values()):
+        if isinstance(arg, np.ndarray):
+            return len(arg)
+    return 0
+
+
+def _count_out(result, args):
+    """Samples produced: returned array, frames of returned detections, or an in-place output array argument"""
+    if isinstance(result, np.ndarray):
+        return len(result)
+    if isinstance(result, list):
+        return sum(len(r.frame) for r in result if getattr(r, 'frame', None) is not None)
+    if result is None:
+        arrays = [arg for arg in args if isinstance(arg, np.ndarray)]
+        if len(arrays) > 1:
+            return len(arrays[1])
+    return 0
+
+
+class Profiler:
+    """
+    Opt-in per-stage profiler for stateful blocks (timing/carrier recovery, frame detectors, CFO correctors, ...).
+
+    instrument() replaces a block's methods on that instance only, so nothing is measured (and nothing costs
+    anything) for blocks that were never instrumented or after restore(). Records wall time, calls, input/output
+    samples and the high-water mark of each buffer attribute (see BUFFER_ATTRS).
+
+    Use as a context manager to restore all blocks on exit:
+
+        with Profiler() as prof:
+            prof.instrument(stc, 'timing')
+            prof.instrument(costas, 'carrier')
+            ... run the receive chain ...
+        print(prof.report())
+    """
+    def __init__(self):
+        self.stats = {}
+        self._patched = []
+
+    def instrument(self, block, name=None, methods=('process',), buffers=BUFFER_ATTRS):
+        """Instrument methods of block. Stages are named name (or the class name), plus '.method' for non-process methods"""
+        name = name or type(block).__name__
+        for method in methods:
+            stage = name if method == 'process' else f"{name}.{method}"
+            if stage in self.stats:
+                raise ValueError(f"Stage '{stage}' is already instrumented")
+            stats = self.stats[stage] = StageStats(stage)
+            wrapped = self._wrap(block, getattr(block, method), stats, buffers)
+            self._patched.append((block, method, method in vars(block)))
+            setattr(block, method, wrapped)
+        return block
+
+    @staticmethod
+    def _wrap(block, fn, stats, buffers):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            n_in = _count_in(args, kwargs)
+            before = _buffer_lengths(block, buffers)
+
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            stats.seconds += time.perf_counter() - start
+
+            stats.calls += 1
+            stats.samples_in += n_in
+            stats.samples_out += _count_out(result, args)
+
+            after = _buffer_lengths(block, buffers)
+            for attr in {**before, **after}:
+                appended = n_in if attr in INPUT_BUFFER_ATTRS else 0
+                peak = max(before.get(attr, 0) + appended, after.get(attr, 0))
+                stats.buffer_hwm[attr] = max(stats.buffer_hwm.get(attr, 0), peak)
+            return result
+        return wrapper
+
+    def restore(self):
+        """Remove instrumentation from every block (statistics are kept)"""
+        for block, method, was_instance_attr in reversed(self._patched):
+            if was_instance_attr:
+                setattr(block, method, getattr(block, method).__wrapped__)
+            else:
+                delattr(block, method)
+        self._patched = []
+
+    def reset(self):
+        """Clear statistics but keep instrumentation"""
+        for stats in self.stats.values():
+            stats.calls, stats.seconds, stats.samples_in, stats.samples_out = 0, 0.0, 0, 0
+            stats.buffer_hwm.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.restore()
+
+    def bottleneck(self):
+        """Stage with the most total time, which limits the throughput of a serial chain"""
+        if not self.stats:
+            return None
+        return max(self.stats.values(), key=lambda s: s.seconds)
+
+    def summary(self):
+        """Per-stage statistics as a list of dicts, in instrumentation order"""
+        total = sum(s.seconds for s in self.stats.values())
+        return [
+            {
+                'stage': s.name,
+                'calls': s.calls,
+                'seconds': s.seconds,
+                'fraction': s.seconds / total if total > 0 else 0.0,
+                'samples_in': s.samples_in,
+                'samples_out': s.samples_out,
+                'samples_per_sec': s.throughput,
+                'buffer_hwm': dict(s.buffer_hwm),
+            }
+            for s in self.stats.values()
+        ]
+
+    def report(self):
+        """Text table of per-stage statistics with the throughput-limiting stage"""
+        lines = [f"{'stage':<28} {'calls':>7} {'time [s]':>9} {'time %':>7} {'in':>10} {'out':>10} {'MS/s':>9}  buffers"]
+        for row in self.summary():
+            buffers = ', '.join(f"{k}={v}" for k, v in row['buffer_hwm'].items())
+            lines.append(
+                f"{row['stage']:<28} {row['calls']:>7} {row['seconds']:>9.4f} {100*row['fraction']:>6.1f}% "
+                f"{row['samples_in']:>10} {row['samples_out']:>10} {row['samples_per_sec']/1e6:>9.3f}  {buffers}"
+            )
+
+        slowest = self.bottleneck()
+        if slowest is not None and slowest.calls:
+            total = sum(s.seconds for s in self.stats.values())
+            lines.append(f"Bottleneck: {slowest.name} ({100*slowest.seconds/total:.1f}% of time, "
+                         f"{slowest.throughput/1e6:.3f} MS/s)")
+        return '\n'.join(lines)
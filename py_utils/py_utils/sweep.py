@@ -0,0 +1,175 @@
+
+import hashlib
+import inspect
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .jit_cache import warmup
+from .metrics import ErrorRateCounter
+
+
+### Monte-Carlo BER sweeps ###
+
+@dataclass
+class SweepResult:
+    params: dict
+    ber: float
+    n_err: int
+    n_bits: int
+    ci: tuple
+    key: str = None
+    index: int = None
+    cached: bool = False
+    extra: dict = field(default_factory=dict)
+
+
+def _call(fn, *args, params):
+    """Call fn with the subset of params it accepts (all of them if it takes **kwargs)"""
+    sig = inspect.signature(fn)
+    if any(p.kind == p.VAR_KEYWORD for p in sig.parameters.values()):
+        return fn(*args, **params)
+    return fn(*args, **{k: v for k, v in params.items() if k in sig.parameters})
+
+
+def _describe(fn):
+    """Stable description of a callable for cache keys: qualified name plus source if available"""
+    name = f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}"
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = ''
+    return name + '\n' + source
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+def point_key(transmitter, channel, receiver, params, seed, stop):
+    """Hash of everything that determines the result of one sweep point"""
+    config = {
+        'transmitter': _describe(transmitter),
+        'channel': _describe(channel),
+        'receiver': _describe(receiver),
+        'params': {k: _jsonable(v) for k, v in sorted(params.items())},
+        'seed': seed,
+        'stop': stop,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def _run_point(transmitter, channel, receiver, params, seed, stop, key, index):
+    # Each point gets its own generator, spawned from the sweep seed with a key derived from the point hash,
+    # so results do not depend on grid order or on which other points are in the sweep
+    seed_seq = np.random.SeedSequence(seed, spawn_key=(int(key[:16], 16),))
+    rng = np.random.default_rng(seed_seq)
+    counter = ErrorRateCounter(**stop)
+
+    while not counter.done:
+        bits_tx, sig_tx = _call(transmitter, rng, params=params)
+        sig_rx = _call(channel, sig_tx, rng, params=params)
+        bits_rx = _call(receiver, sig_rx, params=params)
+        n = min(len(bits_tx), len(bits_rx))
+        if n == 0:
+            raise ValueError(f"A trial at {params} produced no bits; the sweep point would never finish.")
+        counter.update(bits_tx[:n], bits_rx[:n], packed=False)
+
+    return SweepResult(params=params, ber=counter.ber, n_err=counter.n_err, n_bits=counter.n_bits,
+                       ci=counter.interval, key=key, index=index)
+
+
+def _load(cache_dir, key, index):
+    path = os.path.join(cache_dir, key + '.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        d = json.load(f)
+    return SweepResult(params=d['params'], ber=d['ber'], n_err=d['n_err'], n_bits=d['n_bits'], ci=tuple(d['ci']),
+                       key=key, index=index, cached=True)
+
+
+def _store(cache_dir, result):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, result.key + '.json')
+    d = {'params': {k: _jsonable(v) for k, v in result.params.items()}, 'ber': result.ber,
+         'n_err': result.n_err, 'n_bits': result.n_bits, 'ci': list(result.ci)}
+    with open(path + '.tmp', 'w') as f:
+        json.dump(d, f)
+    os.replace(path + '.tmp', path)
+
+
+def grid_points(grid, base_params=None):
+    """Expand a {name: values} grid into a list of parameter dicts (cartesian product)"""
+    names = list(grid)
+    points = []
+    for values in itertools.product(*(grid[n] for n in names)):
+        params = dict(base_params or {})
+        params.update(zip(names, (_jsonable(v) for v in values)))
+        points.append(params)
+    return points
+
+
+def iter_sweep(transmitter, channel, receiver, grid, base_params=None, seed=0, min_errors=100,
+               max_rel_width=None, max_bits=10**6, n_workers=None, cache_dir=None):
+    """
+    Run a Monte-Carlo BER sweep, yielding a SweepResult for each grid point as it completes.
+
+    A trial is: bits_tx, sig_tx = transmitter(rng, **params); sig_rx = channel(sig_tx, rng, **params);
+    bits_rx = receiver(sig_rx, **params), with bits unpacked. Each stage only receives the parameters named in its
+    signature (or all of them if it takes **kwargs). Trials repeat at a point until the ErrorRateCounter stop
+    criteria (min_errors, max_rel_width, max_bits) are met. max_bits must be a positive int, so that every point
+    finishes even if the other criteria cannot be met.
+
+    Points are computed on a process pool of n_workers (None: one per CPU, 0 or 1: in this process). Stage
+    functions must be picklable (defined at module level) for the pool, and the py_utils kernels are warmed up
+    (jit_cache.warmup()) before it starts so workers do not compile them. If cache_dir is given, each result is
+    stored under a hash of the stage functions' source, the point parameters, the seed and the stop criteria,
+    and cached points are not recomputed.
+    """
+    if isinstance(max_bits, bool) or not isinstance(max_bits, (int, np.integer)) or max_bits <= 0:
+        raise ValueError(f"max_bits must be a positive int, got {max_bits!r}.")
+
+    stop = {'min_errors': min_errors, 'max_rel_width': max_rel_width, 'max_bits': max_bits}
+    todo = []
+    for index, params in enumerate(grid_points(grid, base_params)):
+        key = point_key(transmitter, channel, receiver, params, seed, stop)
+        cached = _load(cache_dir, key, index) if cache_dir is not None else None
+        if cached is not None:
+            yield cached
+        else:
+            todo.append((params, key, index))
+
+    def finish(result):
+        if cache_dir is not None:
+            _store(cache_dir, result)
+        return result
+
+    if n_workers is not None and n_workers <= 1:
+        for params, key, index in todo:
+            yield finish(_run_point(transmitter, channel, receiver, params, seed, stop, key, index))
+        return
+
+    # Compile (or load from the disk cache) the numba kernels once here: forked workers inherit them, spawned
+    # workers find them cached
+    if todo:
+        warmup()
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(_run_point, transmitter, channel, receiver, params, seed, stop, key, index)
+                   for params, key, index in todo]
+        for future in as_completed(futures):
+            yield finish(future.result())
+
+
+def run_sweep(transmitter, channel, receiver, grid, **kwargs):
+    """Run a sweep with iter_sweep() and return the list of results in grid order"""
+    return sorted(iter_sweep(transmitter, channel, receiver, grid, **kwargs), key=lambda r: r.index)
@@ -1,9 +1,10 @@
 
 import numpy as np
 from abc import ABC, abstractmethod
+from numba import njit
 
-from .interpolators import CubicFarrowInterpolator
-from .control import PIDFeedback
+from .interpolators import CubicFarrowInterpolator, cubic_farrow_weights
+from .control import PIDFeedback, pid_update
 
 # TODO:
 #   - Add M&M
@@ -19,6 +20,59 @@ class SymbolTimingCorrector(ABC):
         raise NotImplementedError
 
 
+@njit(nogil=True, cache=True)
+def _farrow_at(buffer, mu):
+    h0, h1, h2, h3 = cubic_farrow_weights(mu)
+    return h0*buffer[0] + h1*buffer[1] + h2*buffer[2] + h3*buffer[3]
+
+
+@njit(nogil=True, cache=True)
+def _gardner_kernel(signal, out, buffer, i, mu, offset, pid_state, mu_log, e_log):
+    """
+    Compiled GardnerSymbolTimingCorrector.process_symbol_pair() over all sample pairs of signal.
+    buffer is the 4-sample Farrow buffer (updated in place) and i the corrector's sample index at the start of
+    signal. Returns the updated mu and offset.
+    """
+    H = 0.1
+    lower = 0.2
+    upper = 1
+    for p in range(len(signal) // 2):
+        sample_out = 0j
+        have_out = False
+        e = 0.0
+
+        for k in range(2):
+            # Same hysteresis on mu as process_symbol_pair()
+            if mu > upper + H:
+                mu = lower
+                offset = 1 - offset
+            elif mu < lower - H:
+                mu = upper
+                offset = 1 - offset
+
+            buffer[0] = buffer[1]
+            buffer[1] = buffer[2]
+            buffer[2] = buffer[3]
+            buffer[3] = signal[2*p + k]
+            i += 1
+
+            if i % 2 == offset:
+                prev = _farrow_at(buffer, mu - 1)
+                curr = _farrow_at(buffer, mu)
+                next = _farrow_at(buffer, mu + 1)
+                e = ((prev - next) * np.conj(curr)).real
+                mu += pid_update(pid_state, e)
+            else:
+                sample_out = _farrow_at(buffer, mu)
+                have_out = True
+
+        mu_log[p] = mu
+        e_log[p] = e
+        out[p] = sample_out if have_out else _farrow_at(buffer, mu)
+
+    return mu, offset
+
+
 class GardnerSymbolTimingCorrector(SymbolTimingCorrector):
     def ted(mu, farrow):
         """
@@ -117,10 +171,13 @@ class GardnerSymbolTimingCorrector(SymbolTimingCorrector):
         elif self.signal is None:
             raise ValueError("No input signal provided.")
 
-        # Process signal in pairs of samples
-        out = []
-        while self.i + 2 <= self.SIG_SIZE:
-            out.append(self.process_symbol_pair())
+        # Process signal in pairs of samples. The default (compiled) controller runs in a GIL-free kernel
+        if isinstance(self.control, PIDFeedback):
+            out = self._process_compiled()
+        else:
+            out = []
+            while self.i + 2 <= self.SIG_SIZE:
+                out.append(self.process_symbol_pair())
 
         # Delete processed samples from buffer to save memory
         self.signal = self.signal[self.i:]
@@ -129,6 +186,23 @@ class GardnerSymbolTimingCorrector(SymbolTimingCorrector):
         
         return np.array(out, dtype=np.complex64)
     
+    def _process_compiled(self):
+        n_pairs = (self.SIG_SIZE - self.i) // 2
+        out = np.empty(n_pairs, dtype=np.complex64)
+        mu_log = np.empty(n_pairs)
+        e_log = np.empty(n_pairs)
+        buffer = np.array(self._farrow.buffer, dtype=np.complex64)
+
+        self.mu, offset = _gardner_kernel(self.signal[self.i:self.i + 2*n_pairs], out, buffer, self.i, self.mu,
+                                          int(self._offset), self.control.state, mu_log, e_log)
+        self._offset = bool(offset)
+        self._farrow.buffer.extend(buffer)
+        self.i += 2*n_pairs
+
+        self.mu_log.extend(mu_log.tolist())
+        self.e_log.extend(e_log.tolist())
+        return out
+
     def _increment(self, n=1):
         for _ in range(n):
             self._farrow.load(self.signal[self.i])
@@ -2,10 +2,45 @@ import numpy as np
 import matplotlib.pyplot as plt
 import scipy.signal
 
+from .dsp import WelchPSD, Waterfall
+
 ### Time Domain ###
 
+# Functions applied to a signal to get each plotted trace
+_PARTS = {'re': np.real, 'im': np.imag, 'abs': np.abs, None: lambda s: s}
+
+def minmax_envelope(y, n_bins):
+    """
+    Indices of the minimum and maximum of y within each of n_bins equal bins, in time order.
+    Plotting only these 2*n_bins points draws the same envelope as the full signal, including single-sample
+    transients, in time bounded by the number of bins (screen width) instead of len(y).
+    """
+    n = len(y)
+    bin_size = int(np.ceil(n / n_bins))
+    n_full = n // bin_size
+
+    body = y[:n_full * bin_size].reshape(n_full, bin_size)
+    offsets = np.arange(n_full) * bin_size
+    lo = body.argmin(axis=1) + offsets
+    hi = body.argmax(axis=1) + offsets
+    if n_full * bin_size < n:
+        tail = y[n_full * bin_size:]
+        lo = np.append(lo, tail.argmin() + n_full * bin_size)
+        hi = np.append(hi, tail.argmax() + n_full * bin_size)
+
+    return np.stack((np.minimum(lo, hi), np.maximum(lo, hi)), axis=1).ravel()
+
+
+def _envelope(s, part, start, stop, n_bins):
+    """(indices, values) of the min/max envelope of part(s[start:stop]); indices are relative to start"""
+    y = _PARTS[part](s[start:stop])
+    idx = minmax_envelope(y, n_bins)
+    return idx, y[idx]
+
+
 def plot_signal(*signals, n_samps=None, ylabel=None, xlabel="n", title="Signal",
-                label=None, xlim=None, ylim=None, ax=None, x=None, show_parts=True, db=False):
+                label=None, xlim=None, ylim=None, ax=None, x=None, show_parts=True, db=False,
+                max_points=4000):
     """
     Plot one or more signals in the time domain.
     If a signal is complex and show_parts=True, the real and imaginary
@@ -41,6 +76,10 @@ def plot_signal(*signals, n_samps=None, ylabel=None, xlabel="n", title="Signal",
         Default is True.
     db : bool, optional
         If True, plot magnitude in dB (20*log10(abs(signal))). Default is False.
+    max_points : int, optional
+        If more samples than this are shown, each trace is decimated to the per-bin min/max envelope
+        of max_points/2 bins, so long signals plot quickly without hiding
+        transients. None always plots every sample. Default is 4000.
 
     Returns
     -------
@@ -52,27 +91,19 @@ def plot_signal(*signals, n_samps=None, ylabel=None, xlabel="n", title="Signal",
     if len(signals) == 0:
         raise ValueError("At least one signal must be provided.")
 
-    signals = [np.asarray(s).flatten() for s in signals]
+    signals = [np.ravel(np.asarray(s)) for s in signals]
 
-    # Expand complex signals if requested
-    expanded_signals = []
-    expanded_labels = []
+    # Expand complex signals if requested. Traces are (signal, part, label); parts are evaluated after slicing
+    traces = []
     for idx, s in enumerate(signals):
         lbl = label[idx] if label and idx < len(label) else f"Signal {idx+1}"
         if db:
-            s_db = 20 * np.log10(np.abs(s) + 1e-12)
-            expanded_signals.append(s_db)
-            expanded_labels.append(lbl + " (dB)")
+            traces.append((s, 'abs', lbl + " (dB)"))
         elif np.iscomplexobj(s) and show_parts:
-            expanded_signals.append(s.real)
-            expanded_labels.append(lbl + " (Re)")
-            expanded_signals.append(s.imag)
-            expanded_labels.append(lbl + " (Im)")
+            traces.append((s, 're', lbl + " (Re)"))
+            traces.append((s, 'im', lbl + " (Im)"))
         else:
-            expanded_signals.append(s)
-            expanded_labels.append(lbl)
-    signals = expanded_signals
-    label = expanded_labels
+            traces.append((s, None, lbl))
 
     if n_samps is None or n_samps > len(signals[0]):
         n_samps = len(signals[0])
@@ -81,24 +112,32 @@ def plot_signal(*signals, n_samps=None, ylabel=None, xlabel="n", title="Signal",
         x = np.asarray(x)
         if xlim is None:
             xlim = [x[0], x[min(n_samps, len(x))-1]]
-        start_idx = np.searchsorted(x, xlim[0], side="left")
-        stop_idx = np.searchsorted(x, xlim[1], side="right")
-        x = x[start_idx:stop_idx]
-        signals = [s[start_idx:stop_idx] for s in signals]
+        start = np.searchsorted(x, xlim[0], side="left")
+        stop = np.searchsorted(x, xlim[1], side="right")
     else:
         if xlim is None:
             xlim = [0, n_samps-1]
         start, stop = xlim[0], xlim[1]+1
-        x = np.arange(start, stop)
-        signals = [s[start:stop] for s in signals]
 
     if ax is None:
         fig, ax = plt.subplots()
     else:
         fig = ax.figure
 
-    for s, lbl in zip(signals, label):
-        ax.plot(x, s, '.-', label=lbl)
+    for s, part, lbl in traces:
+        stop_s = min(stop, len(s))
+        if max_points and stop_s - start > max_points:
+            idx, y = _envelope(s, part, start, stop_s, max_points // 2)
+            idx = idx + start
+            style = '-'
+        else:
+            idx = np.arange(start, stop_s)
+            y = _PARTS[part](s[start:stop_s])
+            style = '.-'
+
+        if db:
+            y = 20 * np.log10(y + 1e-12)
+        ax.plot(x[idx] if x is not None else idx, y, style, label=lbl)
 
     ax.set_title(title)
     ax.set_xlabel(xlabel)
@@ -106,7 +145,7 @@ def plot_signal(*signals, n_samps=None, ylabel=None, xlabel="n", title="Signal",
     ax.grid(True)
     if xlim: ax.set_xlim(xlim)
     if ylim: ax.set_ylim(ylim)
-    if len(signals) > 1:
+    if len(traces) > 1:
         ax.legend()
 
     return fig, ax
@@ -116,7 +155,7 @@ def plot_signal(*signals, n_samps=None, ylabel=None, xlabel="n", title="Signal",
 
 def plot_spectrum(signal, size=None, n_samples=None, Fs=None,
                   window='hann', db=True, title='Spectrum',
-                  xlim=None, ylim=None, ax=None, dec_factor=None):
+                  xlim=None, ylim=None, ax=None, dec_factor=None, method='fft'):
     """
     Plot the frequency spectrum of a signal using the FFT.
     Handles both real and complex signals, with optional windowing
@@ -124,10 +163,11 @@ def plot_spectrum(signal, size=None, n_samples=None, Fs=None,
 
     Parameters
     ----------
-    signal : array_like
-        Input signal to transform.
+    signal : array_like or dsp.WelchPSD
+        Input signal to transform, or a streaming Welch estimate to render.
     size : int, optional
-        FFT size. If None, next power of two >= len(signal) is used.
+        FFT size. If None, next power of two >= len(signal) is used
+        (1024 for method='welch').
     n_samples : int, optional
         Number of samples from the signal to use. If None, full length.
     Fs : float, optional
@@ -148,6 +188,11 @@ def plot_spectrum(signal, size=None, n_samples=None, Fs=None,
         Existing axes to draw on. If None, a new figure and axes are created.
     dec_factor : int, optional
         If provided, decimate spectrum and frequency axis by this factor.
+    method : {"fft", "welch"}, optional
+        "fft" plots the magnitude of one FFT of the whole signal. "welch"
+        plots the averaged periodogram of size-sample segments with 50%
+        overlap (see dsp.WelchPSD), which is smoother and bounded in
+        memory for long signals. Default is "fft".
 
     Returns
     -------
@@ -156,6 +201,14 @@ def plot_spectrum(signal, size=None, n_samples=None, Fs=None,
     ax : matplotlib.axes.Axes
         The axes with the plotted spectrum.
     """
+    if isinstance(signal, WelchPSD) or method == 'welch':
+        if isinstance(signal, WelchPSD):
+            welch = signal
+        else:
+            signal = np.asarray(signal)[:n_samples] if n_samples else signal
+            welch = WelchPSD(size or 1024, window=window, Fs=Fs).update(signal)
+        return _plot_psd(welch, db, title, xlim, ylim, ax)
+
     signal = np.asarray(signal)
 
     if n_samples:
@@ -207,16 +260,135 @@ def plot_spectrum(signal, size=None, n_samples=None, Fs=None,
     return fig, ax
 
 
+def _plot_psd(welch, db, title, xlim, ylim, ax):
+    psd = welch.psd
+    if db:
+        psd = 10*np.log10(psd + 1e-20)
+
+    if ax is None:
+        fig, ax = plt.subplots()
+    else:
+        fig = ax.figure
+
+    ax.plot(welch.freqs, psd)
+    ax.set_title(title)
+    ax.set_xlabel("Frequency (Hz)" if welch.Fs else "Normalized Frequency (cycles/sample)")
+    unit = "/Hz" if welch.Fs else ""
+    ax.set_ylabel(f"PSD (dB{unit})" if db else f"PSD{unit}")
+    ax.grid(True)
+    if xlim: ax.set_xlim(xlim)
+    if ylim: ax.set_ylim(ylim)
+
+    return fig, ax
+
+
+def plot_waterfall(waterfall, db=True, title='Waterfall', vmin=None, vmax=None, ax=None, cmap='viridis'):
+    """
+    Plot the rows of a streaming spectrogram as an image, newest row at the bottom.
+
+    Parameters
+    ----------
+    waterfall : dsp.Waterfall
+        Accumulator holding the PSD history to plot.
+    db : bool, optional
+        If True, plot PSD in dB. Default is True.
+    title : str, optional
+        Plot title. Default is "Waterfall".
+    vmin, vmax : float, optional
+        Color scale limits. If None, autoscaled.
+    ax : matplotlib.axes.Axes, optional
+        Existing axes to draw on. If None, a new figure and axes are created.
+    cmap : str, optional
+        Matplotlib colormap. Default is "viridis".
+
+    Returns
+    -------
+    fig : matplotlib.figure.Figure
+        The figure containing the plot.
+    ax : matplotlib.axes.Axes
+        The axes with the plotted waterfall.
+    """
+    rows = waterfall.history
+    if db:
+        rows = 10*np.log10(rows + 1e-20)
+
+    if ax is None:
+        fig, ax = plt.subplots()
+    else:
+        fig = ax.figure
+
+    freqs = waterfall.freqs
+    t_span = len(rows) * waterfall.row_duration
+    im = ax.imshow(rows, aspect='auto', origin='upper', cmap=cmap, vmin=vmin, vmax=vmax,
+                   extent=(freqs[0], freqs[-1], t_span, 0), interpolation='nearest')
+    fig.colorbar(im, ax=ax, label="PSD (dB)" if db else "PSD")
+    ax.set_title(title)
+    ax.set_xlabel("Frequency (Hz)" if waterfall.Fs else "Normalized Frequency (cycles/sample)")
+    ax.set_ylabel("Time (s)" if waterfall.Fs else "Time (samples)")
+
+    return fig, ax
+
+
 ### Modulation ###
 
-def plot_constellation(signal, n_samples=1000, offset=0, ax=None, title="Constellation Plot", xlim=None):
+class ConstellationHistogram:
+    """
+    2-D histogram of complex symbols on a fixed bins x bins grid, accumulated across chunks with a vectorized
+    bincount, so the density of millions of symbols is rendered as one image in constant time.
+
+    extent is the half-width of the square grid; if None it is set from the first chunk (1.25 x its largest
+    |I| or |Q|). Symbols outside the grid are counted in n_outside.
+    """
+    def __init__(self, bins=256, extent=None):
+        self.bins = bins
+        self._extent_init = extent
+        self.reset()
+
+    def reset(self):
+        self.extent = self._extent_init
+        self.counts = np.zeros((self.bins, self.bins), dtype=np.int64)
+        self.n_points = 0
+        self.n_outside = 0
+
+    def update(self, symbols):
+        symbols = np.ravel(np.asarray(symbols))
+        if len(symbols) == 0:
+            return self
+        if self.extent is None:
+            peak = max(np.abs(symbols.real).max(), np.abs(symbols.imag).max())
+            self.extent = 1.25 * float(peak) if peak > 0 else 1.0
+
+        # Bin index of each symbol; row = Q, column = I
+        scale = self.bins / (2 * self.extent)
+        ix = np.floor((symbols.real + self.extent) * scale).astype(np.int64)
+        iy = np.floor((symbols.imag + self.extent) * scale).astype(np.int64)
+        inside = (ix >= 0) & (ix < self.bins) & (iy >= 0) & (iy < self.bins)
+        flat = iy[inside] * self.bins + ix[inside]
+
+        self.counts += np.bincount(flat, minlength=self.bins * self.bins).reshape(self.bins, self.bins)
+        self.n_points += len(symbols)
+        self.n_outside += len(symbols) - len(flat)
+        return self
+
+    process = update
+
+    @property
+    def density(self):
+        """Fraction of binned symbols per bin"""
+        total = self.counts.sum()
+        return self.counts / total if total else self.counts.astype(np.float64)
+
+
+def plot_constellation(signal, n_samples=1000, offset=0, ax=None, title="Constellation Plot", xlim=None,
+                       density=False, bins=256, cmap='inferno'):
     """
     Plot a constellation diagram from a complex-valued signal.
 
     Parameters
     ----------
-    signal : array_like
-        Complex input signal representing modulated symbols.
+    signal : array_like or ConstellationHistogram
+        Complex input signal representing modulated symbols, or an
+        accumulated histogram to render (implies density=True).
     n_samples : int, optional
         Maximum number of points to display. Default is 1000.
     offset : int, optional
@@ -227,6 +399,15 @@ def plot_constellation(signal, n_samples=1000, offset=0, ax=None, title="Constel
         Plot title. Default is "Constellation Plot".
     xlim : tuple of (int, int), optional
         Indices of the signal to plot: (start, stop). If None, uses offset and n_samples.
+    density : bool, optional
+        If True, bin the symbols into a bins x bins histogram and show it
+        as a log-scaled image instead of scattering points. In this mode
+        n_samples is ignored and every sample from offset is used. Default
+        is False.
+    bins : int, optional
+        Histogram bins per axis in density mode. Default is 256.
+    cmap : str, optional
+        Colormap for density mode. Default is "inferno".
 
     Returns
     -------
@@ -235,6 +416,15 @@ def plot_constellation(signal, n_samples=1000, offset=0, ax=None, title="Constel
     ax : matplotlib.axes.Axes
         The axes with the plotted constellation diagram.
     """
+    if isinstance(signal, ConstellationHistogram) or density:
+        if isinstance(signal, ConstellationHistogram):
+            hist = signal
+        else:
+            signal = np.asarray(signal)
+            signal = signal[xlim[0]:xlim[1]] if xlim is not None else signal[offset:]
+            hist = ConstellationHistogram(bins).update(signal)
+        return _plot_constellation_density(hist, ax, title, cmap)
+
     signal = np.asarray(signal)
     if not np.iscomplexobj(signal):
         raise ValueError("Input signal must be complex for constellation plot.")
@@ -260,6 +450,22 @@ def plot_constellation(signal, n_samples=1000, offset=0, ax=None, title="Constel
     return fig, ax
 
 
+def _plot_constellation_density(hist, ax, title, cmap):
+    if ax is None:
+        fig, ax = plt.subplots()
+    else:
+        fig = ax.figure
+
+    e = hist.extent if hist.extent is not None else 1.0
+    ax.imshow(np.log1p(hist.counts), origin='lower', extent=(-e, e, -e, e), cmap=cmap,
+              interpolation='nearest', aspect='equal')
+    ax.set_title(title)
+    ax.set_xlabel("In Phase")
+    ax.set_ylabel("Quadrature")
+
+    return fig, ax
+
+
 def visualize(signal, 
               plots=("time", "fft", "constellation"), 
               Fs=None, 
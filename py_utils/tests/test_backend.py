@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from py_utils import backend, carrier_recovery, channel
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    previous = backend.get_backend()
+    yield
+    backend._backend = previous
+
+
+@pytest.fixture
+def fake_sdrlib(monkeypatch):
+    # Dispatch only checks that py_sdrlib is importable; nothing is called on it here
+    monkeypatch.setattr(backend, 'py_sdrlib', object())
+
+
+def test_sdrlib_equivalence():
+    pytest.importorskip('py_sdrlib')
+    results = backend.check_equivalence()
+    assert results
+    failed = [(op, err, tol) for op, err, tol, passed in results if not passed]
+    assert not failed
+
+
+def test_resolve_backend():
+    assert backend.resolve_backend('python') == 'python'
+    assert backend.resolve_backend('auto') == ('sdrlib' if backend.sdrlib_available() else 'python')
+    with pytest.raises(ValueError):
+        backend.resolve_backend('cuda')
+
+
+def test_resolve_backend_without_sdrlib(monkeypatch):
+    monkeypatch.setattr(backend, 'py_sdrlib', None)
+    assert backend.resolve_backend('auto') == 'python'
+    with pytest.raises(ImportError):
+        backend.resolve_backend('sdrlib')
+    with pytest.raises(ImportError):
+        backend.set_backend('sdrlib')
+    assert backend.native('CostasLoopQPSK') is None
+
+
+def test_use_backend_restores_on_error():
+    backend.set_backend('auto')
+    with pytest.raises(RuntimeError):
+        with backend.use_backend('python'):
+            assert backend.get_backend() == 'python'
+            raise RuntimeError
+    assert backend.get_backend() == 'auto'
+
+    with pytest.raises(ValueError):
+        backend.set_backend('cuda')
+    assert backend.get_backend() == 'auto'
+
+
+def test_per_call_override(fake_sdrlib):
+    with backend.use_backend('sdrlib'):
+        assert backend.native('CostasLoopQPSK') is not None
+        assert backend.native('CostasLoopQPSK', 'python') is None
+    with backend.use_backend('python'):
+        assert backend.native('CostasLoopQPSK') is None
+        assert backend.native('CostasLoopQPSK', 'sdrlib') is not None
+    assert backend.native('not_ported', 'sdrlib') is None
+
+
+def test_auto_skips_ports_with_different_dtype(fake_sdrlib):
+    backend.set_backend('auto')
+    # apply_cfo/modulate_qpsk return complex64 from sdrlib, so 'auto' keeps the python versions
+    assert backend.native('apply_cfo') is None
+    assert backend.native('modulate_qpsk', 'auto') is None
+    assert backend.native('apply_cfo', 'sdrlib') is not None
+    assert backend.native('CostasLoopQPSK') is not None
+
+    signal = np.ones(8, dtype=np.complex128)
+    assert channel.apply_cfo(signal, w_offset=0.1).dtype == np.complex128
+
+
+class _RingCostas:
+    """Stand-in for the sdrlib loop: same results, errors kept in a small ring buffer as sdrlib does"""
+    def __init__(self, loop_bw, history_size=16):
+        self._loop = carrier_recovery.CostasLoopQPSK(loop_bw, backend='python')
+        self.error_history = np.zeros(history_size, dtype=np.float32)
+        self._idx = 0
+
+    @property
+    def loop_bw(self):
+        return self._loop.loop_bw
+
+    @loop_bw.setter
+    def loop_bw(self, value):
+        self._loop.loop_bw = value
+
+    @property
+    def correction(self):
+        return self._loop.correction
+
+    def reset(self):
+        self._loop.reset()
+        self.error_history[:] = 0
+        self._idx = 0
+
+    def process(self, symbols_in, symbols_out):
+        self._loop.process(symbols_in, symbols_out)
+        for e in self._loop.error_history:
+            self.error_history[self._idx] = e
+            self._idx = (self._idx + 1) % len(self.error_history)
+
+
+def test_native_costas_error_history_matches_python(monkeypatch):
+    monkeypatch.setattr(carrier_recovery, 'native', lambda op, b: _RingCostas if b == 'sdrlib' else None)
+    rng = np.random.default_rng(0)
+    symbols = ((1 - 2*rng.integers(0, 2, 100)) + 1j*(1 - 2*rng.integers(0, 2, 100))).astype(np.complex64)
+    symbols *= np.exp(1j*0.02*np.arange(100)).astype(np.complex64)
+
+    ref = carrier_recovery.CostasLoopQPSK(1/20, backend='python')
+    loop = carrier_recovery.CostasLoopQPSK(1/20, backend='sdrlib')
+    # Chunks shorter than, equal to and longer than the 16-entry ring
+    for chunk in (symbols[:5], symbols[5:21], symbols[21:]):
+        ref.process(chunk, np.empty_like(chunk))
+        loop.process(chunk, np.empty_like(chunk))
+        np.testing.assert_array_equal(loop.error_history, ref.error_history)
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from py_utils import capture
+
+
+@pytest.mark.parametrize('fmt', ['cf32', 'ci16'])
+def test_reader_opens_empty_capture(tmp_path, fmt):
+    path = str(tmp_path / 'empty.sigmf-data')
+    with capture.IQWriter(path, fmt=fmt, sample_rate=1e6):
+        pass
+
+    with capture.IQReader(path) as rec:
+        assert len(rec) == 0
+        assert rec.raw.shape == (0, 2)
+        assert len(rec.read()) == 0
+        assert list(rec.chunks(1024)) == []
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from py_utils import coding
+
+
+@pytest.mark.parametrize('M', [4, 8, 6])
+@pytest.mark.parametrize('ref', [0, 3, 300, -1])
+def test_diff_encode_phase_any_reference(M, ref):
+    indices = np.array([1, 2, 3, 0, 1])
+    out, new_ref = coding.diff_encode_phase(indices, M, ref)
+
+    expected = (np.cumsum(indices) + ref) % M
+    np.testing.assert_array_equal(out, expected)
+    assert new_ref == expected[-1]
+
+    decoded, _ = coding.diff_decode_phase(out, M, ref)
+    np.testing.assert_array_equal(decoded, indices % M)
+
+
+def test_diff_encode_phase_empty_input_reduces_reference():
+    out, new_ref = coding.diff_encode_phase([], 4, ref=6)
+    assert len(out) == 0
+    assert new_ref == 2
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from py_utils import dsp
+
+
+@pytest.mark.parametrize('fs_out', [500e3, 2.4e6 / np.pi])
+def test_resampler_accepts_filter_options_for_any_ratio(fs_out):
+    # 500 kHz reduces to 5/24 (polyphase); 2.4 MHz/pi does not (Farrow)
+    rs = dsp.resampler(2.4e6, fs_out, kaiser_beta=6.0, taps_per_phase=8, n_taps=31)
+    assert rs.rate == pytest.approx(fs_out / 2.4e6)
+
+    y = rs.process(np.ones(1000, dtype=np.complex64))
+    assert abs(len(y) - 1000 * rs.rate) <= 2
+
+
+def test_resampler_rejects_unknown_options():
+    with pytest.raises(TypeError):
+        dsp.resampler(2.4e6, 500e3, taps=np.ones(8))
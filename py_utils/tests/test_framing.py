@@ -0,0 +1,34 @@
+import numpy as np
+
+from py_utils import framing
+
+
+def _signal_with_preamble(offset=100, n=400):
+    preamble = framing.zadoff_chu(63).astype(np.complex64)
+    signal = np.zeros(n, dtype=np.complex64)
+    signal[offset:offset + len(preamble)] = preamble
+    return preamble, signal
+
+
+def test_acquisition_detector_preamble_before_full_frame():
+    # A chunk holding the preamble but not the whole frame must hold the detection, not fail
+    preamble, signal = _signal_with_preamble()
+    fd = framing.AcquisitionFrameDetector(preamble, expected_frame_length=200)
+
+    assert fd.process(signal[:250]) == []
+
+    results = fd.process(signal[250:])
+    assert len(results) == 1
+    assert results[0].idx == 100
+    assert len(results[0].frame) == 200
+    assert np.array_equal(results[0].frame[:len(preamble)], preamble)
+
+
+def test_acquisition_detector_sub_detectors_do_not_buffer():
+    preamble, signal = _signal_with_preamble()
+    fd = framing.AcquisitionFrameDetector(preamble, expected_frame_length=200)
+
+    for start in range(0, len(signal), 50):
+        fd.process(signal[start:start + 50])
+
+    assert all(len(det.buffer) == 0 for det in fd._corr_detectors)
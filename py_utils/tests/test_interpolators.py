@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from py_utils import channel, interpolators
+
+
+@pytest.mark.parametrize('ratio', [0, 0.0, -1.0, np.nan])
+def test_farrow_resampler_rejects_non_positive_ratio(ratio):
+    x = np.ones(16, dtype=np.complex64)
+    with pytest.raises(ValueError):
+        interpolators.FarrowResampler(ratio)
+
+    rs = interpolators.FarrowResampler()
+    with pytest.raises(ValueError):
+        rs.process(x, ratio=ratio)
+    with pytest.raises(ValueError):
+        rs.process(x, ratio=np.r_[np.ones(15), ratio])
+    with pytest.raises(ValueError):
+        rs.ratio = ratio
+
+
+def test_clock_drift_channel_rejects_non_positive_ratio():
+    x = np.ones(16, dtype=np.complex64)
+    with pytest.raises(ValueError):
+        channel.ClockDriftChannel(ppm=-1e6)
+
+    ch = channel.ClockDriftChannel()
+    with pytest.raises(ValueError):
+        ch.process(x, ppm=np.full(16, -2e6))
+
+    # Linear drift that reaches -1e6 ppm within the chunk
+    ch = channel.ClockDriftChannel(ppm=-1e6 + 10, ppm_per_sample=-1.0)
+    with pytest.raises(ValueError):
+        ch.process(x)
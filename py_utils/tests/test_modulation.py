@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from py_utils import modulation
+
+
+@pytest.mark.parametrize('scheme', ['bpsk', 'qpsk', '8psk', '16qam', '64qam'])
+def test_modulate_round_trip_keeps_trailing_bits(scheme):
+    data = np.array([1, 2, 3, 255], dtype=np.uint8)
+    k = modulation.get_constellation(scheme).bits_per_symbol
+
+    symbols = modulation.modulate(data, scheme)
+    assert len(symbols) == -(-len(data) * 8 // k)
+
+    decoded = modulation.demodulate(symbols, scheme)
+    assert np.array_equal(decoded[:len(data)], data)
+    assert not decoded[len(data):].any()
+
+
+@pytest.mark.parametrize('scheme', ['qpsk', '16qam', '64qam', '8psk'])
+def test_maxlog_llr_matches_exhaustive_maxlog(scheme):
+    # Outer points included: the per-axis QAM demapper must equal max-log over the whole constellation
+    c = modulation.get_constellation(scheme)
+    rng = np.random.default_rng(0)
+    symbols = (1.5 * (rng.standard_normal(2000) + 1j*rng.standard_normal(2000))).astype(np.complex64)
+    noise_var = 0.1
+
+    llrs = c.llr(symbols, noise_var)
+
+    d = np.abs(symbols[:, None] - c.points[None, :])**2 / noise_var
+    bits = (np.arange(c.order)[:, None] >> np.arange(c.bits_per_symbol)[::-1]) & 1
+    expected = np.stack([np.where(bits[:, b] == 1, d, np.inf).min(axis=1) - np.where(bits[:, b] == 0, d, np.inf)
+                         .min(axis=1) for b in range(c.bits_per_symbol)], axis=1).ravel()
+    np.testing.assert_allclose(llrs, expected, rtol=1e-4, atol=1e-3)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from py_utils import sweep
+
+
+def _transmitter(rng):
+    bits = rng.integers(0, 2, 100).astype(np.uint8)
+    return bits, bits
+
+
+def _empty_transmitter(rng):
+    return np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.uint8)
+
+
+def _channel(sig, rng):
+    return sig
+
+
+def _receiver(sig):
+    return sig
+
+
+@pytest.mark.parametrize('max_bits', [None, 0, -5, 1e6, True])
+def test_sweep_requires_positive_int_max_bits(max_bits):
+    with pytest.raises(ValueError, match='max_bits'):
+        sweep.run_sweep(_transmitter, _channel, _receiver, {'snr': [0]}, min_errors=None, max_bits=max_bits,
+                        n_workers=0)
+
+
+def test_sweep_rejects_trials_without_bits():
+    with pytest.raises(ValueError, match='no bits'):
+        sweep.run_sweep(_empty_transmitter, _channel, _receiver, {'snr': [0]}, n_workers=0)
+
+
+def test_sweep_stops_at_max_bits_without_errors():
+    # Error-free link: min_errors can never be met, so max_bits ends the point
+    (res,) = sweep.run_sweep(_transmitter, _channel, _receiver, {'snr': [0]}, max_bits=1000, n_workers=0)
+    assert res.n_err == 0
+    assert res.n_bits == 1000
+
+
+def test_sweep_warms_up_kernels_before_the_pool(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sweep, 'warmup', lambda: calls.append(True))
+
+    results = sweep.run_sweep(_transmitter, _channel, _receiver, {'snr': [0, 1]}, max_bits=200, n_workers=2)
+    assert calls == [True]
+    assert [r.n_bits for r in results] == [200, 200]
@@ -0,0 +1,15 @@
+import matplotlib
+import numpy as np
+
+matplotlib.use('Agg')
+
+from py_utils import visualization as vz
+
+
+def test_plot_signal_envelope_reflects_in_place_edits():
+    s = np.zeros(10**6)
+    vz.plot_signal(s)
+    s[12345] = 5.0
+
+    _, ax = vz.plot_signal(s)
+    assert max(line.get_ydata().max() for line in ax.lines) == 5.0